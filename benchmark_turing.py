@@ -0,0 +1,338 @@
+"""Banco de pruebas de rendimiento del simulador
+
+Ejecuta cada máquina registrada sobre entradas generadas de longitud creciente
+y mide los caminos calientes del motor (ejecutar_paso, ejecutar_hasta_parar,
+ejecutar_generada, _guardar_estado, obtener_cadena_cinta) y del dibujo de la cinta
+(dibujar_cinta sobre un lienzo fuera de pantalla). Los resultados se guardan
+como JSON y pueden compararse con una línea base:
+
+    python -m benchmark_turing --salida base.json
+    python -m benchmark_turing --comparar base.json --umbral 0.2
+"""
+import gc
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import simulador_turing as st
+
+LONGITUDES = (100, 1000, 10000, 100000, 1000000)
+OPERACIONES = ('ejecutar_hasta_parar', 'ejecutar_generada', 'ejecutar_paso', '_guardar_estado', 'obtener_cadena_cinta', 'dibujar_cinta')
+# Los redibujados por paso son caros: se mide como mucho este número de pasos
+MAX_PASOS_DIBUJO = 20000
+# Repetir cada medición hasta acumular este tiempo medido, al menos REPETICIONES
+# y como mucho MAX_REPETICIONES veces, y quedarse con la mejor
+TIEMPO_MINIMO = 0.2
+REPETICIONES = 3
+MAX_REPETICIONES = 2000
+UMBRAL = 0.2
+
+def _aleatoria(simbolos, n, semilla=0):
+    generador = random.Random(semilla)
+    return ''.join(generador.choice(simbolos) for _ in range(max(0, n)))
+
+# Entradas de cada patrón registrado: cadenas de longitud n que la máquina recorre enteras
+GENERADORES = {
+    "(a|b)*abb": lambda n: _aleatoria('ab', n - 3) + 'abb',
+    "0*1*": lambda n: '0' * (n // 2) + '1' * (n - n // 2),
+    "(ab)*": lambda n: 'ab' * (n // 2),
+    "1(01)*0": lambda n: '1' + '01' * ((n - 2) // 2) + '0',
+    "(a+b)*a(a+b)*": lambda n: _aleatoria('b', n - 1) + 'a',
+    "a*b*c*": lambda n: 'a' * (n // 3) + 'b' * (n // 3) + 'c' * (n - 2 * (n // 3)),
+    "(00)*1(11)*": lambda n: '00' * (n // 4) + '1' + '11' * ((n - 2 * (n // 4) - 1) // 2),
+    "a(a|b)*b": lambda n: 'a' + _aleatoria('ab', n - 2) + 'b',
+    "(0|1)*00(0|1)*": lambda n: '1' * (n - 2) + '00',
+    "1*01*01*": lambda n: '1' * (n // 3) + '0' + '1' * (n // 3) + '0' + '1' * (n - 2 * (n // 3) - 2),
+}
+
+def generar_entrada(patron, n):
+    """Cadena de longitud aproximada n que recorre la máquina del patrón"""
+    if patron in GENERADORES:
+        return GENERADORES[patron](n)
+    alfabeto = sorted(st.obtener_definicion(patron).alfabeto)
+    return _aleatoria(''.join(alfabeto), n)
+
+def _medir(preparar, ejecutar):
+    """Mejor tiempo de ejecutar(preparar()) en varias repeticiones; devuelve (segundos, trabajo)
+    
+    Los casos de microsegundos se repiten hasta sumar TIEMPO_MINIMO (miles de
+    veces), no solo REPETICIONES, para que el mejor tiempo no sea ruido. Como
+    en timeit, el recolector de ciclos no corre durante la parte medida.
+    """
+    tiempos = []
+    total = 0
+    gc.collect()
+    while len(tiempos) < MAX_REPETICIONES and (len(tiempos) < REPETICIONES or total < TIEMPO_MINIMO):
+        contexto = preparar()
+        gc.disable()
+        try:
+            inicio = time.perf_counter()
+            trabajo = ejecutar(contexto)
+            transcurrido = time.perf_counter() - inicio
+        finally:
+            gc.enable()
+        tiempos.append(transcurrido)
+        total += transcurrido
+    return min(tiempos), trabajo
+
+def _medir_memoria(preparar, ejecutar):
+    """Pico de memoria reservada durante ejecutar, en bytes, con tracemalloc"""
+    contexto = preparar()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        ejecutar(contexto)
+        pico = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return max(0, pico - base)
+
+class LienzoFantasma:
+    """Lienzo en memoria con la misma interfaz que usa InterfazMaquinaTuring
+    
+    Se usa cuando no hay pantalla para Tk; mide el coste del lado de Python.
+    """
+    def __init__(self, ancho):
+        self.ancho = ancho
+        self.elementos = {}
+        
+    def winfo_width(self):
+        return self.ancho
+        
+    def _crear(self, *coordenadas, **opciones):
+        identificador = len(self.elementos) + 1
+        self.elementos[identificador] = [coordenadas, opciones]
+        return identificador
+        
+    create_rectangle = create_text = create_polygon = _crear
+    
+    def itemconfigure(self, identificador, **opciones):
+        self.elementos[identificador][1].update(opciones)
+        
+    def coords(self, identificador, *coordenadas):
+        self.elementos[identificador][0] = coordenadas
+        
+    def delete(self, etiqueta):
+        self.elementos.clear()
+
+class _Variable:
+    def __init__(self, valor):
+        self.valor = valor
+        
+    def get(self):
+        return self.valor
+        
+    def set(self, valor):
+        self.valor = valor
+
+class _BarraFantasma:
+    def set(self, primero, ultimo):
+        pass
+
+def crear_lienzo_fuera_de_pantalla(ancho=1200, alto=400):
+    """Interfaz reducida a la cinta sobre un lienzo Tk oculto, o sobre LienzoFantasma sin pantalla
+    
+    Devuelve (interfaz, tipo_de_lienzo, raiz_tk_o_None).
+    """
+    interfaz = st.InterfazMaquinaTuring.__new__(st.InterfazMaquinaTuring)
+    raiz = None
+    try:
+        st._importar_tk()
+        raiz = st.tk.Tk()
+        raiz.withdraw()
+        lienzo = st.tk.Canvas(raiz, width=ancho, height=alto)
+        lienzo.winfo_width = lambda: ancho  # El lienzo no llega a mapearse
+        tipo = 'tk'
+    except Exception:  # Sin tkinter o sin pantalla
+        raiz = None
+        lienzo = LienzoFantasma(ancho)
+        tipo = 'simulado'
+    interfaz.lienzo_cinta = lienzo
+    interfaz.variable_seguir = _Variable(True)
+    interfaz.barra_cinta = _BarraFantasma()
+    interfaz.primeras_celdas = [None]
+    interfaz.mt = None
+    interfaz.crear_celdas_visibles()
+    return interfaz, tipo, raiz
+
+def _cargar(definicion, cadena, modo_historial):
+    mt = st.MaquinaTuring.desde_definicion(definicion, modo_historial)
+    mt.inicializar_cinta(cadena)
+    return mt
+
+def _pasos_uno_a_uno(mt):
+    while mt.ejecutar_paso():
+        pass
+    return mt.contador_pasos
+
+def _hasta_parar(mt):
+    mt.ejecutar_hasta_parar()
+    return mt.contador_pasos
+
+def _generada(mt):
+    mt.ejecutar_generada()
+    return mt.contador_pasos
+
+def _guardar_estados(mt):
+    # Deltas sintéticos sobre una cinta fija: aísla el coste del registro del historial
+    extension = (mt.cinta.inicio, mt.cinta.fin)
+    guardar = mt._guardar_estado
+    for posicion in range(mt.longitud_entrada):
+        guardar(posicion, 'a', 'X', mt.estado_actual, extension)
+    return mt.longitud_entrada
+
+def medir_operacion(patron, operacion, longitud, lienzo=None):
+    """Medir una operación sobre la máquina del patrón y una entrada de la longitud dada"""
+    definicion = st.obtener_definicion(patron)
+    cadena = generar_entrada(patron, longitud)
+    unidad = 'pasos'
+    if operacion == 'ejecutar_hasta_parar':
+        preparar = lambda: _cargar(definicion, cadena, 'ninguno')
+        ejecutar = _hasta_parar
+    elif operacion == 'ejecutar_generada':
+        # La función se compila una vez por definición: la primera medición la deja en caché
+        preparar = lambda: _cargar(definicion, cadena, 'ninguno')
+        ejecutar = _generada
+    elif operacion == 'ejecutar_paso':
+        preparar = lambda: _cargar(definicion, cadena, 'completo')
+        ejecutar = _pasos_uno_a_uno
+    elif operacion == '_guardar_estado':
+        preparar = lambda: _cargar(definicion, cadena, 'completo')
+        ejecutar = _guardar_estados
+        unidad = 'registros'
+    elif operacion == 'obtener_cadena_cinta':
+        def preparar():
+            mt = _cargar(definicion, cadena, 'ninguno')
+            mt.ejecutar_hasta_parar()
+            return mt
+        def ejecutar(mt):
+            mt.obtener_cadena_cinta()
+            return len(mt.cinta)
+        unidad = 'celdas'
+    elif operacion == 'dibujar_cinta':
+        interfaz = lienzo
+        def preparar():
+            interfaz.primeras_celdas = [None]
+            interfaz.dibujar_cinta(None, None)
+            return _cargar(definicion, cadena, 'ninguno')
+        def ejecutar(mt):
+            dibujos = 0
+            while dibujos < MAX_PASOS_DIBUJO and mt.ejecutar_paso():
+                interfaz.dibujar_cinta(mt.cintas, mt.posiciones)
+                dibujos += 1
+            return dibujos
+        unidad = 'dibujos'
+    else:
+        raise ValueError(f"Operación desconocida: {operacion!r}")
+        
+    segundos, trabajo = _medir(preparar, ejecutar)
+    memoria = _medir_memoria(preparar, ejecutar)
+    return {
+        'maquina': patron,
+        'operacion': operacion,
+        'longitud': longitud,
+        'unidad': unidad,
+        'trabajo': trabajo,
+        'segundos': segundos,
+        'por_segundo': trabajo / segundos if segundos > 0 else None,
+        'memoria_pico': memoria,
+        'bytes_por_unidad': memoria / trabajo if trabajo else None,
+    }
+
+def ejecutar_banco(patrones=None, operaciones=OPERACIONES, longitudes=LONGITUDES, progreso=None):
+    """Medir todas las combinaciones y devolver el documento de resultados"""
+    patrones = list(patrones or st.REGISTRO_MAQUINAS)
+    interfaz, tipo_lienzo, raiz = (None, None, None)
+    if 'dibujar_cinta' in operaciones:
+        interfaz, tipo_lienzo, raiz = crear_lienzo_fuera_de_pantalla()
+    resultados = []
+    try:
+        for patron in patrones:
+            for operacion in operaciones:
+                for longitud in longitudes:
+                    resultado = medir_operacion(patron, operacion, longitud, interfaz)
+                    resultados.append(resultado)
+                    if progreso:
+                        progreso(resultado)
+    finally:
+        if raiz is not None:
+            raiz.destroy()
+    return {
+        'version': 1,
+        'fecha': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': sys.version.split()[0],
+        'plataforma': platform.platform(),
+        'lienzo': tipo_lienzo,
+        'resultados': resultados,
+    }
+
+def comparar(actual, base, umbral=UMBRAL):
+    """Regresiones de actual frente a base: tuplas (clave, métrica, antes, ahora)
+    
+    Cuenta como regresión perder más de umbral (fracción) de rendimiento por
+    segundo o superar en más de umbral el pico de memoria de la línea base.
+    """
+    def clave(resultado):
+        return (resultado['maquina'], resultado['operacion'], resultado['longitud'])
+    anteriores = {clave(resultado): resultado for resultado in base['resultados']}
+    regresiones = []
+    for resultado in actual['resultados']:
+        anterior = anteriores.get(clave(resultado))
+        if anterior is None:
+            continue
+        if anterior['por_segundo'] and resultado['por_segundo'] is not None:
+            if resultado['por_segundo'] < anterior['por_segundo'] * (1 - umbral):
+                regresiones.append((clave(resultado), 'por_segundo', anterior['por_segundo'], resultado['por_segundo']))
+        # Picos muy pequeños son ruido de tracemalloc
+        if anterior['memoria_pico'] > 64 * 1024:
+            if resultado['memoria_pico'] > anterior['memoria_pico'] * (1 + umbral):
+                regresiones.append((clave(resultado), 'memoria_pico', anterior['memoria_pico'], resultado['memoria_pico']))
+    return regresiones
+
+def _linea(resultado):
+    por_segundo = resultado['por_segundo']
+    return (f"{resultado['maquina']:16} {resultado['operacion']:21} {resultado['longitud']:>8} "
+            f"{por_segundo or 0:>16,.0f} {resultado['unidad']}/s "
+            f"{resultado['memoria_pico'] / 1024:>10,.1f} KiB "
+            f"{resultado['bytes_por_unidad'] or 0:>8.1f} B/{resultado['unidad'][:-1]}")
+
+def main(argv=None):
+    import argparse
+    
+    analizador = argparse.ArgumentParser(prog='benchmark_turing.py',
+                                         description="Banco de pruebas de rendimiento del simulador")
+    analizador.add_argument('--maquinas', nargs='+', metavar='PATRON', help="patrones a medir (por defecto, los registrados)")
+    analizador.add_argument('--operaciones', nargs='+', choices=OPERACIONES, default=list(OPERACIONES))
+    analizador.add_argument('--longitudes', nargs='+', type=int, default=list(LONGITUDES))
+    analizador.add_argument('--salida', '-o', metavar='ARCHIVO', help="guardar los resultados en ARCHIVO (JSON)")
+    analizador.add_argument('--comparar', metavar='BASE', help="comparar con una línea base JSON")
+    analizador.add_argument('--umbral', type=float, default=UMBRAL,
+                            help="pérdida relativa tolerada frente a la base (por defecto 0.2)")
+    argumentos = analizador.parse_args(argv)
+    
+    base = None
+    if argumentos.comparar:
+        with open(argumentos.comparar, encoding='utf-8') as archivo:
+            base = json.load(archivo)
+            
+    documento = ejecutar_banco(argumentos.maquinas, argumentos.operaciones, argumentos.longitudes,
+                               progreso=lambda resultado: print(_linea(resultado), flush=True))
+    if argumentos.salida:
+        with open(argumentos.salida, 'w', encoding='utf-8') as archivo:
+            json.dump(documento, archivo, ensure_ascii=False, indent=1)
+            
+    if base is not None:
+        regresiones = comparar(documento, base, argumentos.umbral)
+        for (maquina, operacion, longitud), metrica, antes, ahora in regresiones:
+            print(f"REGRESIÓN {maquina} {operacion} n={longitud} {metrica}: {antes:,.0f} -> {ahora:,.0f}")
+        if regresiones:
+            return 1
+        print(f"Sin regresiones frente a {argumentos.comparar} (umbral {argumentos.umbral:.0%})")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,315 @@
+"""Servicio local de evaluación de cadenas
+
+Servidor asyncio que recibe peticiones JSON por líneas sobre TCP (solo en la
+máquina local por defecto) o sobre un socket Unix. Cada línea es una petición
+y recibe una línea de respuesta:
+
+    {"id": 1, "patron": "(a|b)*abb", "entrada": "aabb"}
+    -> {"id": 1, "entrada": "aabb", "veredicto": "ACEPTADA", "pasos": 5}
+    
+    {"estadisticas": true}
+    -> {"peticiones": ..., "lotes": ..., "latencia_media_ms": ..., ...}
+
+Las peticiones simultáneas al mismo patrón se agrupan en lotes que se evalúan
+en un pool de procesos (evaluar_cadenas), de modo que el bucle de eventos
+nunca ejecuta máquinas. Cada proceso conserva las definiciones ya construidas
+de cada patrón.
+
+Por defecto solo se admiten los patrones registrados y los de --precargar. Con
+--patrones-libres se compila cualquier otro, acotando su longitud y los estados
+de su AFD (compilar un patrón es exponencial en el peor caso); los que superan
+las cotas reciben una línea de error.
+
+    python -m servidor_turing --puerto 8765
+    python -m servidor_turing --unix /tmp/turing.sock --precargar "(a|b)*abb"
+"""
+import asyncio
+import json
+import multiprocessing
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import simulador_turing as st
+
+HOST = '127.0.0.1'
+PUERTO = 8765
+# Un lote se envía al pool al llenarse o tras esta espera desde su primera petición
+TAMANO_LOTE = 256
+ESPERA_LOTE = 0.002
+# Presupuesto de pasos por cadena si la petición no pide uno menor
+MAX_PASOS = 1_000_000
+# Latencias recientes conservadas para los percentiles
+MUESTRAS_LATENCIA = 10000
+# Las líneas más largas que esto se rechazan sin leerlas en memoria
+LIMITE_LINEA = 1 << 24
+# Cotas para los patrones no registrados con --patrones-libres
+MAX_LONGITUD_PATRON = 256
+MAX_ESTADOS_PATRON = 2048
+
+def _precargar_trabajador(patrones):
+    """Construir las definiciones de los patrones al arrancar cada proceso"""
+    for patron in patrones:
+        st.obtener_definicion(patron)
+
+def _evaluar_lote_trabajador(patron, cadenas, max_pasos, max_celdas, max_estados=None):
+    """Evaluar un lote en un proceso del pool; las definiciones quedan en caché en el proceso
+    
+    Con max_estados el patrón no es de confianza y se compila con esa cota.
+    """
+    if max_estados is None:
+        definicion = st.obtener_definicion(patron)
+    else:
+        definicion = st.compilar_regex(patron, max_estados)
+    return st.evaluar_cadenas(definicion, cadenas, max_pasos, max_celdas)
+
+class EstadisticasServidor:
+    """Contadores de peticiones, lotes, errores y latencias"""
+    def __init__(self):
+        self.arranque = time.perf_counter()
+        self.peticiones = 0
+        self.errores = 0
+        self.lotes = 0
+        self.cadenas_en_lotes = 0
+        self.latencia_total = 0.0
+        self.latencia_maxima = 0.0
+        self.latencias = deque(maxlen=MUESTRAS_LATENCIA)
+        
+    def registrar(self, latencia, error=False):
+        self.peticiones += 1
+        self.errores += error
+        self.latencia_total += latencia
+        self.latencia_maxima = max(self.latencia_maxima, latencia)
+        self.latencias.append(latencia)
+        
+    def registrar_lote(self, tamano):
+        self.lotes += 1
+        self.cadenas_en_lotes += tamano
+        
+    def como_diccionario(self):
+        transcurrido = time.perf_counter() - self.arranque
+        ordenadas = sorted(self.latencias)
+        percentil = lambda p: round(1000 * ordenadas[min(len(ordenadas) - 1, int(p * len(ordenadas)))], 3) if ordenadas else None
+        return {
+            'peticiones': self.peticiones,
+            'errores': self.errores,
+            'lotes': self.lotes,
+            'tamano_medio_lote': round(self.cadenas_en_lotes / self.lotes, 2) if self.lotes else None,
+            'peticiones_por_segundo': round(self.peticiones / transcurrido, 2) if transcurrido else None,
+            'latencia_media_ms': round(1000 * self.latencia_total / self.peticiones, 3) if self.peticiones else None,
+            'latencia_p50_ms': percentil(0.5),
+            'latencia_p99_ms': percentil(0.99),
+            'latencia_maxima_ms': round(1000 * self.latencia_maxima, 3),
+            'segundos_activo': round(transcurrido, 3)
+        }
+
+class ServidorTuring:
+    """Servidor de evaluación con agrupación de peticiones por patrón
+    
+    Las peticiones con el mismo (patron, max_pasos, max_celdas) que llegan
+    dentro de espera_lote segundos se evalúan juntas en un solo envío al
+    pool de procesos; cada una recibe su resultado por su propio futuro.
+    Sin patrones_libres solo se admiten los patrones registrados y los
+    precargados; con él, los demás se acotan con max_longitud_patron y
+    max_estados.
+    """
+    def __init__(self, procesos=None, tamano_lote=TAMANO_LOTE, espera_lote=ESPERA_LOTE,
+                 max_pasos=MAX_PASOS, precargar=(), patrones_libres=False,
+                 max_longitud_patron=MAX_LONGITUD_PATRON, max_estados=MAX_ESTADOS_PATRON):
+        self.procesos = procesos
+        self.tamano_lote = tamano_lote
+        self.espera_lote = espera_lote
+        self.max_pasos = max_pasos
+        self.precargar = tuple(precargar)
+        self.admitidos = set(st.REGISTRO_MAQUINAS) | set(self.precargar)
+        self.patrones_libres = patrones_libres
+        self.max_longitud_patron = max_longitud_patron
+        self.max_estados = max_estados
+        self.estadisticas = EstadisticasServidor()
+        self._pool = None
+        self._pendientes = {}  # clave del lote -> [cadenas, futuros, temporizador]
+        self._servidor = None
+        
+    async def iniciar(self, host=HOST, puerto=PUERTO, ruta_unix=None):
+        """Arrancar el pool y empezar a escuchar; devuelve el asyncio.Server"""
+        for patron in self.precargar:
+            st.obtener_definicion(patron)  # errores de sintaxis antes de arrancar
+        # Con fork los procesos heredarían los sockets de las conexiones abiertas
+        # y el cliente no vería el cierre de la suya: se arrancan con forkserver
+        contexto = (multiprocessing.get_context('forkserver')
+                    if 'forkserver' in multiprocessing.get_all_start_methods() else None)
+        self._pool = ProcessPoolExecutor(self.procesos, mp_context=contexto, initializer=_precargar_trabajador,
+                                         initargs=(self.precargar,))
+        # Arrancar el pool ahora y no con la primera petición
+        await asyncio.get_running_loop().run_in_executor(self._pool, _precargar_trabajador, ())
+        if ruta_unix:
+            self._servidor = await asyncio.start_unix_server(self._atender, ruta_unix, limit=LIMITE_LINEA)
+        else:
+            self._servidor = await asyncio.start_server(self._atender, host, puerto, limit=LIMITE_LINEA)
+        return self._servidor
+        
+    async def cerrar(self):
+        if self._servidor is not None:
+            self._servidor.close()
+            await self._servidor.wait_closed()
+        # Las peticiones aún sin enviar al pool se cancelan
+        for _, futuros, temporizador in self._pendientes.values():
+            temporizador.cancel()
+            for futuro in futuros:
+                futuro.cancel()
+        self._pendientes.clear()
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            
+    async def evaluar(self, patron, cadena, max_pasos=None, max_celdas=None):
+        """Veredicto y pasos de una cadena, agrupándola con las demás del mismo patrón"""
+        if not isinstance(patron, str) or not isinstance(cadena, str):
+            raise ValueError("'patron' y 'entrada' deben ser cadenas")
+        if patron not in self.admitidos:
+            if not self.patrones_libres:
+                raise ValueError("Patrón no admitido: solo se evalúan los registrados y los precargados")
+            if len(patron) > self.max_longitud_patron:
+                raise ValueError(f"Patrón demasiado largo (más de {self.max_longitud_patron} caracteres)")
+        st.codificar_cadena(cadena)  # un símbolo no válido no debe hacer fallar al lote entero
+        max_pasos = self.max_pasos if max_pasos is None else min(max_pasos, self.max_pasos)
+        clave = (patron, max_pasos, max_celdas)
+        futuro = asyncio.get_running_loop().create_future()
+        pendiente = self._pendientes.get(clave)
+        if pendiente is None:
+            temporizador = asyncio.get_running_loop().call_later(self.espera_lote, self._enviar_lote, clave)
+            pendiente = self._pendientes[clave] = ([], [], temporizador)
+        pendiente[0].append(cadena)
+        pendiente[1].append(futuro)
+        if len(pendiente[0]) >= self.tamano_lote:
+            self._enviar_lote(clave)
+        return await futuro
+        
+    def _enviar_lote(self, clave):
+        pendiente = self._pendientes.pop(clave, None)
+        if pendiente is None:
+            return
+        cadenas, futuros, temporizador = pendiente
+        temporizador.cancel()
+        self.estadisticas.registrar_lote(len(cadenas))
+        patron, max_pasos, max_celdas = clave
+        max_estados = None if patron in self.admitidos else self.max_estados
+        tarea = asyncio.get_running_loop().run_in_executor(
+            self._pool, _evaluar_lote_trabajador, patron, cadenas, max_pasos, max_celdas, max_estados)
+        tarea.add_done_callback(lambda tarea: self._repartir(tarea, futuros))
+        
+    @staticmethod
+    def _repartir(tarea, futuros):
+        """Entregar a cada petición su resultado (o el error del lote)"""
+        error = tarea.exception()
+        for i, futuro in enumerate(futuros):
+            if futuro.done():
+                continue
+            if error is not None:
+                futuro.set_exception(error)
+            else:
+                futuro.set_result(tarea.result()[i])
+                
+    async def responder(self, peticion):
+        """Respuesta (diccionario) a una petición ya decodificada"""
+        if peticion.get('estadisticas'):
+            return self.estadisticas.como_diccionario()
+        inicio = time.perf_counter()
+        respuesta = {'id': peticion['id']} if 'id' in peticion else {}
+        try:
+            veredicto, pasos = await self.evaluar(peticion.get('patron'), peticion.get('entrada'),
+                                                  peticion.get('max_pasos'), peticion.get('max_celdas'))
+        except (ValueError, TypeError) as error:
+            respuesta['error'] = str(error)
+            self.estadisticas.registrar(time.perf_counter() - inicio, error=True)
+            return respuesta
+        respuesta.update({'entrada': peticion['entrada'], 'veredicto': veredicto, 'pasos': pasos})
+        self.estadisticas.registrar(time.perf_counter() - inicio)
+        return respuesta
+        
+    async def _atender(self, lector, escritor):
+        """Atender una conexión: las peticiones se procesan en paralelo y se responden al terminar
+        
+        Las respuestas pueden llegar en otro orden que las peticiones; el campo
+        'id' de la petición se copia en la respuesta para emparejarlas.
+        """
+        tareas = set()
+        
+        async def procesar(linea):
+            try:
+                peticion = json.loads(linea)
+                if not isinstance(peticion, dict):
+                    raise ValueError("La petición debe ser un objeto JSON")
+            except ValueError as error:
+                respuesta = {'error': f"Petición no válida: {error}"}
+            else:
+                respuesta = await self.responder(peticion)
+            escritor.write(json.dumps(respuesta, ensure_ascii=False).encode('utf-8') + b'\n')
+            await escritor.drain()
+            
+        try:
+            while True:
+                try:
+                    linea = await lector.readline()
+                except ValueError:
+                    escritor.write(b'{"error": "L\\u00ednea demasiado larga"}\n')
+                    break
+                if not linea:
+                    break
+                if linea.strip():
+                    tarea = asyncio.ensure_future(procesar(linea))
+                    tareas.add(tarea)
+                    tarea.add_done_callback(tareas.discard)
+            if tareas:
+                await asyncio.gather(*tareas, return_exceptions=True)
+        except ConnectionError:
+            pass
+        finally:
+            escritor.close()
+
+async def _servir(argumentos):
+    servidor = ServidorTuring(argumentos.procesos, argumentos.tamano_lote, argumentos.espera_lote / 1000,
+                              argumentos.max_pasos, argumentos.precargar, argumentos.patrones_libres,
+                              argumentos.max_longitud_patron, argumentos.max_estados)
+    escucha = await servidor.iniciar(argumentos.host, argumentos.puerto, argumentos.unix)
+    direcciones = ', '.join(str(socket.getsockname()) for socket in escucha.sockets)
+    print(f"Escuchando en {direcciones}", file=sys.stderr, flush=True)
+    try:
+        await escucha.serve_forever()
+    finally:
+        await servidor.cerrar()
+
+def main(argv=None):
+    import argparse
+    
+    analizador = argparse.ArgumentParser(prog='servidor_turing.py',
+                                         description="Servicio local de evaluación de cadenas (JSON por líneas)")
+    analizador.add_argument('--host', default=HOST, help="dirección TCP (por defecto 127.0.0.1, solo local)")
+    analizador.add_argument('--puerto', type=int, default=PUERTO, help="puerto TCP (por defecto 8765)")
+    analizador.add_argument('--unix', metavar='RUTA', help="escuchar en un socket Unix en lugar de TCP")
+    analizador.add_argument('--procesos', type=int, default=0, help="procesos del pool (por defecto 0 = uno por CPU)")
+    analizador.add_argument('--tamano-lote', type=int, default=TAMANO_LOTE, help="cadenas como máximo por lote")
+    analizador.add_argument('--espera-lote', type=float, default=ESPERA_LOTE * 1000,
+                            help="milisegundos que se espera a completar un lote (por defecto 2)")
+    analizador.add_argument('--max-pasos', type=int, default=MAX_PASOS,
+                            help="presupuesto máximo de pasos por cadena (las peticiones pueden pedir menos)")
+    analizador.add_argument('--precargar', nargs='+', default=[], metavar='PATRON',
+                            help="patrones cuyas máquinas se construyen al arrancar (y que se admiten)")
+    analizador.add_argument('--patrones-libres', action='store_true',
+                            help="admitir también patrones no registrados ni precargados, con las cotas siguientes")
+    analizador.add_argument('--max-longitud-patron', type=int, default=MAX_LONGITUD_PATRON,
+                            help="con --patrones-libres, caracteres como máximo por patrón (por defecto 256)")
+    analizador.add_argument('--max-estados', type=int, default=MAX_ESTADOS_PATRON,
+                            help="con --patrones-libres, estados como máximo del AFD de un patrón (por defecto 2048)")
+    argumentos = analizador.parse_args(argv)
+    argumentos.procesos = argumentos.procesos or None
+    try:
+        asyncio.run(_servir(argumentos))
+    except ValueError as error:
+        analizador.error(str(error))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,47 +1,926 @@
-import tkinter as tk
-from tkinter import ttk, messagebox
-import threading
 import time
+import os
+import sys
+from collections import deque
+from types import MappingProxyType
+from itertools import islice
+from functools import lru_cache
 
-class MaquinaTuring:
+# tkinter solo se importa al lanzar la interfaz (ver _importar_tk), para que
+# el uso sin pantalla (línea de comandos, lotes, servidores) arranque rápido
+tk = ttk = messagebox = None
+
+def _importar_tk():
+    global tk, ttk, messagebox
+    import tkinter
+    from tkinter import ttk as modulo_ttk, messagebox as modulo_messagebox
+    tk, ttk, messagebox = tkinter, modulo_ttk, modulo_messagebox
+
+class HistorialEjecucion:
+    """Registro de deltas por paso según una política de historial
+    
+    Modos: 'ninguno' (sin registro), 'anillo' (últimos N pasos) y
+    'completo' (todos los pasos). Cada delta es una tupla
+    (posicion, simbolo_anterior, simbolo_nuevo, movimiento,
+    estado_anterior, estado_nuevo, inicio_anterior, fin_anterior), donde
+    los dos últimos son el tramo visible de la cinta antes del paso.
+    """
+    MODOS = ('ninguno', 'anillo', 'completo')
+    
+    def __init__(self, modo='completo', capacidad=1000):
+        if modo not in self.MODOS:
+            raise ValueError(f"Modo de historial desconocido: {modo}")
+        if modo == 'anillo' and capacidad < 1:
+            raise ValueError("La capacidad del historial debe ser positiva")
+        self.modo = modo
+        self.capacidad = capacidad
+        self.activo = modo != 'ninguno'
+        self.reiniciar()
+        
+    def reiniciar(self):
+        """Descartar todos los deltas registrados"""
+        self.deltas = deque(maxlen=self.capacidad) if self.modo == 'anillo' else []
+        
+    def registrar(self, delta):
+        self.deltas.append(delta)
+        
+    def primer_paso(self, mt):
+        """Primer paso que todavía se puede reconstruir"""
+        return mt.contador_pasos - len(self.deltas)
+        
+    def reconstruir(self, mt, paso):
+        """Deshacer deltas desde la configuración actual hasta el paso indicado"""
+        if not self.primer_paso(mt) <= paso <= mt.contador_pasos:
+            raise IndexError(f"El paso {paso} no está disponible en el historial")
+        cinta = mt.cinta.copy()
+        posicion_cabezal = mt.posicion_cabezal
+        estado = mt.estado_actual
+        for delta in islice(reversed(self.deltas), mt.contador_pasos - paso):
+            posicion, simbolo_anterior, _, _, estado, _, inicio, fin = delta
+            cinta[posicion] = simbolo_anterior
+            cinta.recortar(inicio, fin)
+            posicion_cabezal = posicion
+        return {
+            'cinta': cinta,
+            'posicion_cabezal': posicion_cabezal,
+            'estado_actual': estado,
+            'paso': paso
+        }
+        
+    def recorrer(self, mt):
+        """Generar las configuraciones registradas en orden, reaplicando deltas"""
+        paso = self.primer_paso(mt)
+        configuracion = self.reconstruir(mt, paso)
+        cinta = configuracion['cinta']
+        yield dict(configuracion, cinta=cinta.copy())
+        extensiones = [delta[6:] for delta in islice(self.deltas, 1, None)]
+        extensiones.append((mt.cinta.inicio, mt.cinta.fin))
+        for delta, (inicio, fin) in zip(list(self.deltas), extensiones):
+            posicion, _, simbolo_nuevo, movimiento, _, estado_nuevo, _, _ = delta
+            cinta[posicion] = simbolo_nuevo
+            cinta.extender(inicio)
+            cinta.extender(fin - 1)
+            paso += 1
+            yield {
+                'cinta': cinta.copy(),
+                'posicion_cabezal': posicion + movimiento,
+                'estado_actual': estado_nuevo,
+                'paso': paso
+            }
+
+class VistaHistorial:
+    """Secuencia de configuraciones reconstruidas bajo demanda"""
+    def __init__(self, mt):
+        self._mt = mt
+        
+    def __len__(self):
+        return len(self._mt._historial.deltas) + 1
+        
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self[i] for i in range(*indice.indices(len(self)))]
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError("Índice de historial fuera de rango")
+        historial = self._mt._historial
+        return historial.reconstruir(self._mt, historial.primer_paso(self._mt) + indice)
+        
+    def __iter__(self):
+        return self._mt._historial.recorrer(self._mt)
+
+class PerfilEjecucion:
+    """Contadores de una ejecución instrumentada (ver MaquinaTuring.activar_instrumentacion)
+    
+    Acumula las visitas de cada transición (estado, simbolo), el tiempo y los
+    pasos de cada estado, el histograma de posiciones del cabezal y la mayor
+    extensión que llegó a tener la cinta.
+    """
+    def __init__(self):
+        self.visitas = {}
+        self.tiempo_por_estado = {}  # nanosegundos
+        self.pasos_por_estado = {}
+        self.histograma_cabezal = {}
+        self.extension_maxima = 0
+        self.pasos = 0
+        
+    def registrar(self, estado, simbolo, posicion, nanosegundos, extension):
+        clave = (estado, simbolo)
+        self.visitas[clave] = self.visitas.get(clave, 0) + 1
+        self.tiempo_por_estado[estado] = self.tiempo_por_estado.get(estado, 0) + nanosegundos
+        self.pasos_por_estado[estado] = self.pasos_por_estado.get(estado, 0) + 1
+        self.histograma_cabezal[posicion] = self.histograma_cabezal.get(posicion, 0) + 1
+        if extension > self.extension_maxima:
+            self.extension_maxima = extension
+        self.pasos += 1
+        
+    def a_json(self):
+        """Diccionario serializable con JSON, con las transiciones de más a menos visitadas"""
+        return {
+            'pasos': self.pasos,
+            'extension_maxima': self.extension_maxima,
+            'transiciones': [{'estado': estado, 'simbolo': simbolo, 'visitas': visitas}
+                             for (estado, simbolo), visitas in sorted(self.visitas.items(), key=lambda par: -par[1])],
+            'estados': {estado: {'pasos': self.pasos_por_estado[estado], 'tiempo_ns': tiempo}
+                        for estado, tiempo in sorted(self.tiempo_por_estado.items(), key=lambda par: -par[1])},
+            'histograma_cabezal': {str(posicion): veces for posicion, veces in sorted(self.histograma_cabezal.items())},
+        }
+        
+    def exportar_json(self, ruta):
+        import json
+        with open(ruta, 'w', encoding='utf-8') as archivo:
+            json.dump(self.a_json(), archivo, ensure_ascii=False, indent=1)
+
+# Desplazamiento del cabezal por dirección; cualquier otra dirección lo deja quieto
+MOVIMIENTOS = {'R': 1, 'L': -1}
+
+class MaquinaCompilada:
+    """Función de transición codificada con enteros para ejecución rápida
+    
+    Los estados se numeran de forma densa y cada símbolo de cinta (un único
+    carácter latin-1) se codifica con su byte, de modo que la transición de
+    (estado, simbolo) queda en tabla[estado << 8 | simbolo] como una tupla
+    (siguiente_estado, simbolo_a_escribir, desplazamiento). Las filas de los
+    estados de parada quedan vacías (None).
+    
+    Los bucles propios que avanzan siempre en la misma dirección (por ejemplo
+    ('q1', 'a') -> ('q1', 'X', 'R')) se guardan en barridos y se quitan de
+    tabla_barrido, de modo que los bucles de ejecución los aplican de golpe
+    sobre toda la racha de símbolos (ver _barrer).
+    """
+    # Rachas más cortas que esto se recorren celda a celda antes de usar translate
+    UMBRAL_BARRIDO = 8
+    
+    def __init__(self, definicion):
+        estados_parada = definicion.estados_aceptacion | definicion.estados_rechazo
+        nombres = set(definicion.estados) | {definicion.estado_inicial} | estados_parada
+        for (estado, _), (siguiente_estado, _, _) in definicion.transiciones.items():
+            nombres.add(estado)
+            nombres.add(siguiente_estado)
+        self.estados = [definicion.estado_inicial] + sorted(nombres - {definicion.estado_inicial}, key=str)
+        self.indice_estado = {estado: i for i, estado in enumerate(self.estados)}
+        self.es_parada = [estado in estados_parada for estado in self.estados]
+        self.es_aceptacion = [estado in definicion.estados_aceptacion for estado in self.estados]
+        self.tabla = [None] * (len(self.estados) << 8)
+        for (estado, simbolo), (siguiente_estado, escribir_simbolo, direccion) in definicion.transiciones.items():
+            if estado in estados_parada:
+                continue
+            self.tabla[self.indice_estado[estado] << 8 | codificar_simbolo(simbolo)] = (
+                self.indice_estado[siguiente_estado],
+                codificar_simbolo(escribir_simbolo),
+                MOVIMIENTOS.get(direccion, 0)
+            )
+        # Si solo se mueve a la derecha nunca relee una celda: es un AFD sobre la entrada
+        self.solo_derecha = all(transicion[2] == 1 for transicion in self.tabla if transicion)
+        
+        self.barridos = {}
+        self.tabla_barrido = list(self.tabla)
+        for estado in range(len(self.estados)):
+            for direccion in (1, -1):
+                bucle = {}
+                for simbolo in range(256):
+                    transicion = self.tabla[estado << 8 | simbolo]
+                    if transicion and transicion[0] == estado and transicion[2] == direccion:
+                        bucle[simbolo] = transicion[1]
+                if not bucle:
+                    continue
+                # parada marca con 1 los bytes que cortan la racha; escritura reescribe los demás
+                parada = bytes(0 if simbolo in bucle else 1 for simbolo in range(256))
+                escritura = bytes(bucle.get(simbolo, simbolo) for simbolo in range(256))
+                if all(bucle[simbolo] == simbolo for simbolo in bucle):
+                    escritura = None
+                for simbolo in bucle:
+                    self.barridos[estado << 8 | simbolo] = (direccion, parada, escritura)
+                    self.tabla_barrido[estado << 8 | simbolo] = None
+        self._funcion_generada = None
+        
+    def generar_codigo(self):
+        """Código fuente Python especializado para esta máquina
+        
+        Cada estado es una rama de un bucle cerrado que compara el símbolo
+        leído con constantes y escribe, mueve y cambia de estado con valores
+        fijos. La función generada, ejecutar(cinta, estado, posicion, tope),
+        trabaja como ejecutar sobre el tramo de cinta del cabezal y para
+        también tras tope pasos (-1 para no limitar); devuelve
+        (estado, posicion, pasos).
+        """
+        lineas = [
+            "def ejecutar(cinta, estado, posicion, tope):",
+            "    pasos = 0",
+            "    while True:",
+            "        datos, origen, inferior, superior = cinta.tramo(posicion)",
+            "        i = posicion + origen",
+            "        while inferior <= i < superior and pasos != tope:",
+            "            simbolo = datos[i]",
+        ]
+        condicion = "if"
+        for estado in range(len(self.estados)):
+            transiciones = [(simbolo, self.tabla[estado << 8 | simbolo]) for simbolo in range(256)
+                            if self.tabla[estado << 8 | simbolo] is not None]
+            if not transiciones:
+                continue
+            lineas.append(f"            {condicion} estado == {estado}:  # {self.estados[estado]!r}")
+            condicion = "elif"
+            rama = "if"
+            for simbolo, (siguiente, escribir, movimiento) in transiciones:
+                lineas.append(f"                {rama} simbolo == {simbolo}:  # {chr(simbolo)!r}")
+                rama = "elif"
+                cabecera = len(lineas)
+                if escribir != simbolo:
+                    lineas.append(f"                    datos[i] = {escribir}")
+                if movimiento:
+                    lineas.append(f"                    i {'+' if movimiento > 0 else '-'}= 1")
+                if siguiente != estado:
+                    lineas.append(f"                    estado = {siguiente}")
+                if len(lineas) == cabecera:
+                    # Ni escribe, ni mueve, ni cambia de estado
+                    lineas.append("                    pass")
+            lineas.append("                else:")
+            lineas.append("                    return estado, i - origen, pasos")
+        # Estados sin transiciones (los de parada incluidos)
+        if condicion == "elif":
+            lineas.append("            else:")
+        lineas.append("                return estado, i - origen, pasos" if condicion == "elif" else
+                      "            return estado, i - origen, pasos")
+        lineas += [
+            "            pasos += 1",
+            "        posicion = i - origen",
+            "        cinta.extender(posicion)",
+            "        if pasos == tope:",
+            "            return estado, posicion, pasos",
+        ]
+        return "\n".join(lineas) + "\n"
+        
+    def funcion_generada(self):
+        """Compilar generar_codigo una sola vez; la función queda en caché con la máquina"""
+        if self._funcion_generada is None:
+            espacio = {}
+            exec(compile(self.generar_codigo(), f"<maquina generada {id(self):x}>", 'exec'), espacio)
+            self._funcion_generada = espacio['ejecutar']
+        return self._funcion_generada
+        
+    def veredicto(self, estado):
+        """Veredicto correspondiente a un estado codificado"""
+        if self.es_aceptacion[estado]:
+            return "ACEPTADA"
+        elif self.es_parada[estado]:
+            return "RECHAZADA"
+        else:
+            return "EJECUTANDO"
+            
+    def ejecutar_afd(self, datos):
+        """Recorrer la entrada como AFD, sin escribir en la cinta; devuelve (estado, pasos)
+        
+        Solo válido si solo_derecha. Tras la entrada se leen blancos durante como
+        mucho tantos pasos como estados; si no para antes, está en un ciclo.
+        """
+        tabla = self.tabla
+        estado = 0
+        pasos = 0
+        for simbolo in datos:
+            transicion = tabla[estado << 8 | simbolo]
+            if transicion is None:
+                return estado, pasos
+            estado = transicion[0]
+            pasos += 1
+        for _ in range(len(self.estados)):
+            transicion = tabla[estado << 8 | 95]
+            if transicion is None:
+                break
+            estado = transicion[0]
+            pasos += 1
+        return estado, pasos
+        
+    def ejecutar_afd_flujo(self, trozos, max_pasos=None):
+        """Como ejecutar_afd, pero leyendo la entrada trozo a trozo (bytes)
+        
+        Deja de leer en cuanto la máquina entra en un estado de parada o agota
+        max_pasos, así que el resto de la entrada nunca se consume. Devuelve (estado, pasos, leidos),
+        con leidos el número de símbolos de entrada consumidos; si el
+        presupuesto se agota con la máquina aún en marcha, pasos es
+        max_pasos + 1 y estado el alcanzado tras max_pasos pasos.
+        """
+        tabla = self.tabla
+        es_parada = self.es_parada
+        estado = 0
+        pasos = 0
+        if es_parada[estado]:
+            return estado, pasos, pasos
+        for trozo in trozos:
+            resto = None
+            if max_pasos is not None and pasos + len(trozo) > max_pasos:
+                trozo, resto = trozo[:max_pasos - pasos], trozo[max_pasos - pasos:]
+            for simbolo in trozo:
+                transicion = tabla[estado << 8 | simbolo]
+                if transicion is None:
+                    return estado, pasos, pasos
+                estado = transicion[0]
+                pasos += 1
+                if es_parada[estado]:
+                    return estado, pasos, pasos
+            if resto:
+                # Presupuesto agotado con entrada pendiente: ¿seguiría la máquina?
+                return estado, pasos + (tabla[estado << 8 | resto[0]] is not None), pasos
+        leidos = pasos
+        for _ in range(len(self.estados)):
+            transicion = tabla[estado << 8 | 95]
+            if transicion is None:
+                break
+            if pasos == max_pasos:
+                return estado, pasos + 1, leidos
+            estado = transicion[0]
+            pasos += 1
+        return estado, pasos, leidos
+        
+    def ejecutar_afd_vectorizado(self, cadenas, np):
+        """Avanzar todas las cadenas a la vez con NumPy; devuelve (estados, pasos)"""
+        siguiente = np.array([-1 if transicion is None else transicion[0] for transicion in self.tabla],
+                             dtype=np.int32).reshape(len(self.estados), 256)
+        parada = np.array(self.es_parada)
+        longitud = max(map(len, cadenas), default=0)
+        matriz = np.full((len(cadenas), longitud), 95, dtype=np.uint8)
+        for fila, datos in zip(matriz, cadenas):
+            fila[:len(datos)] = np.frombuffer(datos, dtype=np.uint8)
+        estados = np.zeros(len(cadenas), dtype=np.int32)
+        pasos = np.zeros(len(cadenas), dtype=np.int64)
+        activos = np.full(len(cadenas), not self.es_parada[0])
+        # Cada cadena lee como mucho tantos blancos como estados tras su propio final
+        limites = np.array([len(datos) for datos in cadenas]) + len(self.estados)
+        blanco = np.full(len(cadenas), 95, dtype=np.uint8)
+        for i in range(longitud + len(self.estados)):
+            activos &= i < limites
+            if not activos.any():
+                break
+            nuevos = siguiente[estados, matriz[:, i] if i < longitud else blanco]
+            avanzan = activos & (nuevos >= 0)
+            estados = np.where(avanzan, nuevos, estados)
+            pasos += avanzan
+            activos = avanzan & ~parada[estados]
+        return estados.tolist(), pasos.tolist()
+        
+    def _barrer(self, datos, i, estado, inferior, superior, max_pasos=None):
+        """Aplicar de golpe el bucle propio de estado sobre la racha que empieza en i
+        
+        La racha no sale del tramo visible (inferior, superior) ni supera max_pasos
+        celdas. Devuelve la nueva posición en datos y el número de pasos aplicados.
+        """
+        direccion, parada, escritura = self.barridos[estado << 8 | datos[i]]
+        tope = superior if direccion == 1 else inferior
+        if max_pasos is not None:
+            tope = min(tope, i + max_pasos) if direccion == 1 else max(tope, i - max_pasos)
+        j = i
+        # Las rachas cortas se recorren celda a celda
+        for _ in range(self.UMBRAL_BARRIDO):
+            if j == tope or parada[datos[j]]:
+                break
+            j += direccion
+        else:
+            # Racha larga: buscar su final en ventanas que se duplican
+            ventana = 2 * self.UMBRAL_BARRIDO
+            while j != tope:
+                if direccion == 1:
+                    fin = min(j + ventana, tope)
+                    k = datos[j:fin].translate(parada).find(1)
+                    if k != -1:
+                        j += k
+                        break
+                    j = fin
+                else:
+                    inicio = max(j - ventana, tope) + 1
+                    k = datos[inicio:j + 1].translate(parada).rfind(1)
+                    if k != -1:
+                        j = inicio + k
+                        break
+                    j = inicio - 1
+                ventana *= 2
+        if escritura is not None and j != i:
+            desde, hasta = (i, j) if direccion == 1 else (j + 1, i + 1)
+            datos[desde:hasta] = datos[desde:hasta].translate(escritura)
+        return j, abs(j - i)
+        
+    def ejecutar(self, cinta, estado, posicion):
+        """Ejecutar sobre una Cinta hasta parar; devuelve (estado, posicion, pasos)"""
+        tabla = self.tabla_barrido
+        completa = self.tabla
+        barridos = self.barridos
+        pasos = 0
+        while True:
+            datos, origen, inferior, superior = cinta.tramo(posicion)
+            i = posicion + origen
+            while True:
+                transicion = tabla[estado << 8 | datos[i]]
+                if transicion is None:
+                    transicion = completa[estado << 8 | datos[i]]
+                    if transicion is None:
+                        return estado, i - origen, pasos
+                    # Bucle propio: un paso normal y, si la racha sigue, barrerla entera
+                    estado, datos[i], movimiento = transicion
+                    i += movimiento
+                    pasos += 1
+                    if i == superior or i < inferior:
+                        break
+                    if estado << 8 | datos[i] in barridos:
+                        i, longitud = self._barrer(datos, i, estado, inferior - 1, superior)
+                        pasos += longitud
+                else:
+                    estado, datos[i], movimiento = transicion
+                    i += movimiento
+                    pasos += 1
+                if i == superior or i < inferior:
+                    break
+            # El cabezal sale del tramo: ampliar la cinta si hace falta y continuar
+            posicion = i - origen
+            cinta.extender(posicion)
+
+    def ejecutar_vigilado(self, cinta, estado, posicion, max_pasos=None, max_celdas=None,
+                          detectar_ciclos=True, longitud_entrada=0):
+        """Como ejecutar, con presupuestos y detección de no parada
+        
+        Devuelve (estado, posicion, pasos, motivo), donde motivo es None si la
+        máquina paró por sí misma, 'LIMITE' si agotó max_pasos o la cinta
+        superó max_celdas celdas, o 'BUCLE' si se demostró que no para.
+        """
+        tabla = self.tabla
+        limite_pasos = -1 if max_pasos is None else max_pasos
+        limite_celdas = float('inf') if max_celdas is None else max_celdas
+        # Solo derecha: tras leer tantos blancos nuevos como estados sin parar, no para nunca
+        limite_blancos = longitud_entrada + len(self.estados) if detectar_ciclos and self.solo_derecha else None
+        detector = None
+        if detectar_ciclos and not self.solo_derecha:
+            detector = DetectorCiclos(estado, posicion, cinta)
+        # El detector necesita ver cada paso: con él no se barren rachas
+        barridos = self.barridos if detector is None else {}
+        pasos = 0
+        while True:
+            datos, origen, inferior, superior = cinta.tramo(posicion)
+            if tabla[estado << 8 | datos[posicion + origen]] is not None:
+                if limite_blancos is not None and posicion >= limite_blancos:
+                    return estado, posicion, pasos, "BUCLE"
+                if len(cinta) > limite_celdas:
+                    return estado, posicion, pasos, "LIMITE"
+            i = posicion + origen
+            while True:
+                transicion = tabla[estado << 8 | datos[i]]
+                if transicion is None:
+                    return estado, i - origen, pasos, None
+                if pasos == limite_pasos:
+                    return estado, i - origen, pasos, "LIMITE"
+                if estado << 8 | datos[i] in barridos:
+                    restantes = None if max_pasos is None else limite_pasos - pasos
+                    i, longitud = self._barrer(datos, i, estado, inferior - 1, superior, restantes)
+                    pasos += longitud
+                    if i == superior or i < inferior:
+                        break
+                    continue
+                anterior = datos[i]
+                estado, datos[i], movimiento = transicion
+                if detector is not None:
+                    if anterior != datos[i]:
+                        detector.escribir(i - origen, anterior, datos[i])
+                    if detector.avanzar(estado, i + movimiento - origen, cinta):
+                        return estado, i + movimiento - origen, pasos + 1, "BUCLE"
+                i += movimiento
+                pasos += 1
+                if i == superior or i < inferior:
+                    break
+            # El cabezal sale del tramo: ampliar la cinta si hace falta y comprobar presupuestos
+            posicion = i - origen
+            cinta.extender(posicion)
+
+def codificar_simbolo(simbolo):
+    """Código de byte de un símbolo de cinta de un solo carácter"""
+    if len(simbolo) != 1 or ord(simbolo) > 255:
+        raise ValueError(f"Símbolo no codificable en un byte: {simbolo!r}")
+    return ord(simbolo)
+
+def codificar_cadena(cadena):
+    """Bytes latin-1 de una cadena de símbolos de cinta"""
+    try:
+        return cadena.encode('latin-1')
+    except UnicodeEncodeError:
+        raise ValueError(f"La cadena contiene símbolos fuera de latin-1: {cadena!r}") from None
+
+BLANCO = '_'
+
+class Cinta:
+    """Cinta bi-infinita respaldada por un bytearray, un byte por celda
+    
+    Cada símbolo se guarda como su byte latin-1 (ver codificar_simbolo). Las
+    posiciones son lógicas y pueden ser negativas: la celda p está en
+    datos[origen + p]. [inicio, fin) es el tramo visible (la entrada, el
+    blanco final y toda celda visitada); fuera de él todo es blanco. El
+    bytearray crece por bloques que duplican su tamaño, en ambas direcciones.
+    """
+    TAMANO_BLOQUE = 64
+    
+    def __init__(self, contenido=''):
+        self.datos = bytearray(codificar_cadena(contenido))
+        self.datos.append(ord(BLANCO))
+        self.origen = 0
+        self.inicio = 0
+        self.fin = len(self.datos)
+        
+    def __len__(self):
+        return self.fin - self.inicio
+        
+    def __iter__(self):
+        return iter(self.contenido())
+        
+    def __getitem__(self, posicion):
+        i = self.origen + posicion
+        if 0 <= i < len(self.datos):
+            return chr(self.datos[i])
+        return BLANCO
+        
+    def __setitem__(self, posicion, simbolo):
+        self.extender(posicion)
+        self.datos[self.origen + posicion] = codificar_simbolo(simbolo)
+        
+    def __eq__(self, otra):
+        if not isinstance(otra, Cinta):
+            return NotImplemented
+        return (self.inicio, self.fin) == (otra.inicio, otra.fin) and self.contenido() == otra.contenido()
+        
+    def __repr__(self):
+        return f"Cinta({self.contenido()!r}, inicio={self.inicio})"
+        
+    def contenido(self, desde=None, hasta=None):
+        """Símbolos de las celdas [desde, hasta) como cadena (por defecto el tramo visible)"""
+        desde = self.inicio if desde is None else desde
+        hasta = self.fin if hasta is None else hasta
+        i, j = self.origen + desde, self.origen + hasta
+        izquierda = BLANCO * max(0, min(-i, j - i))
+        derecha = BLANCO * max(0, min(j - len(self.datos), j - i))
+        centro = self.datos[max(i, 0):max(min(j, len(self.datos)), 0)].decode('latin-1')
+        return izquierda + centro + derecha
+        
+    def extender(self, posicion):
+        """Ampliar el tramo visible, y el bytearray si hace falta, hasta incluir posicion"""
+        if posicion < self.inicio:
+            self.inicio = posicion
+            faltan = -(self.origen + posicion)
+            if faltan > 0:
+                bloque = max(faltan, len(self.datos), self.TAMANO_BLOQUE)
+                self.datos[0:0] = BLANCO.encode() * bloque
+                self.origen += bloque
+        elif posicion >= self.fin:
+            self.fin = posicion + 1
+            faltan = self.origen + posicion + 1 - len(self.datos)
+            if faltan > 0:
+                self.datos.extend(BLANCO.encode() * max(faltan, len(self.datos), self.TAMANO_BLOQUE))
+                
+    def tramo(self, posicion):
+        """Buffer contiguo que contiene posicion: (datos, origen, inferior, superior)
+        
+        inferior y superior son los índices en datos del tramo visible; los
+        bucles compilados trabajan sobre él y llaman a extender al salir.
+        """
+        return self.datos, self.origen, self.inicio + self.origen, self.fin + self.origen
+        
+    def recortar(self, inicio, fin):
+        """Restaurar un tramo visible anterior (las celdas de fuera deben ser blancas)"""
+        self.inicio = inicio
+        self.fin = fin
+        
+    def copy(self):
+        copia = Cinta.__new__(Cinta)
+        copia.datos = bytearray(self.datos)
+        copia.origen = self.origen
+        copia.inicio = self.inicio
+        copia.fin = self.fin
+        return copia
+
+class CintaMapeada(Cinta):
+    """Cinta cuya entrada es un archivo proyectado en memoria (mmap)
+    
+    El archivo se proyecta con copia en escritura: la máquina puede escribir
+    sobre la entrada sin modificar el archivo y sin leerlo entero en memoria.
+    Lo que crece a la izquierda de la entrada y a su derecha se guarda en dos
+    Cinta normales (las regiones de desbordamiento), así que la memoria usada
+    es la de las páginas tocadas más lo visitado fuera del archivo.
+    """
+    def __init__(self, ruta):
+        import mmap
+        self.ruta = os.fspath(ruta)
+        with open(self.ruta, 'rb') as archivo:
+            self.longitud = os.fstat(archivo.fileno()).st_size
+            # mmap no admite archivos vacíos: la entrada vacía es un bytearray
+            self.mapa = (mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_COPY)
+                         if self.longitud else bytearray())
+        self.izquierda = Cinta()
+        self.izquierda.recortar(0, 0)
+        self.derecha = Cinta()
+        self.derecha.origen = -self.longitud
+        self.derecha.recortar(self.longitud, self.longitud + 1)
+        
+    def __enter__(self):
+        return self
+        
+    def __exit__(self, *excepcion):
+        self.close()
+        
+    def close(self):
+        """Liberar la proyección del archivo; después la cinta ya no se puede leer"""
+        if not isinstance(self.mapa, bytearray):
+            self.mapa.close()
+            
+    inicio = property(lambda self: self.izquierda.inicio)
+    fin = property(lambda self: self.derecha.fin)
+    
+    def _region(self, posicion):
+        if posicion < 0:
+            return self.izquierda
+        if posicion >= self.longitud:
+            return self.derecha
+        return None
+        
+    def __getitem__(self, posicion):
+        region = self._region(posicion)
+        return chr(self.mapa[posicion]) if region is None else region[posicion]
+        
+    def __setitem__(self, posicion, simbolo):
+        region = self._region(posicion)
+        if region is None:
+            self.mapa[posicion] = codificar_simbolo(simbolo)
+        else:
+            region[posicion] = simbolo
+            
+    def contenido(self, desde=None, hasta=None):
+        desde = self.inicio if desde is None else desde
+        hasta = self.fin if hasta is None else hasta
+        partes = []
+        if desde < min(hasta, 0):
+            partes.append(self.izquierda.contenido(desde, min(hasta, 0)))
+        if max(desde, 0) < min(hasta, self.longitud):
+            partes.append(self.mapa[max(desde, 0):min(hasta, self.longitud)].decode('latin-1'))
+        if max(desde, self.longitud) < hasta:
+            partes.append(self.derecha.contenido(max(desde, self.longitud), hasta))
+        return ''.join(partes)
+        
+    def extender(self, posicion):
+        if posicion < self.inicio:
+            self.izquierda.extender(posicion)
+        elif posicion >= self.fin:
+            self.derecha.extender(posicion)
+            
+    def tramo(self, posicion):
+        region = self._region(posicion)
+        if region is None:
+            return self.mapa, 0, 0, self.longitud
+        return region.tramo(posicion)
+        
+    def recortar(self, inicio, fin):
+        self.izquierda.recortar(min(inicio, 0), 0)
+        self.derecha.recortar(self.longitud, max(fin, self.longitud + 1))
+        
+    def copy(self):
+        """Copia en memoria como Cinta normal (lee la cinta entera)"""
+        copia = Cinta(self.contenido())
+        copia.origen = -self.inicio
+        copia.recortar(self.inicio, self.fin)
+        return copia
+
+def _misma_cinta(cinta, inicio, contenido):
+    """¿Tiene cinta el contenido guardado (inicio, contenido)?"""
+    # El tramo visible solo crece: completar con blancos la copia guardada
+    esperado = (BLANCO * (inicio - cinta.inicio) + contenido
+                + BLANCO * (cinta.fin - inicio - len(contenido)))
+    return cinta.contenido() == esperado
+
+class DetectorCiclos:
+    """Algoritmo de Brent sobre huellas de configuraciones (estado, cabezal, cintas)
+    
+    Con una cinta, cabezal es su posición y cintas la Cinta; con k cintas,
+    cabezal es la tupla de posiciones y cintas la secuencia de Cintas. Cada
+    celda se identifica por su posición, o por (k, posicion) con k cintas.
+    La huella es el XOR de hash((celda, byte)) de las celdas no blancas y se
+    actualiza en O(1) por escritura. Cuando coinciden las huellas se compara
+    la configuración guardada completa para descartar colisiones.
+    """
+    def __init__(self, estado, cabezal, cintas):
+        blanco = ord(BLANCO)
+        self.huella_cinta = 0
+        for celda, codigo in self._celdas(cabezal, cintas):
+            if codigo != blanco:
+                self.huella_cinta ^= hash((celda, codigo))
+        self.potencia = 1
+        self.longitud = 1
+        self._guardar(estado, cabezal, cintas)
+        
+    @staticmethod
+    def _celdas(cabezal, cintas):
+        """Pares (celda, byte) de todas las celdas visitadas"""
+        if not isinstance(cabezal, tuple):
+            return enumerate(map(ord, cintas.contenido()), cintas.inicio)
+        return (((k, p), codigo) for k, cinta in enumerate(cintas)
+                for p, codigo in enumerate(map(ord, cinta.contenido()), cinta.inicio))
+        
+    def _guardar(self, estado, cabezal, cintas):
+        self.guardada = (estado, cabezal, self.huella_cinta)
+        if not isinstance(cabezal, tuple):
+            cintas = (cintas,)
+        self.cintas_guardadas = [(cinta.inicio, cinta.contenido()) for cinta in cintas]
+        
+    def escribir(self, celda, anterior, nuevo):
+        """Actualizar la huella tras cambiar el byte de una celda"""
+        blanco = ord(BLANCO)
+        if anterior != blanco:
+            self.huella_cinta ^= hash((celda, anterior))
+        if nuevo != blanco:
+            self.huella_cinta ^= hash((celda, nuevo))
+            
+    def avanzar(self, estado, cabezal, cintas):
+        """Registrar la configuración tras un paso; True si repite la guardada"""
+        if (estado, cabezal, self.huella_cinta) == self.guardada:
+            if not isinstance(cabezal, tuple):
+                cintas = (cintas,)
+            if all(_misma_cinta(cinta, *guardada) for cinta, guardada in zip(cintas, self.cintas_guardadas)):
+                return True
+        if self.potencia == self.longitud:
+            self._guardar(estado, cabezal, cintas)
+            self.potencia *= 2
+            self.longitud = 0
+        self.longitud += 1
+        return False
+
+class DefinicionMaquina:
+    """Definición inmutable de una Máquina de Turing, compartible entre ejecuciones"""
+    __slots__ = ('estados', 'alfabeto', 'alfabeto_cinta', 'transiciones', 'estado_inicial',
+                 'estados_aceptacion', 'estados_rechazo', '_compilada', '_huella')
+    
     def __init__(self, estados, alfabeto, alfabeto_cinta, transiciones, estado_inicial, estados_aceptacion, estados_rechazo):
-        self.estados = estados
-        self.alfabeto = alfabeto
-        self.alfabeto_cinta = alfabeto_cinta
-        self.transiciones = transiciones
-        self.estado_actual = estado_inicial
-        self.estado_inicial = estado_inicial
-        self.estados_aceptacion = estados_aceptacion
-        self.estados_rechazo = estados_rechazo
-        self.cinta = ['_']  # Símbolo blanco
+        asignar = super().__setattr__
+        asignar('estados', frozenset(estados))
+        asignar('alfabeto', frozenset(alfabeto))
+        asignar('alfabeto_cinta', frozenset(alfabeto_cinta))
+        asignar('transiciones', MappingProxyType(dict(transiciones)))
+        asignar('estado_inicial', estado_inicial)
+        asignar('estados_aceptacion', frozenset(estados_aceptacion))
+        asignar('estados_rechazo', frozenset(estados_rechazo))
+        asignar('_compilada', None)
+        asignar('_huella', None)
+        
+    def __setattr__(self, nombre, valor):
+        raise AttributeError("DefinicionMaquina es inmutable")
+        
+    def __reduce__(self):
+        return DefinicionMaquina, (self.estados, self.alfabeto, self.alfabeto_cinta, dict(self.transiciones),
+                                   self.estado_inicial, self.estados_aceptacion, self.estados_rechazo)
+        
+    def compilar(self):
+        """Tabla entera de la máquina, compilada una sola vez y compartida"""
+        if self._compilada is None:
+            super().__setattr__('_compilada', MaquinaCompilada(self))
+        return self._compilada
+        
+    def huella(self):
+        """Resumen SHA-256 de la definición, estable entre procesos"""
+        if self._huella is None:
+            import hashlib
+            canonica = repr((sorted(map(repr, self.estados)), sorted(map(repr, self.alfabeto)),
+                             sorted(map(repr, self.alfabeto_cinta)),
+                             sorted(map(repr, self.transiciones.items())), repr(self.estado_inicial),
+                             sorted(map(repr, self.estados_aceptacion)), sorted(map(repr, self.estados_rechazo))))
+            super().__setattr__('_huella', hashlib.sha256(canonica.encode('utf-8')).digest())
+        return self._huella
+
+class MaquinaTuring:
+    """Contexto de ejecución (cinta, cabezal, estado) sobre una definición compartida"""
+    def __init__(self, estados, alfabeto, alfabeto_cinta, transiciones, estado_inicial, estados_aceptacion, estados_rechazo,
+                 modo_historial='completo', capacidad_historial=1000):
+        definicion = DefinicionMaquina(estados, alfabeto, alfabeto_cinta, transiciones,
+                                       estado_inicial, estados_aceptacion, estados_rechazo)
+        self._inicializar_contexto(definicion, modo_historial, capacidad_historial)
+        
+    @classmethod
+    def desde_definicion(cls, definicion, modo_historial='completo', capacidad_historial=1000):
+        """Crear un contexto de ejecución ligero sin reconstruir la definición"""
+        mt = cls.__new__(cls)
+        mt._inicializar_contexto(definicion, modo_historial, capacidad_historial)
+        return mt
+        
+    def _inicializar_contexto(self, definicion, modo_historial, capacidad_historial):
+        self.definicion = definicion
+        self.estado_actual = definicion.estado_inicial
+        self.cinta = Cinta()
         self.posicion_cabezal = 0
         self.contador_pasos = 0
-        self.historial = []
+        self.longitud_entrada = 0
+        self.motivo_parada = None  # 'BUCLE' o 'LIMITE' si la última ejecución se cortó
+        self._historial = HistorialEjecucion(modo_historial, capacidad_historial)
+        
+    estados = property(lambda self: self.definicion.estados)
+    alfabeto = property(lambda self: self.definicion.alfabeto)
+    alfabeto_cinta = property(lambda self: self.definicion.alfabeto_cinta)
+    transiciones = property(lambda self: self.definicion.transiciones)
+    estado_inicial = property(lambda self: self.definicion.estado_inicial)
+    estados_aceptacion = property(lambda self: self.definicion.estados_aceptacion)
+    estados_rechazo = property(lambda self: self.definicion.estados_rechazo)
+        
+    @property
+    def historial(self):
+        """Vista de solo lectura de las configuraciones registradas"""
+        return VistaHistorial(self)
+        
+    def configurar_historial(self, modo, capacidad=1000, conservar=False):
+        """Cambiar la política de historial
+        
+        Los deltas registrados se descartan salvo con conservar, que mantiene
+        los más recientes que quepan en la nueva política.
+        """
+        historial = HistorialEjecucion(modo, capacidad)
+        if conservar and historial.activo:
+            historial.deltas.extend(self._historial.deltas)
+        self._historial = historial
         
     def inicializar_cinta(self, cadena_entrada):
         """Inicializar la cinta con la cadena de entrada"""
-        self.cinta = list(cadena_entrada) + ['_']
+        self.cinta = Cinta(cadena_entrada)
+        self.longitud_entrada = len(cadena_entrada)
         self.posicion_cabezal = 0
         self.estado_actual = self.estado_inicial
         self.contador_pasos = 0
-        self.historial = []
-        self._guardar_estado()
-        
-    def _guardar_estado(self):
-        """Guardar el estado actual para visualización"""
-        self.historial.append({
-            'cinta': self.cinta.copy(),
-            'posicion_cabezal': self.posicion_cabezal,
-            'estado_actual': self.estado_actual,
-            'paso': self.contador_pasos
-        })
+        self.motivo_parada = None
+        self._historial.reiniciar()
+        
+    def instantanea(self):
+        """Copia de la configuración actual (estado, cabezal, pasos, cinta) para restaurar"""
+        return (self.estado_actual, self.posicion_cabezal, self.contador_pasos,
+                self.longitud_entrada, self.motivo_parada, self.cinta.copy())
+        
+    def restaurar(self, instantanea):
+        """Volver a una configuración de instantanea (que se puede restaurar otra vez)"""
+        (self.estado_actual, self.posicion_cabezal, self.contador_pasos,
+         self.longitud_entrada, self.motivo_parada, cinta) = instantanea
+        self.cinta = cinta.copy()
+        self._historial.reiniciar()
+        
+    def cargar_archivo_entrada(self, ruta):
+        """Usar como entrada los bytes de un archivo, proyectado en memoria
+        
+        Pensado para entradas que no caben cómodamente en memoria: la cinta
+        es una CintaMapeada y el archivo no se modifica. Con cintas enormes
+        conviene ejecutar sin detectar_ciclos, que compara la cinta entera.
+        """
+        self.inicializar_cinta('')
+        self.cinta = CintaMapeada(ruta)
+        self.longitud_entrada = self.cinta.longitud
+        
+    def evaluar_flujo(self, entrada, max_pasos=None):
+        """Ejecutar leyendo la entrada como flujo, sin materializar la cinta
+        
+        Ver evaluar_flujo (función del módulo). Al terminar quedan el estado,
+        los pasos y el cabezal como tras ejecutar_hasta_parar, pero la cinta
+        queda en blanco: la entrada no se conserva.
+        """
+        compilada = self.definicion.compilar()
+        if not compilada.solo_derecha:
+            raise ValueError("La evaluación en flujo solo admite máquinas que se mueven únicamente a la derecha")
+        self.inicializar_cinta('')
+        estado, pasos, leidos = compilada.ejecutar_afd_flujo(_trozos_entrada(entrada), max_pasos)
+        veredicto, pasos = _veredicto_afd(compilada, estado, pasos, leidos, max_pasos, None)
+        self.estado_actual = compilada.estados[estado]
+        self.contador_pasos = self.posicion_cabezal = pasos
+        self.motivo_parada = veredicto if veredicto in ("BUCLE", "LIMITE") else None
+        return veredicto
+        
+    def _guardar_estado(self, posicion, simbolo_anterior, simbolo_nuevo, estado_anterior, extension_anterior):
+        """Registrar el delta del último paso para visualización"""
+        self._historial.registrar((posicion, simbolo_anterior, simbolo_nuevo,
+                                   self.posicion_cabezal - posicion, estado_anterior,
+                                   self.estado_actual) + extension_anterior)
+        
+    def obtener_configuracion(self, paso):
+        """Reconstruir la configuración (cinta, cabezal, estado) de un paso anterior"""
+        return self._historial.reconstruir(self, paso)
         
     def ejecutar_paso(self):
         """Ejecutar un paso de la Máquina de Turing"""
         if self.estado_actual in self.estados_aceptacion or self.estado_actual in self.estados_rechazo:
             return False
+        self.motivo_parada = None
             
-        simbolo_actual = self.cinta[self.posicion_cabezal] if self.posicion_cabezal < len(self.cinta) else '_'
+        simbolo_actual = self.cinta[self.posicion_cabezal]
         
         # Buscar transición
         clave_transicion = (self.estado_actual, simbolo_actual)
@@ -49,32 +928,155 @@ class MaquinaTuring:
             return False
             
         siguiente_estado, escribir_simbolo, direccion = self.transiciones[clave_transicion]
+        posicion_anterior = self.posicion_cabezal
+        estado_anterior = self.estado_actual
+        extension_anterior = (self.cinta.inicio, self.cinta.fin)
         
         # Escribir símbolo
-        if self.posicion_cabezal < len(self.cinta):
-            self.cinta[self.posicion_cabezal] = escribir_simbolo
-        else:
-            self.cinta.append(escribir_simbolo)
+        self.cinta[self.posicion_cabezal] = escribir_simbolo
             
-        # Mover cabezal
-        if direccion == 'R':
-            self.posicion_cabezal += 1
-            if self.posicion_cabezal >= len(self.cinta):
-                self.cinta.append('_')
-        elif direccion == 'L':
-            self.posicion_cabezal = max(0, self.posicion_cabezal - 1)
+        # Mover cabezal; la cinta crece en ambas direcciones
+        self.posicion_cabezal += MOVIMIENTOS.get(direccion, 0)
+        self.cinta.extender(self.posicion_cabezal)
             
         # Actualizar estado
         self.estado_actual = siguiente_estado
         self.contador_pasos += 1
-        self._guardar_estado()
+        if self._historial.activo:
+            self._guardar_estado(posicion_anterior, simbolo_actual, escribir_simbolo,
+                                 estado_anterior, extension_anterior)
         
         return True
         
-    def ejecutar_hasta_parar(self):
-        """Ejecutar hasta que la máquina se detenga"""
-        while self.ejecutar_paso():
-            pass
+    def compilar(self):
+        """Tabla entera compartida de la definición"""
+        return self.definicion.compilar()
+        
+    def activar_instrumentacion(self, perfil=None):
+        """Contar visitas, tiempos y posiciones de cada paso en un PerfilEjecucion
+        
+        Sustituye ejecutar_paso y ejecutar_hasta_parar solo en esta instancia,
+        así que sin instrumentación los métodos de la clase no pagan nada. Con
+        ella la ejecución completa va siempre paso a paso.
+        """
+        self.perfil = perfil or PerfilEjecucion()
+        self.ejecutar_paso = self._ejecutar_paso_instrumentado
+        self.ejecutar_hasta_parar = self._ejecutar_hasta_parar_instrumentado
+        return self.perfil
+        
+    def desactivar_instrumentacion(self):
+        """Volver a los métodos sin instrumentar; devuelve el perfil acumulado"""
+        perfil = self.__dict__.pop('perfil', None)
+        self.__dict__.pop('ejecutar_paso', None)
+        self.__dict__.pop('ejecutar_hasta_parar', None)
+        return perfil
+        
+    def _ejecutar_paso_instrumentado(self):
+        estado = self.estado_actual
+        posicion = self.posicion_cabezal
+        simbolo = self.cinta[posicion]
+        inicio = time.perf_counter_ns()
+        avanzo = MaquinaTuring.ejecutar_paso(self)
+        if avanzo:
+            self.perfil.registrar(estado, simbolo, posicion, time.perf_counter_ns() - inicio, len(self.cinta))
+        return avanzo
+        
+    def _ejecutar_hasta_parar_instrumentado(self, max_pasos=None, max_celdas=None, detectar_ciclos=False):
+        self.motivo_parada = None
+        if max_pasos is not None or max_celdas is not None or detectar_ciclos:
+            self._ejecutar_pasos_vigilados(max_pasos, max_celdas, detectar_ciclos)
+        else:
+            while self.ejecutar_paso():
+                pass
+        return self.obtener_estado_actual()
+        
+    def ejecutar_generada(self, max_pasos=None):
+        """Ejecutar hasta parar con el código Python generado para esta definición
+        
+        Alternativa a ejecutar_hasta_parar sin historial, sin barridos y sin
+        detección de ciclos; con max_pasos se corta con veredicto LIMITE. La
+        función se genera y compila la primera vez y se reutiliza después
+        (ver MaquinaCompilada.generar_codigo).
+        """
+        compilada = self.definicion.compilar()
+        tope = -1 if max_pasos is None else max(0, max_pasos - self.contador_pasos)
+        estado, self.posicion_cabezal, pasos = compilada.funcion_generada()(
+            self.cinta, compilada.indice_estado[self.estado_actual], self.posicion_cabezal, tope)
+        self.estado_actual = compilada.estados[estado]
+        self.contador_pasos += pasos
+        simbolo = codificar_simbolo(self.cinta[self.posicion_cabezal])
+        self.motivo_parada = "LIMITE" if pasos == tope and compilada.tabla[estado << 8 | simbolo] else None
+        return self.obtener_estado_actual()
+        
+    def ejecutar_hasta_parar(self, max_pasos=None, max_celdas=None, detectar_ciclos=False):
+        """Ejecutar hasta que la máquina se detenga
+        
+        Con max_pasos o max_celdas la ejecución se corta con veredicto LIMITE;
+        con detectar_ciclos se corta con BUCLE al demostrar que no para.
+        """
+        self.motivo_parada = None
+        vigilar = max_pasos is not None or max_celdas is not None or detectar_ciclos
+        if not self._historial.activo:
+            if vigilar:
+                self._ejecutar_compilada_vigilada(max_pasos, max_celdas, detectar_ciclos)
+            else:
+                self._ejecutar_compilada()
+        elif vigilar:
+            self._ejecutar_pasos_vigilados(max_pasos, max_celdas, detectar_ciclos)
+        else:
+            while self.ejecutar_paso():
+                pass
+        return self.obtener_estado_actual()
+            
+    def _ejecutar_compilada(self):
+        """Bucle rápido sobre la tabla entera, sin historial"""
+        compilada = self.definicion.compilar()
+        estado, self.posicion_cabezal, pasos = compilada.ejecutar(
+            self.cinta, compilada.indice_estado[self.estado_actual], self.posicion_cabezal)
+        self.estado_actual = compilada.estados[estado]
+        self.contador_pasos += pasos
+        
+    def _ejecutar_compilada_vigilada(self, max_pasos, max_celdas, detectar_ciclos):
+        compilada = self.definicion.compilar()
+        if max_pasos is not None:
+            max_pasos = max(0, max_pasos - self.contador_pasos)
+        estado, self.posicion_cabezal, pasos, self.motivo_parada = compilada.ejecutar_vigilado(
+            self.cinta, compilada.indice_estado[self.estado_actual], self.posicion_cabezal,
+            max_pasos, max_celdas, detectar_ciclos, self.longitud_entrada)
+        self.estado_actual = compilada.estados[estado]
+        self.contador_pasos += pasos
+        
+    def _ejecutar_pasos_vigilados(self, max_pasos, max_celdas, detectar_ciclos):
+        """Bucle paso a paso (con historial) aplicando las mismas reglas que la versión compilada"""
+        compilada = self.definicion.compilar()
+        limite_blancos = None
+        detector = None
+        if detectar_ciclos and compilada.solo_derecha:
+            limite_blancos = self.longitud_entrada + len(compilada.estados)
+        elif detectar_ciclos:
+            detector = DetectorCiclos(self.estado_actual, self.posicion_cabezal, self.cinta)
+        estados_parada = self.estados_aceptacion | self.estados_rechazo
+        while (self.estado_actual not in estados_parada
+               and (self.estado_actual, self.cinta[self.posicion_cabezal]) in self.transiciones):
+            if limite_blancos is not None and self.posicion_cabezal >= limite_blancos:
+                self.motivo_parada = "BUCLE"
+                return
+            if max_celdas is not None and len(self.cinta) > max_celdas:
+                self.motivo_parada = "LIMITE"
+                return
+            if max_pasos is not None and self.contador_pasos >= max_pasos:
+                self.motivo_parada = "LIMITE"
+                return
+            posicion = self.posicion_cabezal
+            anterior = self.cinta[posicion]
+            self.ejecutar_paso()
+            if detector is not None:
+                nuevo = self.cinta[posicion]
+                if nuevo != anterior:
+                    detector.escribir(posicion, ord(anterior), ord(nuevo))
+                if detector.avanzar(self.estado_actual, self.posicion_cabezal, self.cinta):
+                    self.motivo_parada = "BUCLE"
+                    return
             
     def obtener_estado_actual(self):
         """Obtener el estado actual de la máquina"""
@@ -82,284 +1084,1781 @@ class MaquinaTuring:
             return "ACEPTADA"
         elif self.estado_actual in self.estados_rechazo:
             return "RECHAZADA"
+        elif self.motivo_parada:
+            return self.motivo_parada
         else:
             return "EJECUTANDO"
             
     def obtener_cadena_cinta(self):
         """Obtener la cinta como cadena con la posición del cabezal marcada"""
         cadena_cinta = ""
-        for i, simbolo in enumerate(self.cinta):
+        for i, simbolo in enumerate(self.cinta, self.cinta.inicio):
             if i == self.posicion_cabezal:
                 cadena_cinta += f"[{simbolo}]"
             else:
                 cadena_cinta += f" {simbolo} "
         return cadena_cinta.strip()
+        
+    # Vista común con MaquinaMultiCinta: la interfaz dibuja una fila por cinta
+    cintas = property(lambda self: (self.cinta,))
+    posiciones = property(lambda self: (self.posicion_cabezal,))
 
-def crear_maquina_regex(patron_regex):
-    """Crear Máquina de Turing para un patrón de expresión regular específico"""
-    maquinas = {
-        "(a|b)*abb": crear_maquina_abb(),
-        "0*1*": crear_maquina_01_estrella(),
-        "(ab)*": crear_maquina_ab_estrella(),
-        "1(01)*0": crear_maquina_1010(),
-        "(a+b)*a(a+b)*": crear_maquina_contiene_a(),
-        "a*b*c*": crear_maquina_abc_estrella(),
-        "(00)*1(11)*": crear_maquina_00111(),
-        "a(a|b)*b": crear_maquina_inicia_a_termina_b(),
-        "(0|1)*00(0|1)*": crear_maquina_contiene_00(),
-        "1*01*01*": crear_maquina_dos_ceros()
-    }
-    return maquinas.get(patron_regex, crear_maquina_abb())
+# Formato binario de punto de control: cabecera fija, nombres con prefijo de
+# longitud y la cinta comprimida con zlib (completa o como diferencias)
+MAGIA_PUNTO_CONTROL = b'MTCK'
+VERSION_PUNTO_CONTROL = 1
+PUNTO_CONTROL_DIFERENCIAL = 1
+BLOQUE_DIFERENCIAS = 4096
+MOTIVOS_PARADA = (None, 'BUCLE', 'LIMITE')
 
-def crear_maquina_abb():
-    """MT para (a|b)*abb"""
-    estados = {'q0', 'q1', 'q2', 'q3', 'aceptar', 'rechazar'}
-    alfabeto = {'a', 'b'}
-    alfabeto_cinta = {'a', 'b', 'X', '_'}
-    estado_inicial = 'q0'
-    estados_aceptacion = {'aceptar'}
-    estados_rechazo = {'rechazar'}
+def _empaquetar_cinta(cinta):
+    import struct
+    contenido = codificar_cadena(cinta.contenido())
+    return struct.pack('<qqI', cinta.inicio, cinta.fin, len(contenido)) + contenido
+
+def _desempaquetar_cinta(datos, desplazamiento, origen=None):
+    """Reconstruir una Cinta normal; devuelve (cinta, nuevo desplazamiento)"""
+    import struct
+    inicio, fin, longitud = struct.unpack_from('<qqI', datos, desplazamiento)
+    desplazamiento += struct.calcsize('<qqI')
+    cinta = Cinta()
+    cinta.datos = bytearray(datos[desplazamiento:desplazamiento + longitud])
+    cinta.datos.append(ord(BLANCO))
+    cinta.origen = -inicio if origen is None else origen
+    cinta.recortar(inicio, fin)
+    return cinta, desplazamiento + longitud
+
+def _diferencias_archivo(cinta):
+    """Tramos de la proyección que difieren del archivo, en bloques de BLOQUE_DIFERENCIAS
     
-    transiciones = {
-        ('q0', 'a'): ('q1', 'X', 'R'),
-        ('q0', 'b'): ('q0', 'X', 'R'),
-        ('q0', '_'): ('rechazar', '_', 'R'),
+    Compara por trozos leyendo el archivo secuencialmente, así que la memoria
+    usada no depende del tamaño de la entrada.
+    """
+    tramos = []
+    with open(cinta.ruta, 'rb') as archivo:
+        for desde in range(0, cinta.longitud, BLOQUE_DIFERENCIAS):
+            original = archivo.read(BLOQUE_DIFERENCIAS)
+            actual = cinta.mapa[desde:desde + len(original)]
+            if actual == original:
+                continue
+            if tramos and tramos[-1][0] + len(tramos[-1][1]) == desde:
+                tramos[-1][1].extend(actual)
+            else:
+                tramos.append((desde, bytearray(actual)))
+    return tramos
+
+def guardar_punto_control(mt, ruta):
+    """Guardar la configuración completa de una MaquinaTuring en ruta
+    
+    Con una CintaMapeada se guardan solo los bloques que difieren del archivo
+    de entrada y las regiones de desbordamiento; si no, la cinta entera. La
+    escritura es atómica (archivo temporal y os.replace), así que un punto de
+    control guardado periódicamente nunca queda a medias.
+    """
+    import struct
+    import zlib
+    
+    compilada = mt.definicion.compilar()
+    estado = compilada.indice_estado[mt.estado_actual]
+    diferencial = isinstance(mt.cinta, CintaMapeada)
+    if diferencial:
+        ruta_entrada = os.path.abspath(mt.cinta.ruta).encode('utf-8')
+        tramos = _diferencias_archivo(mt.cinta)
+        cuerpo = [struct.pack('<H', len(ruta_entrada)), ruta_entrada,
+                  struct.pack('<qqI', mt.cinta.longitud, os.stat(mt.cinta.ruta).st_mtime_ns, len(tramos))]
+        for desde, contenido in tramos:
+            cuerpo.append(struct.pack('<qI', desde, len(contenido)))
+            cuerpo.append(bytes(contenido))
+        cuerpo.append(_empaquetar_cinta(mt.cinta.izquierda))
+        cuerpo.append(_empaquetar_cinta(mt.cinta.derecha))
+    else:
+        cuerpo = [_empaquetar_cinta(mt.cinta)]
+    cabecera = MAGIA_PUNTO_CONTROL + struct.pack(
+        '<BBQqqIB', VERSION_PUNTO_CONTROL, PUNTO_CONTROL_DIFERENCIAL if diferencial else 0,
+        mt.contador_pasos, mt.posicion_cabezal, mt.longitud_entrada, estado,
+        MOTIVOS_PARADA.index(mt.motivo_parada)) + mt.definicion.huella()
+    temporal = f"{ruta}.tmp"
+    with open(temporal, 'wb') as archivo:
+        archivo.write(cabecera)
+        archivo.write(zlib.compress(b''.join(cuerpo)))
+    os.replace(temporal, ruta)
+
+def restaurar_punto_control(ruta, definicion, modo_historial='ninguno'):
+    """Crear una MaquinaTuring con la configuración guardada en ruta
+    
+    Lanza ValueError si el archivo no es un punto de control, si se guardó con
+    otra definición o si el archivo de entrada de una cinta proyectada cambió.
+    """
+    import struct
+    import zlib
+    
+    with open(ruta, 'rb') as archivo:
+        datos = archivo.read()
+    formato = '<BBQqqIB'
+    tamano_cabecera = len(MAGIA_PUNTO_CONTROL) + struct.calcsize(formato) + 32
+    if len(datos) < tamano_cabecera or not datos.startswith(MAGIA_PUNTO_CONTROL):
+        raise ValueError(f"{ruta} no es un punto de control")
+    version, opciones, pasos, posicion, longitud_entrada, estado, motivo = struct.unpack_from(
+        formato, datos, len(MAGIA_PUNTO_CONTROL))
+    if version != VERSION_PUNTO_CONTROL:
+        raise ValueError(f"Versión de punto de control no soportada: {version}")
+    if datos[tamano_cabecera - 32:tamano_cabecera] != definicion.huella():
+        raise ValueError("El punto de control se guardó con otra definición de máquina")
+    cuerpo = zlib.decompress(datos[tamano_cabecera:])
+    
+    mt = MaquinaTuring.desde_definicion(definicion, modo_historial=modo_historial)
+    if opciones & PUNTO_CONTROL_DIFERENCIAL:
+        (longitud_ruta,) = struct.unpack_from('<H', cuerpo, 0)
+        ruta_entrada = cuerpo[2:2 + longitud_ruta].decode('utf-8')
+        desplazamiento = 2 + longitud_ruta
+        longitud, modificado, num_tramos = struct.unpack_from('<qqI', cuerpo, desplazamiento)
+        desplazamiento += struct.calcsize('<qqI')
+        estado_archivo = os.stat(ruta_entrada)
+        if (estado_archivo.st_size, estado_archivo.st_mtime_ns) != (longitud, modificado):
+            raise ValueError(f"El archivo de entrada {ruta_entrada} cambió desde el punto de control")
+        cinta = CintaMapeada(ruta_entrada)
+        for _ in range(num_tramos):
+            desde, tamano = struct.unpack_from('<qI', cuerpo, desplazamiento)
+            desplazamiento += struct.calcsize('<qI')
+            cinta.mapa[desde:desde + tamano] = cuerpo[desplazamiento:desplazamiento + tamano]
+            desplazamiento += tamano
+        cinta.izquierda, desplazamiento = _desempaquetar_cinta(cuerpo, desplazamiento)
+        cinta.derecha, desplazamiento = _desempaquetar_cinta(cuerpo, desplazamiento)
+    else:
+        cinta, _ = _desempaquetar_cinta(cuerpo, 0)
+    mt.cinta = cinta
+    mt.posicion_cabezal = posicion
+    mt.longitud_entrada = longitud_entrada
+    mt.estado_actual = definicion.compilar().estados[estado]
+    mt.contador_pasos = pasos
+    mt.motivo_parada = MOTIVOS_PARADA[motivo]
+    return mt
+
+def ejecutar_con_puntos_control(mt, ruta, cada, max_pasos=None, max_celdas=None):
+    """Ejecutar hasta parar guardando un punto de control cada `cada` pasos
+    
+    El último punto de control guardado corresponde a la configuración final,
+    de modo que restaurarlo y seguir ejecutando es equivalente a no haber
+    interrumpido la ejecución.
+    """
+    if cada <= 0:
+        raise ValueError("El intervalo entre puntos de control debe ser positivo")
+    while True:
+        limite = mt.contador_pasos + cada
+        if max_pasos is not None:
+            limite = min(limite, max_pasos)
+        mt.ejecutar_hasta_parar(max_pasos=limite, max_celdas=max_celdas)
+        # Un LIMITE por el tramo (y no por los presupuestos reales) no es una parada
+        seguir = mt.motivo_parada == "LIMITE" and mt.contador_pasos >= limite and limite != max_pasos
+        if seguir:
+            mt.motivo_parada = None
+        guardar_punto_control(mt, ruta)
+        if not seguir:
+            return mt.obtener_estado_actual()
+
+class MaquinaMultiCinta:
+    """Máquina de Turing de k cintas, cada una con su propio cabezal
+    
+    Las transiciones leen y escriben una tupla de símbolos (uno por cinta) y
+    mueven cada cabezal por separado con 'L', 'R' o 'S' (quieto):
+    (estado, ('a', '_')) -> ('q1', ('a', 'a'), ('R', 'R')). La entrada se
+    escribe en la primera cinta y el resto empiezan en blanco.
+    """
+    def __init__(self, estados, alfabeto, alfabeto_cinta, transiciones, estado_inicial, estados_aceptacion, estados_rechazo,
+                 num_cintas=2):
+        self.estados = frozenset(estados)
+        self.alfabeto = frozenset(alfabeto)
+        self.alfabeto_cinta = frozenset(alfabeto_cinta)
+        self.transiciones = MappingProxyType(dict(transiciones))
+        self.estado_inicial = estado_inicial
+        self.estados_aceptacion = frozenset(estados_aceptacion)
+        self.estados_rechazo = frozenset(estados_rechazo)
+        self.num_cintas = num_cintas
+        for (estado, leidos), (_, escritos, direcciones) in self.transiciones.items():
+            if not len(leidos) == len(escritos) == len(direcciones) == num_cintas:
+                raise ValueError(f"La transición de {(estado, leidos)!r} no es de {num_cintas} cintas")
+        self.inicializar_cinta("")
         
-        ('q1', 'a'): ('q1', 'X', 'R'),
-        ('q1', 'b'): ('q2', 'X', 'R'),
+    def inicializar_cinta(self, cadena_entrada):
+        """Escribir la entrada en la primera cinta y dejar las demás en blanco"""
+        self.cintas = [Cinta(cadena_entrada)] + [Cinta() for _ in range(self.num_cintas - 1)]
+        self.posiciones = [0] * self.num_cintas
+        self.estado_actual = self.estado_inicial
+        self.contador_pasos = 0
+        self.motivo_parada = None
         
-        ('q2', 'a'): ('q1', 'X', 'R'),
-        ('q2', 'b'): ('q3', 'X', 'R'),
+    cinta = property(lambda self: self.cintas[0])
+    posicion_cabezal = property(lambda self: self.posiciones[0])
+    
+    def ejecutar_paso(self):
+        """Ejecutar un paso sobre todas las cintas"""
+        if self.estado_actual in self.estados_aceptacion or self.estado_actual in self.estados_rechazo:
+            return False
+        self.motivo_parada = None
+        leidos = tuple(cinta[posicion] for cinta, posicion in zip(self.cintas, self.posiciones))
+        transicion = self.transiciones.get((self.estado_actual, leidos))
+        if transicion is None:
+            return False
+        self.estado_actual, escritos, direcciones = transicion
+        for k, cinta in enumerate(self.cintas):
+            cinta[self.posiciones[k]] = escritos[k]
+            self.posiciones[k] += MOVIMIENTOS.get(direcciones[k], 0)
+            cinta.extender(self.posiciones[k])
+        self.contador_pasos += 1
+        return True
         
-        ('q3', 'a'): ('q1', 'X', 'R'),
-        ('q3', 'b'): ('q0', 'X', 'R'),
-        ('q3', '_'): ('aceptar', '_', 'R'),
-    }
+    def ejecutar_hasta_parar(self, max_pasos=None, max_celdas=None, detectar_ciclos=False):
+        """Ejecutar hasta que la máquina se detenga
+        
+        max_pasos y max_celdas (por cinta) cortan con LIMITE como en
+        MaquinaTuring; con detectar_ciclos se corta con BUCLE cuando se repite
+        una configuración de las k cintas (DetectorCiclos).
+        """
+        self.motivo_parada = None
+        detector = None
+        if detectar_ciclos:
+            detector = DetectorCiclos(self.estado_actual, tuple(self.posiciones), self.cintas)
+        while True:
+            if max_pasos is not None and self.contador_pasos >= max_pasos:
+                break
+            if max_celdas is not None and max(map(len, self.cintas)) > max_celdas:
+                break
+            if detector is None:
+                if not self.ejecutar_paso():
+                    return self.obtener_estado_actual()
+                continue
+            posiciones = list(self.posiciones)
+            anteriores = [cinta[posicion] for cinta, posicion in zip(self.cintas, posiciones)]
+            if not self.ejecutar_paso():
+                return self.obtener_estado_actual()
+            for k, (cinta, posicion, anterior) in enumerate(zip(self.cintas, posiciones, anteriores)):
+                if cinta[posicion] != anterior:
+                    detector.escribir((k, posicion), ord(anterior), ord(cinta[posicion]))
+            if detector.avanzar(self.estado_actual, tuple(self.posiciones), self.cintas):
+                self.motivo_parada = "BUCLE"
+                return self.obtener_estado_actual()
+        if self.estado_actual not in self.estados_aceptacion | self.estados_rechazo:
+            leidos = tuple(cinta[posicion] for cinta, posicion in zip(self.cintas, self.posiciones))
+            if (self.estado_actual, leidos) in self.transiciones:
+                self.motivo_parada = "LIMITE"
+        return self.obtener_estado_actual()
+        
+    obtener_estado_actual = MaquinaTuring.obtener_estado_actual
+
+def _sucesores_no_deterministas(tabla, configuracion):
+    """Configuraciones alcanzables en un paso desde (estado, cabezal, inicio, bytes)"""
+    estado, posicion, inicio, datos = configuracion
+    blanco = ord(BLANCO)
+    relleno = BLANCO.encode()
+    k = posicion - inicio
+    dentro = 0 <= k < len(datos)
+    leido = datos[k] if dentro else blanco
+    for siguiente, escribir, movimiento in tabla.get((estado, leido), ()):
+        if dentro:
+            nuevos, nuevo_inicio = datos[:k] + bytes((escribir,)) + datos[k + 1:], inicio
+        elif escribir == blanco:
+            nuevos, nuevo_inicio = datos, inicio
+        elif k < 0:
+            nuevos, nuevo_inicio = bytes((escribir,)) + relleno * (-k - 1) + datos, posicion
+        else:
+            nuevos, nuevo_inicio = datos + relleno * (k - len(datos)) + bytes((escribir,)), inicio
+        # Forma canónica: sin blancos en los extremos, para que las ramas iguales coincidan
+        recortados = nuevos.lstrip(relleno)
+        nuevo_inicio += len(nuevos) - len(recortados)
+        recortados = recortados.rstrip(relleno)
+        yield (siguiente, posicion + movimiento, nuevo_inicio if recortados else 0, recortados)
+
+# Tabla de transiciones reutilizada por cada proceso trabajador de MaquinaNoDeterminista
+_tabla_no_determinista_trabajador = None
+
+def _inicializar_trabajador_no_determinista(tabla):
+    global _tabla_no_determinista_trabajador
+    _tabla_no_determinista_trabajador = tabla
+
+def _expandir_bloque_no_determinista(bloque):
+    """Sucesores de un bloque de la frontera, sin repetidos dentro del bloque"""
+    tabla = _tabla_no_determinista_trabajador
+    return list(dict.fromkeys(sucesor for configuracion in bloque
+                              for sucesor in _sucesores_no_deterministas(tabla, configuracion)))
+
+class MaquinaNoDeterminista:
+    """Máquina de Turing no determinista, ejecutada en anchura sobre configuraciones
     
-    return MaquinaTuring(estados, alfabeto, alfabeto_cinta, transiciones, 
-                        estado_inicial, estados_aceptacion, estados_rechazo)
+    Cada transición lleva a un conjunto de alternativas, con movimiento 'L',
+    'R' o 'S' (quieto): (estado, simbolo) -> {(siguiente, escribir, mover), ...}.
+    Una configuración es (estado, cabezal, inicio, bytes de la cinta sin blancos
+    en los extremos), de modo que las ramas que llegan a la misma configuración
+    se exploran una sola vez. La búsqueda para en la primera rama que acepta.
+    """
+    # Fronteras más pequeñas que esto se expanden en el propio proceso
+    FRONTERA_MINIMA_PARALELA = 2048
+    
+    def __init__(self, estados, alfabeto, alfabeto_cinta, transiciones, estado_inicial, estados_aceptacion, estados_rechazo):
+        self.estados = frozenset(estados)
+        self.alfabeto = frozenset(alfabeto)
+        self.alfabeto_cinta = frozenset(alfabeto_cinta)
+        self.transiciones = MappingProxyType({clave: frozenset(opciones) for clave, opciones in transiciones.items()})
+        self.estado_inicial = estado_inicial
+        self.estados_aceptacion = frozenset(estados_aceptacion)
+        self.estados_rechazo = frozenset(estados_rechazo)
+        # Símbolos codificados como bytes y alternativas en orden fijo (resultados reproducibles)
+        estados_parada = self.estados_aceptacion | self.estados_rechazo
+        self.tabla = {
+            (estado, codificar_simbolo(simbolo)): tuple(sorted(
+                (siguiente, codificar_simbolo(escribir), MOVIMIENTOS.get(direccion, 0))
+                for siguiente, escribir, direccion in opciones))
+            for (estado, simbolo), opciones in self.transiciones.items() if estado not in estados_parada
+        }
+        self.estado_actual = estado_inicial
+        self.contador_pasos = 0
+        self.configuraciones_exploradas = 0
+        self.configuracion_aceptada = None
+        self.motivo_parada = None
+        
+    def ejecutar(self, cadena_entrada, max_configuraciones=None, max_frontera=None, procesos=1):
+        """Buscar en anchura una rama que acepte cadena_entrada
+        
+        Devuelve ACEPTADA en cuanto una rama llega a un estado de aceptación,
+        RECHAZADA si todas las ramas paran sin aceptar, o LIMITE si hay más de
+        max_configuraciones configuraciones distintas o la frontera de un nivel
+        supera max_frontera. Con procesos > 1 las fronteras grandes se expanden
+        en un pool de procesos (compensa cuando expandir cuesta más que enviar
+        las configuraciones, p. ej. con cintas largas). contador_pasos es la profundidad alcanzada y
+        configuraciones_exploradas el número de configuraciones distintas vistas.
+        estado_actual es el de la rama que aceptó o, si se rechaza, el de la
+        primera rama que paró en un estado de rechazo (sin ninguna, no cambia);
+        motivo_parada solo toma el valor LIMITE.
+        """
+        codificada = codificar_cadena(cadena_entrada)
+        datos = codificada.lstrip(BLANCO.encode())
+        inicio = len(codificada) - len(datos)
+        datos = datos.rstrip(BLANCO.encode())
+        inicial = (self.estado_inicial, 0, inicio if datos else 0, datos)
+        self.estado_actual = self.estado_inicial
+        self.contador_pasos = 0
+        self.configuracion_aceptada = None
+        self.motivo_parada = None
+        vistas = {inicial}
+        frontera = [inicial]
+        rechazada = None
+        ejecutor = None
+        try:
+            if self.estado_inicial in self.estados_aceptacion:
+                return self._terminar(inicial, vistas)
+            while frontera:
+                if max_frontera is not None and len(frontera) > max_frontera:
+                    self.motivo_parada = "LIMITE"
+                    break
+                if procesos != 1 and len(frontera) >= self.FRONTERA_MINIMA_PARALELA:
+                    if ejecutor is None:
+                        from concurrent.futures import ProcessPoolExecutor
+                        procesos = procesos or os.cpu_count() or 1
+                        ejecutor = ProcessPoolExecutor(max_workers=procesos,
+                                                       initializer=_inicializar_trabajador_no_determinista,
+                                                       initargs=(self.tabla,))
+                    tamano_bloque = -(-len(frontera) // (4 * procesos))
+                    bloques = [frontera[i:i + tamano_bloque] for i in range(0, len(frontera), tamano_bloque)]
+                    sucesores = (sucesor for lista in ejecutor.map(_expandir_bloque_no_determinista, bloques)
+                                 for sucesor in lista)
+                else:
+                    sucesores = (sucesor for configuracion in frontera
+                                 for sucesor in _sucesores_no_deterministas(self.tabla, configuracion))
+                self.contador_pasos += 1
+                siguiente = []
+                for configuracion in sucesores:
+                    if configuracion in vistas:
+                        continue
+                    vistas.add(configuracion)
+                    if configuracion[0] in self.estados_aceptacion:
+                        return self._terminar(configuracion, vistas)
+                    if configuracion[0] not in self.estados_rechazo:
+                        siguiente.append(configuracion)
+                    elif rechazada is None:
+                        rechazada = configuracion
+                    if max_configuraciones is not None and len(vistas) >= max_configuraciones:
+                        self.motivo_parada = "LIMITE"
+                        siguiente = []
+                        break
+                frontera = siguiente
+            self.configuraciones_exploradas = len(vistas)
+            if self.motivo_parada is not None:
+                return self.motivo_parada
+            if rechazada is not None:
+                self.estado_actual = rechazada[0]
+            return "RECHAZADA"
+        finally:
+            if ejecutor is not None:
+                ejecutor.shutdown(cancel_futures=True)
+                
+    def _terminar(self, configuracion, vistas):
+        self.configuracion_aceptada = configuracion
+        self.estado_actual = configuracion[0]
+        self.configuraciones_exploradas = len(vistas)
+        return "ACEPTADA"
+        
+    def cinta_aceptada(self):
+        """Cinta de la rama que aceptó como Cinta, o None"""
+        if self.configuracion_aceptada is None:
+            return None
+        _, _, inicio, datos = self.configuracion_aceptada
+        cinta = Cinta()
+        for posicion, simbolo in enumerate(datos.decode('latin-1'), inicio):
+            cinta[posicion] = simbolo
+        return cinta
 
-def crear_maquina_01_estrella():
-    """MT para 0*1*"""
-    estados = {'q0', 'q1', 'aceptar', 'rechazar'}
-    alfabeto = {'0', '1'}
-    alfabeto_cinta = {'0', '1', 'X', '_'}
-    estado_inicial = 'q0'
-    estados_aceptacion = {'aceptar'}
-    estados_rechazo = {'rechazar'}
+def crear_maquina_regex(patron_regex):
+    """Crear un contexto de ejecución para un patrón de expresión regular registrado"""
+    return MaquinaTuring.desde_definicion(obtener_definicion(patron_regex))
+
+def obtener_definicion(patron_regex):
+    """Definición compartida de un patrón, construida la primera vez que se pide
     
-    transiciones = {
-        ('q0', '0'): ('q0', 'X', 'R'),
-        ('q0', '1'): ('q1', 'X', 'R'),
-        ('q0', '_'): ('aceptar', '_', 'R'),
-        
-        ('q1', '1'): ('q1', 'X', 'R'),
-        ('q1', '0'): ('rechazar', 'X', 'R'),
-        ('q1', '_'): ('aceptar', '_', 'R'),
-    }
+    Los patrones registrados usan su máquina de maquinas/ y cualquier otro
+    se compila con compilar_regex (que lanza ValueError si no es válido).
+    Nunca se interpreta como ruta: los archivos se cargan con cargar_definicion.
+    """
+    definicion = _definiciones_construidas.get(patron_regex)
+    if definicion is None:
+        if patron_regex not in REGISTRO_MAQUINAS:
+            return compilar_regex(patron_regex)
+        definicion = REGISTRO_MAQUINAS[patron_regex]().definicion
+        _definiciones_construidas[patron_regex] = definicion
+    return definicion
+
+# Formato declarativo de máquinas (JSON). Las transiciones son listas
+# [estado, simbolo, siguiente_estado, simbolo_a_escribir, direccion]. Junto a
+# cada archivo se guarda su forma precompilada (CACHE_DEFINICION), válida
+# mientras coincida el SHA-256 del contenido del JSON.
+DIRECTORIO_MAQUINAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'maquinas')
+CACHE_DEFINICION = '.mtc'
+MAGIA_DEFINICION = b'MTDF'
+VERSION_DEFINICION = 1
+CAMPOS_DEFINICION = ('estados', 'alfabeto', 'alfabeto_cinta', 'transiciones', 'estado_inicial',
+                     'estados_aceptacion', 'estados_rechazo')
+DIRECCIONES = ('R', 'L', 'S')
+
+def validar_definicion(datos, completa=False):
+    """Comprobar un diccionario con el formato de máquina; lanza ValueError con todos los errores
     
-    return MaquinaTuring(estados, alfabeto, alfabeto_cinta, transiciones,
-                        estado_inicial, estados_aceptacion, estados_rechazo)
+    Con completa, además, todo estado que no sea de parada debe tener
+    transición para cada símbolo de alfabeto_cinta.
+    """
+    errores = []
+    if not isinstance(datos, dict):
+        raise ValueError("La definición debe ser un objeto JSON")
+    for campo in CAMPOS_DEFINICION:
+        if campo not in datos:
+            errores.append(f"falta el campo '{campo}'")
+    if errores:
+        raise ValueError("; ".join(errores))
+        
+    def simbolos(campo):
+        valores = datos[campo]
+        if not isinstance(valores, list) or not all(isinstance(valor, str) and len(valor) == 1 for valor in valores):
+            errores.append(f"'{campo}' debe ser una lista de símbolos de un carácter")
+            return set()
+        for valor in valores:
+            try:
+                codificar_simbolo(valor)
+            except ValueError as error:
+                errores.append(str(error))
+        return set(valores)
+        
+    if not isinstance(datos['estados'], list) or not all(isinstance(estado, str) for estado in datos['estados']):
+        errores.append("'estados' debe ser una lista de nombres")
+        estados = set()
+    else:
+        estados = set(datos['estados'])
+    alfabeto = simbolos('alfabeto')
+    alfabeto_cinta = simbolos('alfabeto_cinta')
+    if BLANCO not in alfabeto_cinta:
+        errores.append(f"el blanco '{BLANCO}' debe estar en alfabeto_cinta")
+    if BLANCO in alfabeto:
+        errores.append(f"el blanco '{BLANCO}' no puede estar en alfabeto")
+    for simbolo in sorted(alfabeto - alfabeto_cinta):
+        errores.append(f"el símbolo de entrada {simbolo!r} no está en alfabeto_cinta")
+    if datos['estado_inicial'] not in estados:
+        errores.append(f"estado inicial no definido: {datos['estado_inicial']!r}")
+    parada = set()
+    for campo in ('estados_aceptacion', 'estados_rechazo'):
+        if not isinstance(datos[campo], list):
+            errores.append(f"'{campo}' debe ser una lista de estados")
+            continue
+        for estado in datos[campo]:
+            if estado not in estados:
+                errores.append(f"estado no definido en {campo}: {estado!r}")
+        parada.update(estado for estado in datos[campo] if isinstance(estado, str))
+        
+    definidas = set()
+    if not isinstance(datos['transiciones'], list):
+        errores.append("'transiciones' debe ser una lista")
+    else:
+        for numero, transicion in enumerate(datos['transiciones']):
+            if not (isinstance(transicion, list) and len(transicion) == 5
+                    and all(isinstance(valor, str) for valor in transicion)):
+                errores.append(f"transición {numero}: debe ser [estado, simbolo, siguiente, escribir, direccion]")
+                continue
+            estado, simbolo, siguiente, escribir, direccion = transicion
+            for nombre in (estado, siguiente):
+                if nombre not in estados:
+                    errores.append(f"transición {numero}: estado no definido {nombre!r}")
+            for valor in (simbolo, escribir):
+                if valor not in alfabeto_cinta:
+                    errores.append(f"transición {numero}: símbolo {valor!r} fuera de alfabeto_cinta")
+            if direccion not in DIRECCIONES:
+                errores.append(f"transición {numero}: dirección {direccion!r} no es R, L ni S")
+            if estado in parada:
+                errores.append(f"transición {numero}: sale del estado de parada {estado!r}")
+            if (estado, simbolo) in definidas:
+                errores.append(f"transición {numero}: ({estado!r}, {simbolo!r}) repetida")
+            definidas.add((estado, simbolo))
+    if completa:
+        for estado in sorted(estados - parada):
+            for simbolo in sorted(alfabeto_cinta):
+                if (estado, simbolo) not in definidas:
+                    errores.append(f"falta la transición de ({estado!r}, {simbolo!r})")
+    if errores:
+        raise ValueError("; ".join(errores))
 
-def crear_maquina_ab_estrella():
-    """MT para (ab)*"""
-    estados = {'q0', 'q1', 'aceptar', 'rechazar'}
-    alfabeto = {'a', 'b'}
-    alfabeto_cinta = {'a', 'b', 'X', '_'}
-    estado_inicial = 'q0'
-    estados_aceptacion = {'aceptar'}
-    estados_rechazo = {'rechazar'}
+def _leer_cache_definicion(ruta_cache, resumen):
+    """Campos precompilados de ruta_cache, o None si falta, está dañada o es de otro contenido"""
+    import marshal
+    cabecera = MAGIA_DEFINICION + bytes((VERSION_DEFINICION, marshal.version)) + resumen
+    try:
+        with open(ruta_cache, 'rb') as archivo:
+            contenido = archivo.read()
+    except OSError:
+        return None
+    if not contenido.startswith(cabecera):
+        return None
+    try:
+        return marshal.loads(contenido[len(cabecera):])
+    except (ValueError, EOFError, TypeError):
+        return None
+
+def _escribir_cache_definicion(ruta_cache, resumen, campos):
+    """Guardar la forma precompilada; si el directorio no admite escritura se sigue sin caché"""
+    import marshal
+    temporal = f"{ruta_cache}.{os.getpid()}.tmp"
+    try:
+        with open(temporal, 'wb') as archivo:
+            archivo.write(MAGIA_DEFINICION + bytes((VERSION_DEFINICION, marshal.version)) + resumen)
+            archivo.write(marshal.dumps(campos))
+        os.replace(temporal, ruta_cache)
+    except OSError:
+        pass
+
+def leer_archivo_maquina(ruta):
+    """Diccionario validado de un archivo JSON de máquina (sin caché)"""
+    import json
+    with open(ruta, 'rb') as archivo:
+        contenido = archivo.read()
+    try:
+        datos = json.loads(contenido.decode('utf-8'))
+        validar_definicion(datos)
+    except ValueError as error:
+        raise ValueError(f"{ruta}: {error}") from None
+    return datos
+
+def _cargar_archivo_maquina(ruta, usar_cache=True):
+    """(nombre, DefinicionMaquina) de un archivo de máquina, usando la caché si es válida
     
-    transiciones = {
-        ('q0', 'a'): ('q1', 'X', 'R'),
-        ('q0', '_'): ('aceptar', '_', 'R'),
-        ('q0', 'b'): ('rechazar', 'X', 'R'),
-        
-        ('q1', 'b'): ('q0', 'X', 'R'),
-        ('q1', 'a'): ('rechazar', 'X', 'R'),
-        ('q1', '_'): ('rechazar', '_', 'R'),
-    }
+    La caché guarda, con marshal, los argumentos de DefinicionMaquina ya
+    validados y con las transiciones como diccionario, así que cargarla no
+    analiza JSON ni vuelve a validar.
+    """
+    import hashlib
+    with open(ruta, 'rb') as archivo:
+        resumen = hashlib.sha256(archivo.read()).digest()
+    ruta_cache = os.path.splitext(ruta)[0] + CACHE_DEFINICION
+    campos = _leer_cache_definicion(ruta_cache, resumen) if usar_cache else None
+    if campos is None:
+        datos = leer_archivo_maquina(ruta)
+        campos = (datos.get('nombre'), datos['estados'], datos['alfabeto'], datos['alfabeto_cinta'],
+                  {(estado, simbolo): (siguiente, escribir, direccion)
+                   for estado, simbolo, siguiente, escribir, direccion in datos['transiciones']},
+                  datos['estado_inicial'], datos['estados_aceptacion'], datos['estados_rechazo'])
+        if usar_cache:
+            _escribir_cache_definicion(ruta_cache, resumen, campos)
+    return campos[0], DefinicionMaquina(*campos[1:])
+
+# Definiciones ya cargadas por ruta real, con el (mtime, tamaño) del archivo al cargarlas
+_definiciones_archivo = {}
+
+def cargar_definicion(ruta, usar_cache=True):
+    """DefinicionMaquina de un archivo JSON de máquina (ver validar_definicion)
     
-    return MaquinaTuring(estados, alfabeto, alfabeto_cinta, transiciones,
-                        estado_inicial, estados_aceptacion, estados_rechazo)
+    Con usar_cache, la definición se reutiliza mientras el archivo no cambie
+    de fecha ni de tamaño, sin volver a leerlo.
+    """
+    if not usar_cache:
+        return _cargar_archivo_maquina(ruta, usar_cache)[1]
+    clave = os.path.realpath(ruta)
+    estado = os.stat(clave)
+    firma = (estado.st_mtime_ns, estado.st_size)
+    cargada = _definiciones_archivo.get(clave)
+    if cargada is None or cargada[0] != firma:
+        cargada = _definiciones_archivo[clave] = (firma, _cargar_archivo_maquina(clave)[1])
+    return cargada[1]
+
+def cargar_maquinas(directorio=DIRECTORIO_MAQUINAS, usar_cache=True):
+    """Definiciones de todos los .json de directorio, por su campo 'nombre' (o el del archivo)"""
+    definiciones = {}
+    for archivo in sorted(os.listdir(directorio)):
+        if archivo.endswith('.json'):
+            nombre, definicion = _cargar_archivo_maquina(os.path.join(directorio, archivo), usar_cache)
+            definiciones[archivo[:-len('.json')] if nombre is None else nombre] = definicion
+    return definiciones
+
+def guardar_definicion(definicion, ruta, nombre=None):
+    """Escribir una DefinicionMaquina en el formato JSON (una transición por línea)"""
+    import json
+    volcar = lambda valor: json.dumps(valor, ensure_ascii=False)
+    lineas = ["{"]
+    if nombre is not None:
+        lineas.append(f'  "nombre": {volcar(nombre)},')
+    for campo in ('estados', 'alfabeto', 'alfabeto_cinta'):
+        lineas.append(f'  "{campo}": {volcar(sorted(getattr(definicion, campo)))},')
+    lineas.append(f'  "estado_inicial": {volcar(definicion.estado_inicial)},')
+    for campo in ('estados_aceptacion', 'estados_rechazo'):
+        lineas.append(f'  "{campo}": {volcar(sorted(getattr(definicion, campo)))},')
+    transiciones = [volcar([estado, simbolo, siguiente, escribir, direccion])
+                    for (estado, simbolo), (siguiente, escribir, direccion) in definicion.transiciones.items()]
+    lineas.append('  "transiciones": [')
+    lineas.append(',\n'.join(f"    {transicion}" for transicion in transiciones))
+    lineas.append("  ]")
+    lineas.append("}")
+    with open(ruta, 'w', encoding='utf-8') as archivo:
+        archivo.write("\n".join(lineas) + "\n")
+
+def _maquina_incluida(archivo):
+    """MaquinaTuring de una de las máquinas distribuidas en DIRECTORIO_MAQUINAS"""
+    return MaquinaTuring.desde_definicion(cargar_definicion(os.path.join(DIRECTORIO_MAQUINAS, archivo)))
+
+
+def crear_maquina_abb():
+    """MT para (a|b)*abb"""
+    return _maquina_incluida('abb.json')
+
+def crear_maquina_01_estrella():
+    """MT para 0*1*"""
+    return _maquina_incluida('01_estrella.json')
+
+def crear_maquina_ab_estrella():
+    """MT para (ab)*"""
+    return _maquina_incluida('ab_estrella.json')
 
 def crear_maquina_1010():
     """MT para 1(01)*0"""
-    estados = {'q0', 'q1', 'q2', 'aceptar', 'rechazar'}
-    alfabeto = {'0', '1'}
-    alfabeto_cinta = {'0', '1', 'X', '_'}
-    estado_inicial = 'q0'
-    estados_aceptacion = {'aceptar'}
-    estados_rechazo = {'rechazar'}
-    
-    transiciones = {
-        ('q0', '1'): ('q1', 'X', 'R'),
-        ('q0', '0'): ('rechazar', 'X', 'R'),
-        
-        ('q1', '0'): ('q2', 'X', 'R'),
-        ('q1', '1'): ('rechazar', 'X', 'R'),
-        
-        ('q2', '1'): ('q1', 'X', 'R'),
-        ('q2', '0'): ('aceptar', 'X', 'R'),
-        ('q2', '_'): ('rechazar', '_', 'R'),
-    }
-    
-    return MaquinaTuring(estados, alfabeto, alfabeto_cinta, transiciones,
-                        estado_inicial, estados_aceptacion, estados_rechazo)
+    return _maquina_incluida('1010.json')
 
 def crear_maquina_contiene_a():
     """MT para (a+b)*a(a+b)* (contiene al menos una 'a')"""
-    estados = {'q0', 'q1', 'aceptar', 'rechazar'}
+    return _maquina_incluida('contiene_a.json')
+
+def crear_maquina_abc_estrella():
+    """MT para a*b*c*"""
+    return _maquina_incluida('abc_estrella.json')
+
+def crear_maquina_00111():
+    """MT para (00)*1(11)*"""
+    return _maquina_incluida('00111.json')
+
+def crear_maquina_inicia_a_termina_b():
+    """MT para a(a|b)*b"""
+    return _maquina_incluida('inicia_a_termina_b.json')
+
+def crear_maquina_contiene_00():
+    """MT para (0|1)*00(0|1)*"""
+    return _maquina_incluida('contiene_00.json')
+
+def crear_maquina_dos_ceros():
+    """MT para 1*01*01*"""
+    return _maquina_incluida('dos_ceros.json')
+
+def crear_maquina_palindromos():
+    """MT de una cinta para palíndromos sobre {a, b}: borra extremos en zigzag, O(n²) pasos"""
+    estados = {'q0', 'qa', 'qb', 'qa_fin', 'qb_fin', 'volver', 'aceptar', 'rechazar'}
     alfabeto = {'a', 'b'}
-    alfabeto_cinta = {'a', 'b', 'X', '_'}
+    alfabeto_cinta = {'a', 'b', '_'}
     estado_inicial = 'q0'
     estados_aceptacion = {'aceptar'}
     estados_rechazo = {'rechazar'}
     
     transiciones = {
-        ('q0', 'a'): ('q1', 'X', 'R'),
-        ('q0', 'b'): ('q0', 'X', 'R'),
-        ('q0', '_'): ('rechazar', '_', 'R'),
+        # Borrar el primer símbolo y recordarlo
+        ('q0', 'a'): ('qa', '_', 'R'),
+        ('q0', 'b'): ('qb', '_', 'R'),
+        ('q0', '_'): ('aceptar', '_', 'R'),
         
-        ('q1', 'a'): ('q1', 'X', 'R'),
-        ('q1', 'b'): ('q1', 'X', 'R'),
-        ('q1', '_'): ('aceptar', '_', 'R'),
+        # Ir hasta el último símbolo
+        ('qa', 'a'): ('qa', 'a', 'R'),
+        ('qa', 'b'): ('qa', 'b', 'R'),
+        ('qa', '_'): ('qa_fin', '_', 'L'),
+        ('qb', 'a'): ('qb', 'a', 'R'),
+        ('qb', 'b'): ('qb', 'b', 'R'),
+        ('qb', '_'): ('qb_fin', '_', 'L'),
+        
+        # Comparar el último con el recordado y borrarlo
+        ('qa_fin', 'a'): ('volver', '_', 'L'),
+        ('qa_fin', 'b'): ('rechazar', 'b', 'L'),
+        ('qa_fin', '_'): ('aceptar', '_', 'R'),
+        ('qb_fin', 'b'): ('volver', '_', 'L'),
+        ('qb_fin', 'a'): ('rechazar', 'a', 'L'),
+        ('qb_fin', '_'): ('aceptar', '_', 'R'),
+        
+        # Volver al principio de lo que queda
+        ('volver', 'a'): ('volver', 'a', 'L'),
+        ('volver', 'b'): ('volver', 'b', 'L'),
+        ('volver', '_'): ('q0', '_', 'R'),
     }
     
     return MaquinaTuring(estados, alfabeto, alfabeto_cinta, transiciones,
                         estado_inicial, estados_aceptacion, estados_rechazo)
 
-def crear_maquina_abc_estrella():
-    """MT para a*b*c*"""
-    estados = {'q0', 'q1', 'q2', 'aceptar', 'rechazar'}
-    alfabeto = {'a', 'b', 'c'}
-    alfabeto_cinta = {'a', 'b', 'c', 'X', '_'}
-    estado_inicial = 'q0'
+def crear_maquina_palindromos_2cintas():
+    """MT de dos cintas para palíndromos sobre {a, b}: copia y compara en sentidos opuestos, O(n) pasos"""
+    estados = {'copiar', 'rebobinar', 'comparar', 'aceptar', 'rechazar'}
+    alfabeto = {'a', 'b'}
+    alfabeto_cinta = {'a', 'b', '_'}
+    estado_inicial = 'copiar'
     estados_aceptacion = {'aceptar'}
     estados_rechazo = {'rechazar'}
     
     transiciones = {
-        ('q0', 'a'): ('q0', 'X', 'R'),
-        ('q0', 'b'): ('q1', 'X', 'R'),
-        ('q0', 'c'): ('q2', 'X', 'R'),
-        ('q0', '_'): ('aceptar', '_', 'R'),
-        
-        ('q1', 'b'): ('q1', 'X', 'R'),
-        ('q1', 'c'): ('q2', 'X', 'R'),
-        ('q1', 'a'): ('rechazar', 'X', 'R'),
-        ('q1', '_'): ('aceptar', '_', 'R'),
-        
-        ('q2', 'c'): ('q2', 'X', 'R'),
-        ('q2', 'a'): ('rechazar', 'X', 'R'),
-        ('q2', 'b'): ('rechazar', 'X', 'R'),
-        ('q2', '_'): ('aceptar', '_', 'R'),
+        # Copiar la entrada en la segunda cinta
+        ('copiar', ('a', '_')): ('copiar', ('a', 'a'), ('R', 'R')),
+        ('copiar', ('b', '_')): ('copiar', ('b', 'b'), ('R', 'R')),
+        ('copiar', ('_', '_')): ('rebobinar', ('_', '_'), ('L', 'L')),
+        
+        # Volver al principio de la primera cinta; la segunda queda en su último símbolo
+        ('rebobinar', ('a', 'a')): ('rebobinar', ('a', 'a'), ('L', 'S')),
+        ('rebobinar', ('b', 'a')): ('rebobinar', ('b', 'a'), ('L', 'S')),
+        ('rebobinar', ('a', 'b')): ('rebobinar', ('a', 'b'), ('L', 'S')),
+        ('rebobinar', ('b', 'b')): ('rebobinar', ('b', 'b'), ('L', 'S')),
+        ('rebobinar', ('_', 'a')): ('comparar', ('_', 'a'), ('R', 'S')),
+        ('rebobinar', ('_', 'b')): ('comparar', ('_', 'b'), ('R', 'S')),
+        ('rebobinar', ('_', '_')): ('aceptar', ('_', '_'), ('S', 'S')),
+        
+        # Leer la primera hacia la derecha y la copia hacia la izquierda
+        ('comparar', ('a', 'a')): ('comparar', ('a', 'a'), ('R', 'L')),
+        ('comparar', ('b', 'b')): ('comparar', ('b', 'b'), ('R', 'L')),
+        ('comparar', ('a', 'b')): ('rechazar', ('a', 'b'), ('S', 'S')),
+        ('comparar', ('b', 'a')): ('rechazar', ('b', 'a'), ('S', 'S')),
+        ('comparar', ('_', '_')): ('aceptar', ('_', '_'), ('S', 'S')),
     }
     
-    return MaquinaTuring(estados, alfabeto, alfabeto_cinta, transiciones,
-                        estado_inicial, estados_aceptacion, estados_rechazo)
+    return MaquinaMultiCinta(estados, alfabeto, alfabeto_cinta, transiciones,
+                             estado_inicial, estados_aceptacion, estados_rechazo, num_cintas=2)
 
-def crear_maquina_00111():
-    """MT para (00)*1(11)*"""
+def crear_maquina_anbn():
+    """MT de una cinta para aⁿbⁿ: tacha una 'a' y una 'b' por pasada, O(n²) pasos"""
     estados = {'q0', 'q1', 'q2', 'q3', 'aceptar', 'rechazar'}
-    alfabeto = {'0', '1'}
-    alfabeto_cinta = {'0', '1', 'X', '_'}
+    alfabeto = {'a', 'b'}
+    alfabeto_cinta = {'a', 'b', 'X', 'Y', '_'}
     estado_inicial = 'q0'
     estados_aceptacion = {'aceptar'}
     estados_rechazo = {'rechazar'}
     
     transiciones = {
-        ('q0', '0'): ('q1', 'X', 'R'),
-        ('q0', '1'): ('q2', 'X', 'R'),
-        ('q0', '_'): ('rechazar', '_', 'R'),
+        ('q0', 'a'): ('q1', 'X', 'R'),
+        ('q0', 'Y'): ('q3', 'Y', 'R'),
+        ('q0', 'b'): ('rechazar', 'b', 'R'),
+        ('q0', '_'): ('aceptar', '_', 'R'),
         
-        ('q1', '0'): ('q0', 'X', 'R'),
-        ('q1', '1'): ('rechazar', 'X', 'R'),
+        # Buscar la primera 'b' sin tachar
+        ('q1', 'a'): ('q1', 'a', 'R'),
+        ('q1', 'Y'): ('q1', 'Y', 'R'),
+        ('q1', 'b'): ('q2', 'Y', 'L'),
+        ('q1', '_'): ('rechazar', '_', 'R'),
         
-        ('q2', '1'): ('q3', 'X', 'R'),
-        ('q2', '0'): ('rechazar', 'X', 'R'),
+        # Volver a la última 'a' tachada
+        ('q2', 'a'): ('q2', 'a', 'L'),
+        ('q2', 'Y'): ('q2', 'Y', 'L'),
+        ('q2', 'X'): ('q0', 'X', 'R'),
         
-        ('q3', '1'): ('q2', 'X', 'R'),
-        ('q3', '0'): ('rechazar', 'X', 'R'),
+        # Sin 'a' por tachar: solo pueden quedar 'b' tachadas
+        ('q3', 'Y'): ('q3', 'Y', 'R'),
+        ('q3', 'a'): ('rechazar', 'a', 'R'),
+        ('q3', 'b'): ('rechazar', 'b', 'R'),
         ('q3', '_'): ('aceptar', '_', 'R'),
     }
     
     return MaquinaTuring(estados, alfabeto, alfabeto_cinta, transiciones,
                         estado_inicial, estados_aceptacion, estados_rechazo)
 
-def crear_maquina_inicia_a_termina_b():
-    """MT para a(a|b)*b"""
-    estados = {'q0', 'q1', 'verificar_ultimo', 'aceptar', 'rechazar'}
+def crear_maquina_anbn_2cintas():
+    """MT de dos cintas para aⁿbⁿ: apila las 'a' en la segunda cinta y las descuenta, O(n) pasos"""
+    estados = {'contar', 'descontar', 'aceptar', 'rechazar'}
     alfabeto = {'a', 'b'}
-    alfabeto_cinta = {'a', 'b', 'X', '_'}
-    estado_inicial = 'q0'
+    alfabeto_cinta = {'a', 'b', '_'}
+    estado_inicial = 'contar'
     estados_aceptacion = {'aceptar'}
     estados_rechazo = {'rechazar'}
     
     transiciones = {
-        ('q0', 'a'): ('q1', 'X', 'R'),
-        ('q0', 'b'): ('rechazar', 'X', 'R'),
-        
-        ('q1', 'a'): ('q1', 'X', 'R'),
-        ('q1', 'b'): ('q1', 'X', 'R'),
-        ('q1', '_'): ('verificar_ultimo', '_', 'L'),
-        
-        ('verificar_ultimo', 'b'): ('aceptar', 'X', 'R'),
-        ('verificar_ultimo', 'a'): ('rechazar', 'X', 'R'),
-        ('verificar_ultimo', 'X'): ('verificar_ultimo', 'X', 'L'),
+        ('contar', ('a', '_')): ('contar', ('a', 'a'), ('R', 'R')),
+        ('contar', ('b', '_')): ('descontar', ('b', '_'), ('S', 'L')),
+        ('contar', ('_', '_')): ('descontar', ('_', '_'), ('S', 'L')),
+        
+        ('descontar', ('b', 'a')): ('descontar', ('b', 'a'), ('R', 'L')),
+        ('descontar', ('_', '_')): ('aceptar', ('_', '_'), ('S', 'S')),
+        ('descontar', ('_', 'a')): ('rechazar', ('_', 'a'), ('S', 'S')),
+        ('descontar', ('b', '_')): ('rechazar', ('b', '_'), ('S', 'S')),
+        ('descontar', ('a', 'a')): ('rechazar', ('a', 'a'), ('S', 'S')),
+        ('descontar', ('a', '_')): ('rechazar', ('a', '_'), ('S', 'S')),
     }
     
-    return MaquinaTuring(estados, alfabeto, alfabeto_cinta, transiciones,
-                        estado_inicial, estados_aceptacion, estados_rechazo)
+    return MaquinaMultiCinta(estados, alfabeto, alfabeto_cinta, transiciones,
+                             estado_inicial, estados_aceptacion, estados_rechazo, num_cintas=2)
 
-def crear_maquina_contiene_00():
-    """MT para (0|1)*00(0|1)*"""
-    estados = {'q0', 'q1', 'aceptar', 'rechazar'}
-    alfabeto = {'0', '1'}
-    alfabeto_cinta = {'0', '1', 'X', '_'}
-    estado_inicial = 'q0'
-    estados_aceptacion = {'aceptar'}
-    estados_rechazo = {'rechazar'}
+# Constructores de las máquinas predefinidas por patrón; se invocan de forma perezosa
+REGISTRO_MAQUINAS = {
+    "(a|b)*abb": crear_maquina_abb,
+    "0*1*": crear_maquina_01_estrella,
+    "(ab)*": crear_maquina_ab_estrella,
+    "1(01)*0": crear_maquina_1010,
+    "(a+b)*a(a+b)*": crear_maquina_contiene_a,
+    "a*b*c*": crear_maquina_abc_estrella,
+    "(00)*1(11)*": crear_maquina_00111,
+    "a(a|b)*b": crear_maquina_inicia_a_termina_b,
+    "(0|1)*00(0|1)*": crear_maquina_contiene_00,
+    "1*01*01*": crear_maquina_dos_ceros
+}
+_definiciones_construidas = {}
+
+# Máquinas de ejemplo que no son expresiones regulares (comparación de una y dos cintas)
+MAQUINAS_EJEMPLO = {
+    "palindromos (1 cinta)": crear_maquina_palindromos,
+    "palindromos (2 cintas)": crear_maquina_palindromos_2cintas,
+    "a^n b^n (1 cinta)": crear_maquina_anbn,
+    "a^n b^n (2 cintas)": crear_maquina_anbn_2cintas,
+}
+
+def crear_maquina(nombre):
+    """Máquina de ejemplo por nombre o, si no lo es, la del patrón regular"""
+    if nombre in MAQUINAS_EJEMPLO:
+        return MAQUINAS_EJEMPLO[nombre]()
+    return crear_maquina_regex(nombre)
+
+# Compilador de expresiones regulares: patrón -> AFN (Thompson) -> AFD -> AFD mínimo -> MT.
+# Sintaxis: símbolos de un carácter, '|' o '+' (unión), '*', paréntesis y concatenación.
+OPERADORES_REGEX = '|+*()'
+TAMANO_CACHE_REGEX = 128
+
+def _analizar_regex(patron):
+    """Árbol sintáctico del patrón como tuplas ('simbolo', c), ('vacio',),
+    ('union', a, b), ('concatenacion', a, b) o ('estrella', a)"""
+    posicion = 0
     
-    transiciones = {
-        ('q0', '0'): ('q1', 'X', 'R'),
-        ('q0', '1'): ('q0', 'X', 'R'),
-        ('q0', '_'): ('rechazar', '_', 'R'),
-        
-        ('q1', '0'): ('aceptar', 'X', 'R'),
-        ('q1', '1'): ('q0', 'X', 'R'),
-        ('q1', '_'): ('rechazar', '_', 'R'),
-    }
+    def union():
+        nonlocal posicion
+        arbol = concatenacion()
+        while posicion < len(patron) and patron[posicion] in '|+':
+            posicion += 1
+            arbol = ('union', arbol, concatenacion())
+        return arbol
+        
+    def concatenacion():
+        arbol = ('vacio',)
+        while posicion < len(patron) and patron[posicion] not in '|+)':
+            factor = estrella()
+            arbol = factor if arbol == ('vacio',) else ('concatenacion', arbol, factor)
+        return arbol
+        
+    def estrella():
+        nonlocal posicion
+        arbol = atomo()
+        while posicion < len(patron) and patron[posicion] == '*':
+            posicion += 1
+            arbol = ('estrella', arbol)
+        return arbol
+        
+    def atomo():
+        nonlocal posicion
+        caracter = patron[posicion]
+        posicion += 1
+        if caracter == '(':
+            arbol = union()
+            if posicion >= len(patron) or patron[posicion] != ')':
+                raise ValueError(f"Falta ')' en el patrón {patron!r}")
+            posicion += 1
+            return arbol
+        if caracter == '*':
+            raise ValueError(f"'*' sin operando en la posición {posicion - 1} del patrón {patron!r}")
+        if caracter == BLANCO or caracter.isspace():
+            raise ValueError(f"Símbolo no permitido en el patrón: {caracter!r}")
+        codificar_simbolo(caracter)
+        return ('simbolo', caracter)
+        
+    arbol = union()
+    if posicion < len(patron):
+        raise ValueError(f"')' sin pareja en la posición {posicion} del patrón {patron!r}")
+    return arbol
+
+def _construir_afn(arbol):
+    """Construcción de Thompson; devuelve (vacias, por_simbolo, inicial, final)"""
+    vacias = []        # estado -> estados alcanzables con transición vacía
+    por_simbolo = []   # estado -> (simbolo, destino) o None
     
-    return MaquinaTuring(estados, alfabeto, alfabeto_cinta, transiciones,
-                        estado_inicial, estados_aceptacion, estados_rechazo)
+    def nuevo_estado():
+        vacias.append([])
+        por_simbolo.append(None)
+        return len(vacias) - 1
+        
+    def construir(nodo):
+        tipo = nodo[0]
+        inicio, fin = nuevo_estado(), nuevo_estado()
+        if tipo == 'vacio':
+            vacias[inicio].append(fin)
+        elif tipo == 'simbolo':
+            por_simbolo[inicio] = (nodo[1], fin)
+        elif tipo == 'union':
+            for rama in nodo[1:]:
+                rama_inicio, rama_fin = construir(rama)
+                vacias[inicio].append(rama_inicio)
+                vacias[rama_fin].append(fin)
+        elif tipo == 'concatenacion':
+            izquierda_inicio, izquierda_fin = construir(nodo[1])
+            derecha_inicio, derecha_fin = construir(nodo[2])
+            vacias[inicio].append(izquierda_inicio)
+            vacias[izquierda_fin].append(derecha_inicio)
+            vacias[derecha_fin].append(fin)
+        else:  # estrella
+            interior_inicio, interior_fin = construir(nodo[1])
+            vacias[inicio].extend((interior_inicio, fin))
+            vacias[interior_fin].extend((interior_inicio, fin))
+        return inicio, fin
+        
+    inicial, final = construir(arbol)
+    return vacias, por_simbolo, inicial, final
 
-def crear_maquina_dos_ceros():
-    """MT para 1*01*01*"""
-    estados = {'q0', 'q1', 'q2', 'aceptar', 'rechazar'}
-    alfabeto = {'0', '1'}
-    alfabeto_cinta = {'0', '1', 'X', '_'}
-    estado_inicial = 'q0'
-    estados_aceptacion = {'aceptar'}
-    estados_rechazo = {'rechazar'}
+def _afd_desde_afn(vacias, por_simbolo, inicial, final, alfabeto, max_estados=None):
+    """Construcción por subconjuntos; devuelve (delta, aceptacion) con el estado 0 inicial
     
-    transiciones = {
-        ('q0', '1'): ('q0', 'X', 'R'),
-        ('q0', '0'): ('q1', 'X', 'R'),
-        ('q0', '_'): ('rechazar', '_', 'R'),
-        
-        ('q1', '1'): ('q1', 'X', 'R'),
-        ('q1', '0'): ('q2', 'X', 'R'),
-        ('q1', '_'): ('rechazar', '_', 'R'),
-        
-        ('q2', '1'): ('q2', 'X', 'R'),
-        ('q2', '0'): ('rechazar', 'X', 'R'),
-        ('q2', '_'): ('aceptar', '_', 'R'),
+    delta[estado][simbolo] es el estado destino; el conjunto vacío es un estado más
+    (el sumidero), así que el AFD resultante es completo. Con max_estados se
+    lanza ValueError en cuanto el AFD (aún sin minimizar) lo supera.
+    """
+    def clausura(estados):
+        pendientes = list(estados)
+        visitados = set(estados)
+        while pendientes:
+            for destino in vacias[pendientes.pop()]:
+                if destino not in visitados:
+                    visitados.add(destino)
+                    pendientes.append(destino)
+        return frozenset(visitados)
+        
+    indices = {clausura([inicial]): 0}
+    conjuntos = list(indices)
+    delta = []
+    for conjunto in conjuntos:  # la lista crece mientras se recorre
+        fila = {}
+        for simbolo in alfabeto:
+            destino = clausura([par[1] for par in map(por_simbolo.__getitem__, conjunto)
+                                if par is not None and par[0] == simbolo])
+            if destino not in indices:
+                if max_estados is not None and len(conjuntos) >= max_estados:
+                    raise ValueError(f"El AFD del patrón supera {max_estados} estados")
+                indices[destino] = len(conjuntos)
+                conjuntos.append(destino)
+            fila[simbolo] = indices[destino]
+        delta.append(fila)
+    return delta, [final in conjunto for conjunto in conjuntos]
+
+def _minimizar_afd(delta, aceptacion, alfabeto):
+    """Refinamiento de particiones (Moore); devuelve el AFD cociente con el mismo formato"""
+    clase = [1 if acepta else 0 for acepta in aceptacion]
+    num_clases = len(set(clase))
+    while True:
+        firmas = {}
+        nueva = [firmas.setdefault((clase[estado],) + tuple(clase[delta[estado][simbolo]] for simbolo in alfabeto),
+                                   len(firmas))
+                 for estado in range(len(delta))]
+        clase = nueva
+        if len(firmas) == num_clases:
+            break
+        num_clases = len(firmas)
+    # Renumerar en orden de descubrimiento desde el estado inicial
+    orden = {clase[0]: 0}
+    pendientes = deque([0])
+    representante = {clase[0]: 0}
+    while pendientes:
+        estado = pendientes.popleft()
+        for simbolo in alfabeto:
+            destino = delta[estado][simbolo]
+            if clase[destino] not in orden:
+                orden[clase[destino]] = len(orden)
+                representante[clase[destino]] = destino
+                pendientes.append(destino)
+    minimo = [None] * len(orden)
+    acepta = [False] * len(orden)
+    for c, estado in representante.items():
+        minimo[orden[c]] = {simbolo: orden[clase[delta[estado][simbolo]]] for simbolo in alfabeto}
+        acepta[orden[c]] = aceptacion[estado]
+    return minimo, acepta
+
+@lru_cache(maxsize=TAMANO_CACHE_REGEX)
+def compilar_regex(patron_regex, max_estados=None):
+    """Compilar un patrón arbitrario a la definición de una MT de solo derecha
+    
+    Cada símbolo leído se marca con 'X'; al llegar al blanco se pasa a 'aceptar'
+    o 'rechazar', y en cuanto el AFD cae en el sumidero se rechaza sin leer más.
+    Las definiciones compiladas se guardan en una caché LRU por patrón. La
+    construcción por subconjuntos es exponencial en el peor caso: max_estados
+    la corta con ValueError (para patrones que no son de confianza).
+    """
+    arbol = _analizar_regex(patron_regex)
+    alfabeto = sorted({caracter for caracter in patron_regex if caracter not in OPERADORES_REGEX})
+    delta, aceptacion = _minimizar_afd(*_afd_desde_afn(*_construir_afn(arbol), alfabeto, max_estados), alfabeto)
+    
+    # Estados vivos: los que aún pueden llegar a aceptación
+    vivos = {estado for estado, acepta in enumerate(aceptacion) if acepta}
+    cambiado = True
+    while cambiado:
+        cambiado = False
+        for estado, fila in enumerate(delta):
+            if estado not in vivos and any(destino in vivos for destino in fila.values()):
+                vivos.add(estado)
+                cambiado = True
+    
+    nombres = {estado: f'q{estado}' for estado in range(len(delta)) if estado in vivos or estado == 0}
+    transiciones = {}
+    for estado, nombre in nombres.items():
+        for simbolo, destino in delta[estado].items():
+            siguiente = nombres[destino] if destino in vivos else 'rechazar'
+            transiciones[(nombre, simbolo)] = (siguiente, 'X', 'R')
+        transiciones[(nombre, BLANCO)] = ('aceptar' if aceptacion[estado] else 'rechazar', BLANCO, 'R')
+    
+    return DefinicionMaquina(set(nombres.values()) | {'aceptar', 'rechazar'}, set(alfabeto),
+                             set(alfabeto) | {'X', BLANCO}, transiciones, 'q0',
+                             {'aceptar'}, {'rechazar'})
+
+def optimizar_definicion(definicion):
+    """Reducir la tabla de transiciones sin cambiar qué cadenas se aceptan
+    
+    Quita los estados inalcanzables desde el inicial, convierte en estados de
+    rechazo (sin transiciones) los que no pueden llegar a un estado de
+    aceptación, de modo que la ejecución para en cuanto entra en ellos con
+    RECHAZADA, y fusiona los estados equivalentes por refinamiento de
+    particiones. Las cadenas aceptadas y sus pasos no cambian; las demás pueden
+    acabar antes y con RECHAZADA en lugar de BUCLE, LIMITE o una parada en un
+    estado intermedio. Devuelve (definicion_optimizada, informe).
+    """
+    inicial = definicion.estado_inicial
+    aceptacion = definicion.estados_aceptacion
+    rechazo = set(definicion.estados_rechazo)
+    parada = aceptacion | rechazo
+    sucesores = {}
+    for (estado, simbolo), transicion in definicion.transiciones.items():
+        if estado not in parada:
+            sucesores.setdefault(estado, {})[simbolo] = transicion
+    
+    def alcanzables(origenes, vecinos):
+        visitados = set(origenes)
+        pendientes = list(origenes)
+        while pendientes:
+            for destino in vecinos.get(pendientes.pop(), ()):
+                if destino not in visitados:
+                    visitados.add(destino)
+                    pendientes.append(destino)
+        return visitados
+    
+    # 1. Estados inalcanzables desde el inicial
+    grafo = {estado: {transicion[0] for transicion in fila.values()} for estado, fila in sucesores.items()}
+    vivos = alcanzables([inicial], grafo)
+    # 2. Estados sin camino a aceptación: pasan a ser de rechazo y sin transiciones
+    inverso = {}
+    for estado in vivos:
+        for destino in grafo.get(estado, ()):
+            inverso.setdefault(destino, set()).add(estado)
+    utiles = alcanzables([estado for estado in vivos if estado in aceptacion], inverso)
+    sin_salida = sorted(vivos - utiles - rechazo, key=str)
+    rechazo |= set(sin_salida)
+    # 3. Fusión de equivalentes: misma clase de parada y mismas transiciones entre clases
+    estados = sorted(vivos, key=lambda estado: (estado != inicial, estado in sin_salida, str(estado)))
+    simbolos = sorted({simbolo for fila in sucesores.values() for simbolo in fila}, key=str)
+    filas = {estado: ({} if estado in rechazo else sucesores.get(estado, {})) for estado in estados}
+    clase = {estado: 2 if estado in aceptacion else 1 if estado in rechazo else 0 for estado in estados}
+    num_clases = len(set(clase.values()))
+    while True:
+        firmas = {}
+        nueva = {}
+        for estado in estados:
+            fila = filas[estado]
+            firma = (clase[estado],) + tuple(
+                (fila[simbolo][1], fila[simbolo][2], clase[fila[simbolo][0]]) if simbolo in fila else None
+                for simbolo in simbolos)
+            nueva[estado] = firmas.setdefault(firma, len(firmas))
+        clase = nueva
+        if len(firmas) == num_clases:
+            break
+        num_clases = len(firmas)
+    representante = {}
+    for estado in estados:  # el primero de cada clase según el orden de arriba
+        representante.setdefault(clase[estado], estado)
+    nombre = {estado: representante[clase[estado]] for estado in estados}
+    
+    transiciones = {}
+    for estado in set(nombre.values()):
+        for simbolo, (siguiente, escribir, direccion) in filas[estado].items():
+            transiciones[(estado, simbolo)] = (nombre[siguiente], escribir, direccion)
+    nuevos_estados = set(nombre.values())
+    optimizada = DefinicionMaquina(nuevos_estados, definicion.alfabeto, definicion.alfabeto_cinta,
+                                   transiciones, inicial, aceptacion & nuevos_estados,
+                                   rechazo & nuevos_estados)
+    informe = {
+        'estados': (len(definicion.estados), len(nuevos_estados)),
+        'transiciones': (len(definicion.transiciones), len(transiciones)),
+        'inalcanzables': sorted(set(definicion.estados) - vivos, key=str),
+        'sin_salida': sin_salida,
+        'fusionados': {estado: destino for estado, destino in sorted(nombre.items(), key=lambda par: str(par[0]))
+                       if estado != destino},
     }
+    return optimizada, informe
+
+def crear_maquina_no_determinista(patron_regex):
+    """MT no determinista que sigue directamente el AFN de Thompson del patrón
     
-    return MaquinaTuring(estados, alfabeto, alfabeto_cinta, transiciones,
-                        estado_inicial, estados_aceptacion, estados_rechazo)
+    Las transiciones vacías se convierten en pasos que no mueven el cabezal;
+    cada símbolo leído se marca con 'X' y se avanza a la derecha.
+    """
+    vacias, por_simbolo, inicial, final = _construir_afn(_analizar_regex(patron_regex))
+    alfabeto = {caracter for caracter in patron_regex if caracter not in OPERADORES_REGEX}
+    transiciones = {}
+    for estado in range(len(vacias)):
+        for destino in vacias[estado]:
+            for simbolo in alfabeto | {BLANCO}:
+                transiciones.setdefault((f'n{estado}', simbolo), set()).add((f'n{destino}', simbolo, 'S'))
+        if por_simbolo[estado] is not None:
+            simbolo, destino = por_simbolo[estado]
+            transiciones.setdefault((f'n{estado}', simbolo), set()).add((f'n{destino}', 'X', 'R'))
+    transiciones.setdefault((f'n{final}', BLANCO), set()).add(('aceptar', BLANCO, 'S'))
+    estados = {f'n{estado}' for estado in range(len(vacias))} | {'aceptar', 'rechazar'}
+    return MaquinaNoDeterminista(estados, alfabeto, alfabeto | {'X', BLANCO}, transiciones,
+                                 f'n{inicial}', {'aceptar'}, {'rechazar'})
+
+def medir_compilacion(patrones, repeticiones=20):
+    """Tiempo medio de compilación (sin caché) por patrón, en milisegundos"""
+    compilar = compilar_regex.__wrapped__
+    resultados = []
+    for patron in patrones:
+        inicio = time.perf_counter()
+        for _ in range(repeticiones):
+            definicion = compilar(patron)
+        milisegundos = (time.perf_counter() - inicio) * 1000 / repeticiones
+        resultados.append((patron, len(definicion.estados), len(definicion.transiciones), milisegundos))
+    return resultados
+
+def _importar_numpy():
+    """NumPy es opcional: sin él se usa el recorrido en Python puro"""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+def evaluar_cadena(definicion, cadena, max_pasos=None, max_celdas=None):
+    """Veredicto y número de pasos de una cadena, sin conservar la cinta
+    
+    Las máquinas que solo se mueven a la derecha se recorren como AFD sin
+    escribir en la cinta; el resto se simula completa. En ambos casos se
+    detectan los bucles y se aplican los presupuestos igual que en
+    MaquinaTuring.ejecutar_hasta_parar con detectar_ciclos.
+    """
+    compilada = definicion.compilar()
+    if compilada.solo_derecha:
+        datos = codificar_cadena(cadena)
+        estado, pasos = compilada.ejecutar_afd(datos)
+        return _veredicto_afd(compilada, estado, pasos, len(datos), max_pasos, max_celdas)
+    mt = MaquinaTuring.desde_definicion(definicion, modo_historial='ninguno')
+    mt.inicializar_cinta(cadena)
+    veredicto = mt.ejecutar_hasta_parar(max_pasos, max_celdas, detectar_ciclos=True)
+    return veredicto, mt.contador_pasos
+
+def _veredicto_afd(compilada, estado, pasos, longitud, max_pasos, max_celdas):
+    """Traducir el resultado de un recorrido AFD al de la simulación vigilada"""
+    # El cabezal está en la celda 'pasos', así que el tramo visible supera
+    # max_celdas justo tras el paso max_celdas (o desde el inicio si la entrada no cabe)
+    tope = float('inf') if max_pasos is None else max_pasos
+    if max_celdas is not None:
+        tope = min(tope, max_celdas if longitud + 1 <= max_celdas else 0)
+    bucle = pasos == longitud + len(compilada.estados) and not compilada.es_parada[estado]
+    if pasos > tope:
+        return "LIMITE", tope
+    if bucle:
+        return "BUCLE", pasos
+    return compilada.veredicto(estado), pasos
+
+TAMANO_TROZO_FLUJO = 1 << 16
+
+def _trozos_entrada(entrada, tamano_trozo=TAMANO_TROZO_FLUJO):
+    """Trozos de bytes de una cadena, un archivo (texto o binario) o un iterable de trozos"""
+    if isinstance(entrada, (str, bytes, bytearray)):
+        entrada = [entrada]
+    elif hasattr(entrada, 'read'):
+        archivo = entrada
+        entrada = iter(lambda: archivo.read(tamano_trozo), archivo.read(0))
+    for trozo in entrada:
+        yield codificar_cadena(trozo) if isinstance(trozo, str) else trozo
+
+def _sin_salto_final(trozos):
+    """Trozos de bytes sin el salto de línea final ('\\n' o '\\r\\n'), como las líneas de --file"""
+    pendiente = b''
+    for trozo in trozos:
+        if pendiente:
+            trozo = pendiente + trozo
+        corte = len(trozo) - (2 if trozo.endswith(b'\r\n') else 1 if trozo.endswith((b'\n', b'\r')) else 0)
+        # El salto se retiene hasta saber si le sigue algo más
+        pendiente = trozo[corte:]
+        if corte:
+            yield trozo[:corte]
+
+def evaluar_flujo(definicion, entrada, max_pasos=None, tamano_trozo=TAMANO_TROZO_FLUJO):
+    """Veredicto y pasos leyendo la entrada como flujo, con memoria constante
+    
+    Solo para máquinas que únicamente se mueven a la derecha (como las de
+    crear_maquina_regex): ninguna celda se lee dos veces, así que no hace falta
+    cinta. entrada puede ser una cadena, un archivo abierto o cualquier
+    iterable de trozos str o bytes; se deja de leer en cuanto la máquina para.
+    Los veredictos coinciden con evaluar_cadena sin max_celdas.
+    """
+    compilada = definicion.compilar()
+    if not compilada.solo_derecha:
+        raise ValueError("La evaluación en flujo solo admite máquinas que se mueven únicamente a la derecha")
+    estado, pasos, leidos = compilada.ejecutar_afd_flujo(_trozos_entrada(entrada, tamano_trozo), max_pasos)
+    return _veredicto_afd(compilada, estado, pasos, leidos, max_pasos, None)
+
+def evaluar_cadenas(definicion, cadenas, max_pasos=None, max_celdas=None):
+    """Veredicto y pasos de varias cadenas; con NumPy las AFD avanzan a la vez"""
+    compilada = definicion.compilar()
+    np = _importar_numpy()
+    if np is None or not compilada.solo_derecha:
+        return [evaluar_cadena(definicion, cadena, max_pasos, max_celdas) for cadena in cadenas]
+    datos = [codificar_cadena(cadena) for cadena in cadenas]
+    estados, pasos = compilada.ejecutar_afd_vectorizado(datos, np)
+    return [_veredicto_afd(compilada, estado, n, len(entrada), max_pasos, max_celdas)
+            for estado, n, entrada in zip(estados, pasos, datos)]
+
+class ProductoMaquinas:
+    """Varias máquinas evaluadas sobre la misma entrada en una sola pasada
+    
+    Las máquinas que solo se mueven a la derecha se combinan en un autómata
+    producto cuyos estados son las tuplas de estados de las que siguen en
+    marcha; se construye bajo demanda, así que solo existen los estados
+    alcanzados por las entradas evaluadas. Cuando una componente para sale de
+    la tupla con sus pasos, y la lectura termina en cuanto paran todas. Las
+    que se mueven a la izquierda se simulan aparte con evaluar_cadena.
+    """
+    # Transiciones del producto conservadas como máximo; al llenarse se vacían
+    MAXIMO_TRANSICIONES = 1 << 16
+    
+    def __init__(self, definiciones):
+        self.patrones = list(definiciones)
+        self.definiciones = [definiciones[patron] for patron in self.patrones]
+        self.compiladas = [definicion.compilar() for definicion in self.definiciones]
+        self.derechas = [k for k, compilada in enumerate(self.compiladas) if compilada.solo_derecha]
+        self._vaciar()
+        
+    def _vaciar(self):
+        inicial = tuple((k, 0) for k in self.derechas if not self.compiladas[k].es_parada[0])
+        self.estados = [inicial]
+        self.indice = {inicial: 0}
+        # tabla[actual << 8 | simbolo]: siguiente estado del producto (None si aún no se ha calculado)
+        self.tabla = [None] * 256
+        self.paradas = {}  # misma clave -> componentes que paran en esa transición
+        
+    def _transicion(self, actual, simbolo):
+        """Calcular (y guardar) el estado del producto tras leer simbolo"""
+        siguiente = []
+        paradas = []
+        for k, estado in self.estados[actual]:
+            transicion = self.compiladas[k].tabla[estado << 8 | simbolo]
+            if transicion is None:
+                paradas.append((k, estado))
+            else:
+                siguiente.append((k, transicion[0]))
+        siguiente = tuple(siguiente)
+        if siguiente not in self.indice:
+            self.indice[siguiente] = len(self.estados)
+            self.estados.append(siguiente)
+            self.tabla.extend([None] * 256)
+        if paradas:
+            self.paradas[actual << 8 | simbolo] = paradas
+        self.tabla[actual << 8 | simbolo] = self.indice[siguiente]
+        return self.indice[siguiente]
+        
+    def evaluar(self, cadena, max_pasos=None, max_celdas=None):
+        """Lista de (patron, veredicto, pasos) en el orden de las definiciones"""
+        datos = codificar_cadena(cadena)
+        if len(self.tabla) > self.MAXIMO_TRANSICIONES:
+            self._vaciar()
+        finales = {}  # componente -> (estado, pasos)
+        tabla = self.tabla
+        actual = 0
+        leidos = 0
+        # Tras max_pasos pasos las que sigan en marcha ya son LIMITE
+        tope = len(datos) if max_pasos is None else min(len(datos), max_pasos + 1)
+        if self.estados[actual]:
+            for simbolo in datos[:tope]:
+                clave = actual << 8 | simbolo
+                siguiente = tabla[clave]
+                if siguiente is None:
+                    siguiente = self._transicion(actual, simbolo)
+                    tabla = self.tabla
+                leidos += 1
+                # Solo cambia el conjunto de componentes en marcha si alguna para
+                if siguiente != actual and clave in self.paradas:
+                    for k, estado in self.paradas[clave]:
+                        finales[k] = (estado, leidos - 1)
+                    if not self.estados[siguiente]:
+                        actual = siguiente
+                        leidos -= 1
+                        break
+                actual = siguiente
+        for k, estado in self.estados[actual]:
+            if leidos < len(datos):
+                finales[k] = (estado, leidos)
+                continue
+            # Tras la entrada cada componente lee blancos como en ejecutar_afd
+            tabla = self.compiladas[k].tabla
+            pasos = leidos
+            for _ in range(len(self.compiladas[k].estados)):
+                transicion = tabla[estado << 8 | 95]
+                if transicion is None:
+                    break
+                estado = transicion[0]
+                pasos += 1
+            finales[k] = (estado, pasos)
+            
+        resultados = []
+        for k, patron in enumerate(self.patrones):
+            if k in finales:
+                estado, pasos = finales[k]
+                veredicto, pasos = _veredicto_afd(self.compiladas[k], estado, pasos, len(datos), max_pasos, max_celdas)
+            else:
+                veredicto, pasos = evaluar_cadena(self.definiciones[k], cadena, max_pasos, max_celdas)
+            resultados.append((patron, veredicto, pasos))
+        return resultados
+
+@lru_cache(maxsize=8)
+def _producto_registrado(patrones):
+    return ProductoMaquinas({patron: obtener_definicion(patron) for patron in patrones})
+
+def evaluar_todas(cadena, patrones=None, max_pasos=None, max_celdas=None):
+    """Veredicto y pasos de la cadena en cada patrón (por defecto, los registrados)
+    
+    Devuelve una lista de (patron, veredicto, pasos) idéntica a llamar a
+    evaluar_cadena con cada uno, pero leyendo la entrada una sola vez para
+    todas las máquinas que solo se mueven a la derecha (ver ProductoMaquinas).
+    """
+    patrones = tuple(REGISTRO_MAQUINAS if patrones is None else patrones)
+    return _producto_registrado(patrones).evaluar(cadena, max_pasos, max_celdas)
+
+def _construir_trie(cadenas):
+    """Trie de bytes: cada nodo es un dict simbolo -> hijo, con los índices que acaban en él bajo None"""
+    raiz = {}
+    for indice, cadena in enumerate(cadenas):
+        nodo = raiz
+        for simbolo in codificar_cadena(cadena):
+            nodo = nodo.setdefault(simbolo, {})
+        nodo.setdefault(None, []).append(indice)
+    return raiz
+
+def _hijos_trie(nodo):
+    return nodo.get(None, ()), [(simbolo, hijo) for simbolo, hijo in nodo.items() if simbolo is not None]
+
+def _terminales(nodo, profundidad, hijos):
+    """Todas las (etiqueta, longitud) del subárbol de nodo"""
+    pila = [(nodo, profundidad)]
+    while pila:
+        nodo, profundidad = pila.pop()
+        terminales, siguientes = hijos(nodo)
+        for etiqueta in terminales:
+            yield etiqueta, profundidad
+        pila.extend((hijo, profundidad + 1) for _, hijo in siguientes)
+
+def _recorrer_prefijos(definicion, raiz, hijos, max_pasos=None, max_celdas=None):
+    """Generador de (etiqueta, veredicto, pasos) de cada entrada de un árbol de prefijos
+    
+    hijos(nodo) devuelve las etiquetas de las entradas que acaban en nodo y
+    los pares (simbolo, hijo). Cada prefijo común se simula una sola vez;
+    max_celdas solo se admite para máquinas que se mueven solo a la derecha.
+    """
+    compilada = definicion.compilar()
+    if compilada.solo_derecha:
+        yield from _recorrer_prefijos_afd(compilada, raiz, hijos, max_pasos, max_celdas)
+    elif max_celdas is not None:
+        raise ValueError("max_celdas no se admite al recorrer prefijos de máquinas que se mueven a la izquierda")
+    else:
+        yield from _recorrer_prefijos_mt(definicion, raiz, hijos, max_pasos)
+
+def _recorrer_prefijos_afd(compilada, raiz, hijos, max_pasos, max_celdas):
+    """Máquinas solo a la derecha: el estado tras un prefijo es toda la configuración"""
+    tabla = compilada.tabla
+    pila = [(raiz, 0, 0)]
+    while pila:
+        nodo, profundidad, estado = pila.pop()
+        terminales, siguientes = hijos(nodo)
+        if terminales:
+            # Fin de la entrada: leer blancos como ejecutar_afd
+            final, pasos = estado, profundidad
+            for _ in range(len(compilada.estados)):
+                transicion = tabla[final << 8 | 95]
+                if transicion is None:
+                    break
+                final = transicion[0]
+                pasos += 1
+            veredicto = _veredicto_afd(compilada, final, pasos, profundidad, max_pasos, max_celdas)
+            for etiqueta in terminales:
+                yield (etiqueta,) + veredicto
+        for simbolo, hijo in siguientes:
+            transicion = tabla[estado << 8 | simbolo]
+            if transicion is None:
+                # Para al leer simbolo: igual para todo el subárbol salvo los presupuestos
+                for etiqueta, longitud in _terminales(hijo, profundidad + 1, hijos):
+                    yield (etiqueta,) + _veredicto_afd(compilada, estado, profundidad, longitud, max_pasos, max_celdas)
+            else:
+                pila.append((hijo, profundidad + 1, transicion[0]))
+
+def _avanzar_hasta(mt, frontera, max_pasos):
+    """Ejecutar paso a paso hasta que el cabezal llegue a frontera
+    
+    Devuelve None si llega (la configuración solo depende del prefijo ya
+    escrito) o (veredicto, pasos) si antes para, agota max_pasos o repite
+    una configuración.
+    """
+    detector = DetectorCiclos(mt.estado_actual, mt.posicion_cabezal, mt.cinta)
+    estados_parada = mt.estados_aceptacion | mt.estados_rechazo
+    while mt.posicion_cabezal != frontera:
+        if max_pasos is not None and mt.contador_pasos >= max_pasos:
+            if (mt.estado_actual not in estados_parada
+                    and (mt.estado_actual, mt.cinta[mt.posicion_cabezal]) in mt.transiciones):
+                return "LIMITE", mt.contador_pasos
+        posicion = mt.posicion_cabezal
+        anterior = mt.cinta[posicion]
+        if not mt.ejecutar_paso():
+            return mt.obtener_estado_actual(), mt.contador_pasos
+        nuevo = mt.cinta[posicion]
+        if nuevo != anterior:
+            detector.escribir(posicion, ord(anterior), ord(nuevo))
+        if detector.avanzar(mt.estado_actual, mt.posicion_cabezal, mt.cinta):
+            return "BUCLE", mt.contador_pasos
+    return None
+
+def _recorrer_prefijos_mt(definicion, raiz, hijos, max_pasos):
+    """Máquinas generales: recorrido en profundidad con instantáneas en las bifurcaciones
+    
+    La configuración de un nodo de profundidad d es la de la máquina la
+    primera vez que el cabezal llega a la celda d: hasta entonces no ha leído
+    nada del resto de la entrada, así que es común a todo el subárbol.
+    """
+    mt = MaquinaTuring.desde_definicion(definicion, modo_historial='ninguno')
+    mt.inicializar_cinta('')
+    # (nodo, profundidad, símbolo que lleva a él, instantánea del padre o None si mt ya está en el padre)
+    pila = [(raiz, 0, None, None)]
+    while pila:
+        nodo, profundidad, simbolo, instantanea = pila.pop()
+        if instantanea is not None:
+            mt.restaurar(instantanea)
+        if simbolo is not None:
+            mt.cinta[profundidad - 1] = chr(simbolo)
+            mt.cinta.extender(profundidad)
+            resultado = _avanzar_hasta(mt, profundidad, max_pasos)
+            if resultado is not None:
+                for etiqueta, _ in _terminales(nodo, profundidad, hijos):
+                    yield (etiqueta,) + resultado
+                continue
+        terminales, siguientes = hijos(nodo)
+        instantanea = mt.instantanea() if siguientes and (terminales or len(siguientes) > 1) else None
+        if terminales:
+            mt.longitud_entrada = profundidad
+            veredicto = mt.ejecutar_hasta_parar(max_pasos, None, detectar_ciclos=True)
+            for etiqueta in terminales:
+                yield etiqueta, veredicto, mt.contador_pasos
+        for k, (simbolo, hijo) in enumerate(siguientes):
+            # El último en apilarse es el siguiente en salir: si mt sigue en este nodo no hace falta restaurar
+            continuar = k == len(siguientes) - 1 and not terminales
+            pila.append((hijo, profundidad + 1, simbolo, None if continuar else instantanea))
+
+def evaluar_con_prefijos(definicion, cadenas, max_pasos=None, max_celdas=None):
+    """Veredicto y pasos de cada cadena, simulando una sola vez los prefijos comunes
+    
+    Construye un trie con las entradas y lo recorre en profundidad (ver
+    _recorrer_prefijos). Devuelve la misma lista que evaluar_cadenas; en las
+    máquinas que se mueven a la izquierda la detección de bucles empieza en
+    cada bifurcación, así que los pasos de un BUCLE (o que un bucle acabe en
+    LIMITE) pueden diferir, y con max_celdas se evalúan cadena a cadena.
+    """
+    cadenas = list(cadenas)
+    if max_celdas is not None and not definicion.compilar().solo_derecha:
+        return evaluar_cadenas(definicion, cadenas, max_pasos, max_celdas)
+    resultados = [None] * len(cadenas)
+    for indice, veredicto, pasos in _recorrer_prefijos(definicion, _construir_trie(cadenas), _hijos_trie,
+                                                       max_pasos, max_celdas):
+        resultados[indice] = (veredicto, pasos)
+    return resultados
+
+def _expresion_re(patron_regex):
+    """Traducir un patrón del simulador ('+' es unión) a una expresión de re
+    
+    compilar_regex admite estrellas repetidas ('a**' equivale a 'a*') y re
+    no, así que se fusionan; si aun así re no acepta la expresión se lanza
+    ValueError.
+    """
+    import re
+    traducida = ''.join('|' if caracter == '+' else caracter if caracter in OPERADORES_REGEX
+                        else re.escape(caracter) for caracter in patron_regex)
+    try:
+        return re.compile(re.sub(r'\*{2,}', '*', traducida))
+    except re.error as error:
+        raise ValueError(f"re no admite el patrón {patron_regex!r}: {error}") from None
+
+def comparar_con_re(patron_regex, longitud_maxima, max_pasos=None):
+    """Evaluar todas las cadenas sobre el alfabeto de la máquina hasta longitud_maxima
+    
+    Cada cadena se compara con re.fullmatch del mismo patrón. Devuelve
+    (cadenas_evaluadas, discrepancias), con cada discrepancia como
+    (cadena, veredicto, pasos, esperado); un LIMITE siempre es discrepancia.
+    """
+    definicion = obtener_definicion(patron_regex)
+    expresion = _expresion_re(patron_regex)
+    alfabeto = sorted(codificar_simbolo(simbolo) for simbolo in definicion.alfabeto)
+    # Árbol implícito: cada nodo es el prefijo y todos son cadenas a evaluar
+    hijos = lambda prefijo: ((prefijo,), [(simbolo, prefijo + bytes((simbolo,))) for simbolo in alfabeto]
+                                         if len(prefijo) < longitud_maxima else ())
+    evaluadas = 0
+    discrepancias = []
+    for prefijo, veredicto, pasos in _recorrer_prefijos(definicion, b'', hijos, max_pasos):
+        evaluadas += 1
+        cadena = prefijo.decode('latin-1')
+        esperado = expresion.fullmatch(cadena) is not None
+        if veredicto == "LIMITE" or (veredicto == "ACEPTADA") != esperado:
+            discrepancias.append((cadena, veredicto, pasos, esperado))
+    discrepancias.sort(key=lambda discrepancia: (len(discrepancia[0]), discrepancia[0]))
+    return evaluadas, discrepancias
+
+class CacheResultados:
+    """Resultados de ejecuciones memorizados en un LRU en memoria y, opcionalmente, en SQLite
+    
+    La clave es un SHA-256 de la huella de la definición, los presupuestos y
+    la entrada, así que cambiar las transiciones de una máquina deja sus
+    resultados anteriores inalcanzables sin tener que borrarlos (invalidar
+    los elimina). Cada resultado es (veredicto, pasos, resumen_cinta), con
+    resumen_cinta el SHA-256 del tramo visible final. Las escrituras a disco
+    se confirman por lotes y al cerrar.
+    """
+    CAPACIDAD = 4096
+    # Inserciones pendientes antes de confirmar la transacción en disco
+    LOTE_ESCRITURA = 256
+    
+    def __init__(self, ruta=None, capacidad=CAPACIDAD):
+        from collections import OrderedDict
+        self.capacidad = capacidad
+        self.memoria = OrderedDict()
+        self.aciertos = 0
+        self.aciertos_disco = 0
+        self.fallos = 0
+        self.desalojos = 0
+        self._pendientes = 0
+        self.conexion = None
+        if ruta is not None:
+            import sqlite3
+            self.conexion = sqlite3.connect(ruta)
+            self.conexion.execute("PRAGMA journal_mode=WAL")
+            self.conexion.execute("PRAGMA synchronous=NORMAL")
+            self.conexion.execute("CREATE TABLE IF NOT EXISTS resultados (clave BLOB PRIMARY KEY, huella BLOB NOT NULL, "
+                                  "veredicto TEXT NOT NULL, pasos INTEGER NOT NULL, resumen_cinta TEXT NOT NULL)")
+            self.conexion.execute("CREATE INDEX IF NOT EXISTS resultados_huella ON resultados (huella)")
+            
+    def __enter__(self):
+        return self
+        
+    def __exit__(self, *excepcion):
+        self.cerrar()
+        
+    @staticmethod
+    def clave(definicion, cadena, max_pasos=None, max_celdas=None):
+        import hashlib
+        resumen = hashlib.sha256(definicion.huella())
+        resumen.update(repr((max_pasos, max_celdas)).encode('ascii'))
+        resumen.update(codificar_cadena(cadena))
+        return resumen.digest()
+        
+    def ejecutar(self, definicion, cadena, max_pasos=None, max_celdas=None):
+        """(veredicto, pasos, resumen_cinta) de la cadena, simulándola solo si no está en la caché
+        
+        La simulación es la del subcomando run: sin historial y con detección
+        de ciclos.
+        """
+        clave = self.clave(definicion, cadena, max_pasos, max_celdas)
+        resultado = self.memoria.get(clave)
+        if resultado is not None:
+            self.memoria.move_to_end(clave)
+            self.aciertos += 1
+            return resultado
+        if self.conexion is not None:
+            fila = self.conexion.execute("SELECT veredicto, pasos, resumen_cinta FROM resultados WHERE clave = ?",
+                                         (clave,)).fetchone()
+            if fila is not None:
+                self.aciertos += 1
+                self.aciertos_disco += 1
+                self._recordar(clave, fila)
+                return fila
+        self.fallos += 1
+        resultado = self._simular(definicion, cadena, max_pasos, max_celdas)
+        self._recordar(clave, resultado)
+        if self.conexion is not None:
+            self.conexion.execute("INSERT OR REPLACE INTO resultados VALUES (?, ?, ?, ?, ?)",
+                                  (clave, definicion.huella()) + resultado)
+            self._pendientes += 1
+            if self._pendientes >= self.LOTE_ESCRITURA:
+                self.confirmar()
+        return resultado
+        
+    @staticmethod
+    def _simular(definicion, cadena, max_pasos, max_celdas):
+        import hashlib
+        mt = MaquinaTuring.desde_definicion(definicion, modo_historial='ninguno')
+        mt.inicializar_cinta(cadena)
+        veredicto = mt.ejecutar_hasta_parar(max_pasos, max_celdas, detectar_ciclos=True)
+        cinta = f"{mt.cinta.inicio}:".encode('ascii') + codificar_cadena(mt.cinta.contenido())
+        return veredicto, mt.contador_pasos, hashlib.sha256(cinta).hexdigest()
+        
+    def _recordar(self, clave, resultado):
+        self.memoria[clave] = tuple(resultado)
+        if len(self.memoria) > self.capacidad:
+            self.memoria.popitem(last=False)
+            self.desalojos += 1
+            
+    def invalidar(self, definicion):
+        """Borrar de disco los resultados de una definición (los de memoria se borran todos)"""
+        self.memoria.clear()
+        if self.conexion is not None:
+            self.conexion.execute("DELETE FROM resultados WHERE huella = ?", (definicion.huella(),))
+            self.confirmar()
+            
+    def confirmar(self):
+        if self.conexion is not None:
+            self.conexion.commit()
+            self._pendientes = 0
+            
+    def cerrar(self):
+        if self.conexion is not None:
+            self.confirmar()
+            self.conexion.close()
+            self.conexion = None
+            
+    def estadisticas(self):
+        consultas = self.aciertos + self.fallos
+        return {
+            'aciertos': self.aciertos,
+            'aciertos_disco': self.aciertos_disco,
+            'fallos': self.fallos,
+            'desalojos': self.desalojos,
+            'entradas_memoria': len(self.memoria),
+            'tasa_aciertos': round(self.aciertos / consultas, 4) if consultas else None
+        }
+
+# Definición y presupuestos reutilizados por cada proceso trabajador de evaluar_lote
+_definicion_trabajador = None
+_presupuestos_trabajador = (None, None)
+
+def _inicializar_trabajador(patron_regex, max_pasos=None, max_celdas=None, optimizar=False):
+    """Construir una sola vez la definición del patrón en el proceso trabajador"""
+    global _definicion_trabajador, _presupuestos_trabajador
+    if isinstance(patron_regex, DefinicionMaquina):
+        _definicion_trabajador = patron_regex
+    else:
+        _definicion_trabajador = obtener_definicion(patron_regex)
+    if optimizar:
+        _definicion_trabajador = optimizar_definicion(_definicion_trabajador)[0]
+    _presupuestos_trabajador = (max_pasos, max_celdas)
+
+def _evaluar_bloque(bloque):
+    """Evaluar un bloque de cadenas con la definición del trabajador"""
+    resultados = evaluar_cadenas(_definicion_trabajador, bloque, *_presupuestos_trabajador)
+    return [(cadena, veredicto, pasos) for cadena, (veredicto, pasos) in zip(bloque, resultados)]
+
+def _leer_entradas(entradas):
+    """Normalizar un iterable, un archivo abierto o una ruta a cadenas de entrada"""
+    if isinstance(entradas, (str, os.PathLike)):
+        with open(entradas, encoding='utf-8') as archivo:
+            yield from _leer_entradas(archivo)
+    elif hasattr(entradas, 'read'):
+        for linea in entradas:
+            yield linea.rstrip('\r\n')
+    else:
+        yield from entradas
+
+def _dividir_en_bloques(entradas, tamano_bloque):
+    iterador = iter(entradas)
+    while True:
+        bloque = list(islice(iterador, tamano_bloque))
+        if not bloque:
+            return
+        yield bloque
+
+def evaluar_lote(patron_regex, entradas, procesos=None, tamano_bloque=1000, ordenado=True,
+                 max_pasos=None, max_celdas=None, optimizar=False):
+    """Evaluar muchas cadenas contra un patrón repartiendo bloques en un pool de procesos
+    
+    patron_regex también puede ser una DefinicionMaquina. entradas puede ser un iterable de cadenas, un archivo abierto o una ruta
+    (una cadena por línea). Genera tuplas (entrada, veredicto, pasos) en el
+    orden de entrada, o según se completan si ordenado es False. Solo se
+    mantienen en vuelo unos pocos bloques por proceso, así que las entradas
+    se leen de forma perezosa. max_pasos y max_celdas acotan el coste de cada
+    entrada (veredicto LIMITE); las que no paran se marcan como BUCLE. Con
+    optimizar se evalúa la definición reducida por optimizar_definicion.
+    """
+    from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, as_completed, wait
+    
+    if not isinstance(patron_regex, DefinicionMaquina):
+        obtener_definicion(patron_regex)  # Validar el patrón antes de lanzar procesos
+    bloques = _dividir_en_bloques(_leer_entradas(entradas), tamano_bloque)
+    if procesos == 1:
+        _inicializar_trabajador(patron_regex, max_pasos, max_celdas, optimizar)
+        for bloque in bloques:
+            yield from _evaluar_bloque(bloque)
+        return
+        
+    procesos = procesos or os.cpu_count() or 1
+    max_en_vuelo = 2 * procesos
+    with ProcessPoolExecutor(max_workers=procesos, initializer=_inicializar_trabajador,
+                             initargs=(patron_regex, max_pasos, max_celdas, optimizar)) as ejecutor:
+        pendientes = deque()
+        for bloque in bloques:
+            pendientes.append(ejecutor.submit(_evaluar_bloque, bloque))
+            if len(pendientes) < max_en_vuelo:
+                continue
+            if ordenado:
+                yield from pendientes.popleft().result()
+            else:
+                completados, _ = wait(pendientes, return_when=FIRST_COMPLETED)
+                for futuro in completados:
+                    pendientes.remove(futuro)
+                    yield from futuro.result()
+        if ordenado:
+            while pendientes:
+                yield from pendientes.popleft().result()
+        else:
+            for futuro in as_completed(pendientes):
+                yield from futuro.result()
 
 class InterfazMaquinaTuring:
+    # Geometría de las celdas de la cinta en el lienzo
+    ANCHO_CELDA = 60
+    ALTO_CELDA = 60
+    INICIO_X = 50
+    INICIO_Y = 80
+    SEPARACION_CINTAS = 130  # Distancia vertical entre las filas de una máquina de varias cintas
+    # Ejecución en modo turbo: ms de cálculo por cuadro (~60 Hz) y pasos entre consultas al reloj
+    PRESUPUESTO_CUADRO = 12
+    PASOS_POR_COMPROBACION = 256
+    # Deltas que conserva el historial en anillo mientras dura el modo turbo
+    CAPACIDAD_HISTORIAL_TURBO = 10000
+    
     def __init__(self, root):
         self.root = root
         self.root.title("Simulador de Máquina de Turing - Estilo Teams")
@@ -369,6 +2868,8 @@ class InterfazMaquinaTuring:
         self.mt = None
         self.regex_actual = ""
         self.modo_auto = False
+        self.id_ejecucion = None  # Próximo cuadro de ejecución automática programado
+        self.historial_previo = None  # (máquina, modo, capacidad) del historial a restaurar tras el modo turbo
         self.velocidad = 500  # ms entre pasos
         
         self.configurar_interfaz()
@@ -382,6 +2883,7 @@ class InterfazMaquinaTuring:
         estilo.configure('TButton', font=('Segoe UI', 10), padding=6)
         estilo.configure('TCombobox', font=('Segoe UI', 10))
         estilo.configure('TEntry', font=('Segoe UI', 10))
+        estilo.configure('TCheckbutton', background='#2D2D30', foreground='white', font=('Segoe UI', 10))
         
         # Encabezado
         marco_encabezado = ttk.Frame(self.root)
@@ -404,24 +2906,14 @@ class InterfazMaquinaTuring:
         marco_regex.pack(fill='x', pady=(0, 10))
         
         self.variable_regex = tk.StringVar()
-        opciones_regex = [
-            "(a|b)*abb",
-            "0*1*", 
-            "(ab)*",
-            "1(01)*0",
-            "(a+b)*a(a+b)*",
-            "a*b*c*",
-            "(00)*1(11)*",
-            "a(a|b)*b",
-            "(0|1)*00(0|1)*",
-            "1*01*01*"
-        ]
+        opciones_regex = list(REGISTRO_MAQUINAS) + list(MAQUINAS_EJEMPLO)
         
         self.combo_regex = ttk.Combobox(marco_regex, textvariable=self.variable_regex, 
-                                       values=opciones_regex, state='readonly')
+                                       values=opciones_regex)
         self.combo_regex.set("(a|b)*abb")
         self.combo_regex.pack(fill='x', pady=5)
         self.combo_regex.bind('<<ComboboxSelected>>', self.cambio_regex)
+        self.combo_regex.bind('<Return>', self.cambio_regex)  # Patrones escritos a mano se compilan
         
         # Sección de entrada
         marco_entrada = ttk.LabelFrame(marco_izquierdo, text="Cadena de Entrada", padding=10)
@@ -431,6 +2923,8 @@ class InterfazMaquinaTuring:
         self.entrada_texto = ttk.Entry(marco_entrada, font=('Segoe UI', 11))
         self.entrada_texto.pack(fill='x', pady=5)
         self.entrada_texto.insert(0, "aabb")
+        ttk.Button(marco_entrada, text="Evaluar en todas las máquinas",
+                   command=self.mostrar_evaluacion_todas).pack(fill='x')
         
         # Botones de control
         marco_controles = ttk.LabelFrame(marco_izquierdo, text="Controles", padding=10)
@@ -464,6 +2958,16 @@ class InterfazMaquinaTuring:
         self.escala_velocidad.set(500)
         self.escala_velocidad.pack(side='left', fill='x', expand=True, padx=(5, 0))
         
+        self.variable_turbo = tk.BooleanVar(value=False)
+        ttk.Checkbutton(marco_controles, text="Modo turbo (máxima velocidad)",
+                        variable=self.variable_turbo).pack(anchor='w')
+        
+        # Perfil por transición (solo se instrumenta si se pide)
+        self.variable_perfil = tk.BooleanVar(value=False)
+        ttk.Checkbutton(marco_controles, text="Instrumentar ejecución",
+                        variable=self.variable_perfil).pack(anchor='w')
+        ttk.Button(marco_controles, text="Mapa de calor", command=self.mostrar_mapa_calor).pack(fill='x', pady=(5, 0))
+        
         # Mostrar estado
         marco_estado = ttk.LabelFrame(marco_izquierdo, text="Estado Actual", padding=10)
         marco_estado.pack(fill='x', pady=(0, 10))
@@ -488,6 +2992,20 @@ class InterfazMaquinaTuring:
         self.lienzo_cinta = tk.Canvas(marco_cinta, bg='#1E1E1E', relief='sunken', 
                                      borderwidth=2, highlightthickness=0)
         self.lienzo_cinta.pack(fill='both', expand=True)
+        self.lienzo_cinta.bind('<Configure>', self.redimensionar_cinta)
+        
+        # Desplazamiento de la vista para cintas largas
+        marco_vista = ttk.Frame(marco_cinta)
+        marco_vista.pack(fill='x', pady=(5, 0))
+        
+        self.variable_seguir = tk.BooleanVar(value=True)
+        ttk.Checkbutton(marco_vista, text="Seguir cabezal", variable=self.variable_seguir,
+                        command=self.actualizar_pantalla).pack(side='left')
+        self.barra_cinta = ttk.Scrollbar(marco_vista, orient='horizontal', command=self.desplazar_cinta)
+        self.barra_cinta.pack(side='left', fill='x', expand=True, padx=(10, 0))
+        
+        self.primeras_celdas = [None]  # Por cinta, posición de la celda más a la izquierda de la vista
+        self.crear_celdas_visibles()
         
         # Panel de historial
         marco_historial = ttk.LabelFrame(marco_derecho, text="Historial de Ejecución", padding=10)
@@ -505,7 +3023,15 @@ class InterfazMaquinaTuring:
         self.cambio_regex()
         
     def cambio_regex(self, event=None):
-        self.regex_actual = self.variable_regex.get()
+        patron = self.variable_regex.get().strip()
+        try:
+            if patron not in MAQUINAS_EJEMPLO:
+                obtener_definicion(patron)
+        except ValueError as error:
+            messagebox.showwarning("Advertencia", str(error))
+            self.variable_regex.set(self.regex_actual)
+            return
+        self.regex_actual = patron
         self.reiniciar_maquina()
         
     def cambio_velocidad(self, valor):
@@ -517,8 +3043,19 @@ class InterfazMaquinaTuring:
             messagebox.showwarning("Advertencia", "Por favor ingrese una cadena")
             return
             
-        self.mt = crear_maquina_regex(self.regex_actual)
-        self.mt.inicializar_cinta(cadena_entrada)
+        self.detener_automatico()
+        self.mt = crear_maquina(self.regex_actual)
+        if len(self.mt.cintas) != len(self.celdas_lienzo):
+            self.crear_celdas_visibles(len(self.mt.cintas))
+        self.primeras_celdas = [None] * len(self.celdas_lienzo)
+        if self.variable_perfil.get() and isinstance(self.mt, MaquinaTuring):
+            self.mt.activar_instrumentacion()
+        try:
+            self.mt.inicializar_cinta(cadena_entrada)
+        except ValueError as error:
+            self.mt = None
+            messagebox.showwarning("Advertencia", str(error))
+            return
         self.actualizar_pantalla()
         self.agregar_al_historial(f"Cargada cadena: '{cadena_entrada}' para regex: {self.regex_actual}")
         
@@ -538,25 +3075,72 @@ class InterfazMaquinaTuring:
         if not self.mt:
             messagebox.showwarning("Advertencia", "Primero cargue una cadena")
             return
+        if self.modo_auto:
+            return
             
-        def ejecutar_automaticamente():
-            self.modo_auto = True
-            self.boton_ejecutar.config(state='disabled')
-            self.boton_paso.config(state='disabled')
+        # Todo ocurre en el hilo de Tk: los pasos se programan con root.after
+        self.modo_auto = True
+        self.boton_ejecutar.config(state='disabled')
+        self.boton_paso.config(state='disabled')
+        self.id_ejecucion = self.root.after(0, self.ejecutar_cuadro)
+        
+    def ejecutar_cuadro(self):
+        """Avanzar la máquina durante un cuadro y repintar una sola vez"""
+        self.id_ejecucion = None
+        if not self.modo_auto or not self.mt:
+            self.detener_automatico()
+            return
             
-            while (self.modo_auto and self.mt and 
-                   self.mt.obtener_estado_actual() == "EJECUTANDO"):
-                self.mt.ejecutar_paso()
-                self.root.after(0, self.actualizar_pantalla)
-                time.sleep(self.velocidad / 1000)
-                
-            self.modo_auto = False
-            self.root.after(0, self.habilitar_botones)
+        if self.variable_turbo.get():
+            self.limitar_historial()
+            # Tantos pasos como quepan en el presupuesto del cuadro
+            limite = time.perf_counter() + self.PRESUPUESTO_CUADRO / 1000
+            continuar = True
+            while continuar and time.perf_counter() < limite:
+                for _ in range(self.PASOS_POR_COMPROBACION):
+                    continuar = self.mt.ejecutar_paso()
+                    if not continuar:
+                        break
+            espera = 1
+        else:
+            self.restaurar_historial()
+            continuar = self.mt.ejecutar_paso()
+            espera = self.velocidad
             
-        threading.Thread(target=ejecutar_automaticamente, daemon=True).start()
+        self.actualizar_pantalla()
+        if continuar and self.modo_auto:
+            self.id_ejecucion = self.root.after(espera, self.ejecutar_cuadro)
+        else:
+            self.detener_automatico()
+            
+    def detener_automatico(self):
+        if self.id_ejecucion is not None:
+            self.root.after_cancel(self.id_ejecucion)
+            self.id_ejecucion = None
+        self.modo_auto = False
+        self.restaurar_historial()
+        self.habilitar_botones()
+        
+    def limitar_historial(self):
+        """Pasar a historial en anillo mientras dura el modo turbo"""
+        if self.historial_previo is not None or not isinstance(self.mt, MaquinaTuring):
+            return
+        historial = self.mt._historial
+        if historial.modo != 'completo':
+            return
+        self.historial_previo = (self.mt, historial.modo, historial.capacidad)
+        self.mt.configurar_historial('anillo', self.CAPACIDAD_HISTORIAL_TURBO, conservar=True)
+        
+    def restaurar_historial(self):
+        """Volver a la política de historial anterior al modo turbo"""
+        if self.historial_previo is None:
+            return
+        mt, modo, capacidad = self.historial_previo
+        self.historial_previo = None
+        mt.configurar_historial(modo, capacidad, conservar=True)
         
     def reiniciar_maquina(self):
-        self.modo_auto = False
+        self.detener_automatico()
         self.mt = None
         self.actualizar_pantalla()
         self.texto_historial.config(state='normal')
@@ -572,7 +3156,7 @@ class InterfazMaquinaTuring:
             self.etiqueta_estado.config(text="Listo para comenzar", foreground='#4FA6FF')
             self.etiqueta_pasos.config(text="Pasos: 0")
             self.etiqueta_estado_actual.config(text="Estado: -")
-            self.dibujar_cinta([], 0)
+            self.dibujar_cinta(None, None)
             return
             
         estado = self.mt.obtener_estado_actual()
@@ -582,61 +3166,555 @@ class InterfazMaquinaTuring:
         self.etiqueta_pasos.config(text=f"Pasos: {self.mt.contador_pasos}")
         self.etiqueta_estado_actual.config(text=f"Estado Actual: {self.mt.estado_actual}")
         
-        self.dibujar_cinta(self.mt.cinta, self.mt.posicion_cabezal)
+        self.dibujar_cinta(self.mt.cintas, self.mt.posiciones)
         
-    def dibujar_cinta(self, cinta, pos_cabezal):
+    def crear_celdas_visibles(self, num_cintas=None):
+        """Crear los elementos persistentes del lienzo: una fila de celdas por cinta"""
         self.lienzo_cinta.delete("all")
-        
-        if not cinta:
-            return
-            
-        ancho_celda = 60
-        alto_celda = 60
-        inicio_x = 50
-        inicio_y = 80
-        
-        # Dibujar celdas de la cinta
-        for i, simbolo in enumerate(cinta):
-            x = inicio_x + i * ancho_celda
-            y = inicio_y
-            
-            # Fondo de celda
-            color = '#3C3C3C'
-            if i == pos_cabezal:
-                color = '#0078D4'  # Resaltar posición del cabezal
+        if num_cintas is None:
+            num_cintas = len(self.primeras_celdas)
+        ancho_lienzo = self.lienzo_cinta.winfo_width()
+        num_celdas = max(1, (ancho_lienzo - self.INICIO_X) // self.ANCHO_CELDA + 1)
+        
+        self.celdas_lienzo = []
+        self.cabezales_lienzo = []
+        for fila in range(num_cintas):
+            y = self.INICIO_Y + fila * self.SEPARACION_CINTAS
+            celdas = []
+            for k in range(num_celdas):
+                x = self.INICIO_X + k * self.ANCHO_CELDA
                 
-            self.lienzo_cinta.create_rectangle(x, y, x + ancho_celda, y + alto_celda, 
-                                             fill=color, outline='#666666', width=2)
+                # Fondo de celda, símbolo e indicador de posición
+                fondo = self.lienzo_cinta.create_rectangle(x, y, x + self.ANCHO_CELDA, y + self.ALTO_CELDA,
+                                                           fill='#3C3C3C', outline='#666666', width=2,
+                                                           state='hidden')
+                simbolo = self.lienzo_cinta.create_text(x + self.ANCHO_CELDA/2, y + self.ALTO_CELDA/2,
+                                                        fill='white', font=('Segoe UI', 14, 'bold'),
+                                                        state='hidden')
+                indice = self.lienzo_cinta.create_text(x + self.ANCHO_CELDA/2, y + self.ALTO_CELDA + 10,
+                                                       fill='#CCCCCC', font=('Segoe UI', 8), state='hidden')
+                celdas.append((fondo, simbolo, indice))
+            self.celdas_lienzo.append(celdas)
             
-            # Símbolo
-            self.lienzo_cinta.create_text(x + ancho_celda/2, y + alto_celda/2, 
-                                        text=simbolo, fill='white', font=('Segoe UI', 14, 'bold'))
+            # Cabezal y su etiqueta; se desplazan con coords
+            texto = "Cabezal" if num_cintas == 1 else f"Cabezal {fila + 1}"
+            cabezal = self.lienzo_cinta.create_polygon(0, 0, 0, 0, 0, 0, fill='#FF6B6B',
+                                                       outline='white', state='hidden')
+            etiqueta = self.lienzo_cinta.create_text(0, 0, text=texto, fill='#FF6B6B',
+                                                     font=('Segoe UI', 9, 'bold'), state='hidden')
+            self.cabezales_lienzo.append((cabezal, etiqueta))
+        # Lo que muestra cada celda, para redibujar solo las que cambian
+        self.celdas_dibujadas = [[None] * num_celdas for _ in range(num_cintas)]
+        if len(self.primeras_celdas) != num_cintas:
+            self.primeras_celdas = [None] * num_cintas
+        
+    def redimensionar_cinta(self, event=None):
+        self.crear_celdas_visibles()
+        self.actualizar_pantalla()
+        
+    def desplazar_cinta(self, accion, cantidad, unidad=None):
+        """Atender la barra de desplazamiento (sigue a la primera cinta); deja de seguir al cabezal"""
+        if not self.mt:
+            return
+        num_celdas = len(self.celdas_lienzo[0])
+        for fila, cinta in enumerate(self.mt.cintas):
+            if self.primeras_celdas[fila] is None:
+                self.primeras_celdas[fila] = cinta.inicio
+            if accion == 'moveto':
+                self.primeras_celdas[fila] = cinta.inicio + int(float(cantidad) * len(cinta))
+            elif accion == 'scroll':
+                paso = num_celdas - 1 if unidad == 'pages' else 1
+                self.primeras_celdas[fila] += int(cantidad) * max(1, paso)
+            self.primeras_celdas[fila] = max(cinta.inicio, min(self.primeras_celdas[fila], cinta.fin - num_celdas))
+        self.variable_seguir.set(False)
+        self.actualizar_pantalla()
+        
+    def dibujar_cinta(self, cintas, posiciones):
+        """Actualizar en cada fila solo las celdas visibles que cambiaron y el cabezal"""
+        if not cintas:
+            for fila, celdas in enumerate(self.celdas_lienzo):
+                for k, elementos in enumerate(celdas):
+                    if self.celdas_dibujadas[fila][k] is not None:
+                        for elemento in elementos:
+                            self.lienzo_cinta.itemconfigure(elemento, state='hidden')
+                        self.celdas_dibujadas[fila][k] = None
+                for elemento in self.cabezales_lienzo[fila]:
+                    self.lienzo_cinta.itemconfigure(elemento, state='hidden')
+            self.barra_cinta.set(0, 1)
+            return
             
-            # Indicador de posición
-            self.lienzo_cinta.create_text(x + ancho_celda/2, y + alto_celda + 10, 
-                                        text=str(i), fill='#CCCCCC', font=('Segoe UI', 8))
+        for fila, (cinta, pos_cabezal) in enumerate(zip(cintas, posiciones)):
+            self.dibujar_fila(fila, cinta, pos_cabezal)
+        
+        cinta = cintas[0]
+        primera = self.primeras_celdas[0]
+        num_celdas = len(self.celdas_lienzo[0])
+        self.barra_cinta.set((primera - cinta.inicio) / len(cinta),
+                             min(1, (primera + num_celdas - cinta.inicio) / len(cinta)))
+        
+    def dibujar_fila(self, fila, cinta, pos_cabezal):
+        celdas = self.celdas_lienzo[fila]
+        dibujadas = self.celdas_dibujadas[fila]
+        num_celdas = len(celdas)
+        if self.primeras_celdas[fila] is None:
+            self.primeras_celdas[fila] = cinta.inicio
+        # Seguir al cabezal cuando sale de la vista, dejándolo centrado
+        primera = self.primeras_celdas[fila]
+        if self.variable_seguir.get() and not primera <= pos_cabezal < primera + num_celdas - 1:
+            primera = self.primeras_celdas[fila] = max(cinta.inicio, pos_cabezal - num_celdas // 2)
+        
+        simbolos = cinta.contenido(primera, primera + num_celdas)
+        for k, simbolo in enumerate(simbolos):
+            i = primera + k
+            visible = cinta.inicio <= i < cinta.fin
+            dibujo = (simbolo, i, i == pos_cabezal) if visible else None
+            if dibujo == dibujadas[k]:
+                continue
+            dibujadas[k] = dibujo
+            fondo, texto, indice = celdas[k]
+            if not visible:
+                for elemento in celdas[k]:
+                    self.lienzo_cinta.itemconfigure(elemento, state='hidden')
+                continue
+            color = '#0078D4' if i == pos_cabezal else '#3C3C3C'  # Resaltar posición del cabezal
+            self.lienzo_cinta.itemconfigure(fondo, fill=color, state='normal')
+            self.lienzo_cinta.itemconfigure(texto, text=simbolo, state='normal')
+            self.lienzo_cinta.itemconfigure(indice, text=str(i), state='normal')
         
         # Dibujar cabezal
-        cabeza_x = inicio_x + pos_cabezal * ancho_celda + ancho_celda/2
-        cabeza_y = inicio_y - 20
-        self.lienzo_cinta.create_polygon(
-            cabeza_x, cabeza_y,
-            cabeza_x - 10, cabeza_y - 15,
-            cabeza_x + 10, cabeza_y - 15,
-            fill='#FF6B6B', outline='white'
-        )
-        
-        # Etiqueta del cabezal
-        self.lienzo_cinta.create_text(cabeza_x, cabeza_y - 25, text="Cabezal", 
-                                    fill='#FF6B6B', font=('Segoe UI', 9, 'bold'))
+        cabezal, etiqueta = self.cabezales_lienzo[fila]
+        if primera <= pos_cabezal < primera + num_celdas:
+            cabeza_x = self.INICIO_X + (pos_cabezal - primera) * self.ANCHO_CELDA + self.ANCHO_CELDA/2
+            cabeza_y = self.INICIO_Y + fila * self.SEPARACION_CINTAS - 20
+            self.lienzo_cinta.coords(cabezal,
+                                     cabeza_x, cabeza_y,
+                                     cabeza_x - 10, cabeza_y - 15,
+                                     cabeza_x + 10, cabeza_y - 15)
+            self.lienzo_cinta.coords(etiqueta, cabeza_x, cabeza_y - 25)
+            estado_cabezal = 'normal'
+        else:
+            estado_cabezal = 'hidden'
+        self.lienzo_cinta.itemconfigure(cabezal, state=estado_cabezal)
+        self.lienzo_cinta.itemconfigure(etiqueta, state=estado_cabezal)
+        
+    @staticmethod
+    def color_calor(fraccion):
+        """Color entre el de una celda vacía y el del cabezal según fraccion (0..1)"""
+        fraccion = fraccion ** 0.5  # Realzar las transiciones poco visitadas
+        frio, caliente = (0x3C, 0x3C, 0x3C), (0xFF, 0x6B, 0x6B)
+        return '#' + ''.join(f'{round(a + (b - a) * fraccion):02X}' for a, b in zip(frio, caliente))
+        
+    def mostrar_mapa_calor(self):
+        """Ventana con las visitas de cada transición sobre la tabla estados x símbolos"""
+        perfil = getattr(self.mt, 'perfil', None)
+        if perfil is None:
+            messagebox.showwarning("Advertencia", "Marque 'Instrumentar ejecución' y cargue una cadena")
+            return
+        transiciones = self.mt.transiciones
+        estados = sorted({estado for estado, _ in transiciones}, key=str)
+        simbolos = sorted({simbolo for _, simbolo in transiciones})
+        maximo = max(perfil.visitas.values(), default=0) or 1
+        ancho, alto, margen = 70, 32, 90
+        
+        ventana = tk.Toplevel(self.root)
+        ventana.title("Mapa de calor de transiciones")
+        ventana.configure(bg='#2D2D30')
+        lienzo = tk.Canvas(ventana, bg='#1E1E1E', highlightthickness=0,
+                           width=margen + ancho * len(simbolos) + 10, height=40 + alto * len(estados) + 10)
+        lienzo.pack(padx=10, pady=10)
+        for columna, simbolo in enumerate(simbolos):
+            lienzo.create_text(margen + ancho * columna + ancho / 2, 25, text=simbolo, fill='white',
+                               font=('Segoe UI', 11, 'bold'))
+        for fila, estado in enumerate(estados):
+            y = 40 + alto * fila
+            milisegundos = perfil.tiempo_por_estado.get(estado, 0) / 1e6
+            lienzo.create_text(margen - 8, y + alto / 2, text=f"{estado} ({milisegundos:.1f} ms)", anchor='e',
+                               fill='#CCCCCC', font=('Segoe UI', 9))
+            for columna, simbolo in enumerate(simbolos):
+                x = margen + ancho * columna
+                if (estado, simbolo) in transiciones:
+                    visitas = perfil.visitas.get((estado, simbolo), 0)
+                    color, texto = self.color_calor(visitas / maximo), str(visitas)
+                else:
+                    color, texto = '#252526', ''
+                lienzo.create_rectangle(x, y, x + ancho, y + alto, fill=color, outline='#666666')
+                lienzo.create_text(x + ancho / 2, y + alto / 2, text=texto, fill='white', font=('Segoe UI', 9))
+                
+        ttk.Label(ventana, text=f"Pasos: {perfil.pasos}   Extensión máxima de la cinta: {perfil.extension_maxima}"
+                                f"   Posiciones distintas del cabezal: {len(perfil.histograma_cabezal)}"
+                  ).pack(anchor='w', padx=10)
+        ttk.Button(ventana, text="Exportar JSON", command=lambda: self.exportar_perfil(perfil)).pack(pady=10)
         
+    def mostrar_evaluacion_todas(self):
+        """Ventana con el veredicto y los pasos de la cadena en cada máquina registrada"""
+        cadena_entrada = self.entrada_texto.get().strip()
+        try:
+            resultados = evaluar_todas(cadena_entrada, max_pasos=1_000_000)
+        except ValueError as error:
+            messagebox.showwarning("Advertencia", str(error))
+            return
+            
+        ventana = tk.Toplevel(self.root)
+        ventana.title(f"Evaluación de '{cadena_entrada}' en todas las máquinas")
+        ventana.configure(bg='#2D2D30')
+        tabla = ttk.Treeview(ventana, columns=('patron', 'veredicto', 'pasos'), show='headings',
+                             height=len(resultados))
+        for columna, titulo, ancho in (('patron', "Patrón", 220), ('veredicto', "Veredicto", 120),
+                                       ('pasos', "Pasos", 90)):
+            tabla.heading(columna, text=titulo)
+            tabla.column(columna, width=ancho, anchor='w' if columna == 'patron' else 'center')
+        tabla.tag_configure('ACEPTADA', foreground='#4EC9B0')
+        tabla.tag_configure('RECHAZADA', foreground='#F48771')
+        for patron, veredicto, pasos in resultados:
+            tabla.insert('', 'end', values=(patron, veredicto, pasos), tags=(veredicto,))
+        tabla.pack(fill='both', expand=True, padx=10, pady=10)
+        aceptan = sum(veredicto == "ACEPTADA" for _, veredicto, _ in resultados)
+        self.agregar_al_historial(f"'{cadena_entrada}' aceptada por {aceptan} de {len(resultados)} máquinas")
+        
+    def exportar_perfil(self, perfil):
+        from tkinter import filedialog
+        ruta = filedialog.asksaveasfilename(defaultextension='.json', filetypes=[("JSON", "*.json")])
+        if ruta:
+            perfil.exportar_json(ruta)
+            self.agregar_al_historial(f"Perfil exportado a {ruta}")
+            
     def agregar_al_historial(self, mensaje):
         self.texto_historial.config(state='normal')
         self.texto_historial.insert(tk.END, f"{mensaje}\n")
         self.texto_historial.see(tk.END)
         self.texto_historial.config(state='disabled')
 
-if __name__ == "__main__":
+def iniciar_interfaz():
+    """Lanzar la interfaz gráfica (importa tkinter en este momento)"""
+    _importar_tk()
     root = tk.Tk()
     app = InterfazMaquinaTuring(root)
     root.mainloop()
+
+def _resultado_json(cadena, mt):
+    resultado = {
+        'entrada': cadena,
+        'veredicto': mt.obtener_estado_actual(),
+        'pasos': mt.contador_pasos,
+        'estado': mt.estado_actual,
+        'cabezal': mt.posicion_cabezal,
+        'inicio_cinta': mt.cinta.inicio,
+        'cinta': mt.cinta.contenido()
+    }
+    if len(mt.cintas) > 1:
+        resultado['cintas'] = [cinta.contenido() for cinta in mt.cintas]
+    return resultado
+
+def _ejecutar_archivo_con_puntos_control(mt, argumentos):
+    """run --cinta-archivo / --reanudar: entrada proyectada y puntos de control periódicos"""
+    import json
+    
+    if not isinstance(mt, MaquinaTuring):
+        raise ValueError("--cinta-archivo y --reanudar solo admiten máquinas de una cinta")
+    try:
+        if argumentos.reanudar:
+            if not argumentos.punto_control:
+                raise ValueError("--reanudar necesita --punto-control")
+            mt = restaurar_punto_control(argumentos.punto_control, mt.definicion)
+            mt.motivo_parada = None
+        else:
+            mt.cargar_archivo_entrada(argumentos.cinta_archivo)
+    except OSError as error:
+        raise ValueError(f"{error.filename}: {error.strerror}") from None
+    try:
+        # Sin detección de ciclos: compararía la cinta entera en cada comprobación
+        if argumentos.punto_control:
+            ejecutar_con_puntos_control(mt, argumentos.punto_control, argumentos.cada,
+                                        argumentos.max_pasos, argumentos.max_celdas)
+        else:
+            mt.ejecutar_hasta_parar(argumentos.max_pasos, argumentos.max_celdas)
+        # La cinta puede ser enorme: solo se informa de su extensión
+        print(json.dumps({'entrada': getattr(mt.cinta, 'ruta', argumentos.cinta_archivo),
+                          'veredicto': mt.obtener_estado_actual(), 'pasos': mt.contador_pasos,
+                          'estado': mt.estado_actual, 'cabezal': mt.posicion_cabezal,
+                          'inicio_cinta': mt.cinta.inicio, 'fin_cinta': mt.cinta.fin}, ensure_ascii=False))
+    finally:
+        if isinstance(mt.cinta, CintaMapeada):
+            mt.cinta.close()
+    return 0
+
+def _definicion_run(argumentos):
+    """Definición del subcomando run: la del archivo de --maquina o la del patrón"""
+    if argumentos.maquina is not None:
+        return cargar_definicion(argumentos.maquina)
+    return obtener_definicion(argumentos.patron)
+
+def ejecutar_linea_comandos(argumentos):
+    """Subcomando run: evaluar cadenas e imprimir una línea JSON por cadena"""
+    import json
+    
+    entradas = list(argumentos.entradas)
+    if argumentos.maquina is not None:
+        # Con --maquina no hay patrón: el primer argumento posicional es otra entrada
+        if argumentos.patron is not None:
+            entradas.insert(0, argumentos.patron)
+        argumentos.patron = None
+    elif argumentos.patron is None:
+        raise ValueError("falta el patrón (o --maquina ARCHIVO)")
+    if argumentos.archivo:
+        posicionales = entradas
+        entradas = _leer_entradas(sys.stdin if argumentos.archivo == '-' else argumentos.archivo)
+        if posicionales:
+            entradas = posicionales + list(entradas)
+            
+    if argumentos.no_determinista:
+        if argumentos.maquina is not None:
+            raise ValueError("--no-determinista solo admite expresiones regulares")
+        # Búsqueda en anchura sobre el AFN del patrón
+        mt = crear_maquina_no_determinista(argumentos.patron)
+        for cadena in entradas:
+            veredicto = mt.ejecutar(cadena, argumentos.max_configuraciones, argumentos.max_frontera,
+                                    argumentos.procesos)
+            print(json.dumps({'entrada': cadena, 'veredicto': veredicto, 'pasos': mt.contador_pasos,
+                              'configuraciones': mt.configuraciones_exploradas}, ensure_ascii=False))
+        return 0
+        
+    if argumentos.flujo:
+        if argumentos.patron in MAQUINAS_EJEMPLO:
+            raise ValueError("--flujo solo admite expresiones regulares")
+        # Todo el archivo es una única entrada, leída por trozos
+        definicion = _definicion_run(argumentos)
+        if argumentos.flujo == '-':
+            veredicto, pasos = evaluar_flujo(definicion, _sin_salto_final(_trozos_entrada(sys.stdin.buffer)),
+                                             argumentos.max_pasos)
+        else:
+            with open(argumentos.flujo, 'rb') as archivo:
+                veredicto, pasos = evaluar_flujo(definicion, _sin_salto_final(_trozos_entrada(archivo)),
+                                                 argumentos.max_pasos)
+        print(json.dumps({'entrada': argumentos.flujo, 'veredicto': veredicto, 'pasos': pasos}, ensure_ascii=False))
+        return 0
+        
+    if argumentos.prefijos:
+        if argumentos.patron in MAQUINAS_EJEMPLO:
+            raise ValueError("--prefijos solo admite expresiones regulares")
+        # Trie de entradas: cada prefijo común se simula una vez
+        definicion = _definicion_run(argumentos)
+        for cadena, (veredicto, pasos) in zip(entradas, evaluar_con_prefijos(
+                definicion, entradas, argumentos.max_pasos, argumentos.max_celdas)):
+            print(json.dumps({'entrada': cadena, 'veredicto': veredicto, 'pasos': pasos}, ensure_ascii=False))
+        return 0
+        
+    if argumentos.cache:
+        if argumentos.patron in MAQUINAS_EJEMPLO:
+            raise ValueError("--cache solo admite expresiones regulares")
+        # Resultados memorizados por huella de la máquina y entrada
+        definicion = _definicion_run(argumentos)
+        if argumentos.optimizar:
+            definicion = optimizar_definicion(definicion)[0]
+        with CacheResultados(argumentos.cache) as cache:
+            for cadena in entradas:
+                veredicto, pasos, resumen_cinta = cache.ejecutar(definicion, cadena, argumentos.max_pasos,
+                                                                 argumentos.max_celdas)
+                print(json.dumps({'entrada': cadena, 'veredicto': veredicto, 'pasos': pasos,
+                                  'cinta_sha256': resumen_cinta}, ensure_ascii=False))
+            print(json.dumps({'cache': cache.estadisticas()}), file=sys.stderr)
+        return 0
+        
+    if argumentos.sin_cinta:
+        if argumentos.patron in MAQUINAS_EJEMPLO:
+            raise ValueError("--sin-cinta solo admite expresiones regulares")
+        # Solo veredicto y pasos: recorrido AFD/vectorizado y pool de procesos
+        definicion = _definicion_run(argumentos)
+        for cadena, veredicto, pasos in evaluar_lote(definicion, entradas, procesos=argumentos.procesos,
+                                                     max_pasos=argumentos.max_pasos,
+                                                     max_celdas=argumentos.max_celdas,
+                                                     optimizar=argumentos.optimizar):
+            print(json.dumps({'entrada': cadena, 'veredicto': veredicto, 'pasos': pasos}, ensure_ascii=False))
+        return 0
+        
+    if argumentos.patron in MAQUINAS_EJEMPLO:
+        mt = crear_maquina(argumentos.patron)
+        if isinstance(mt, MaquinaTuring):
+            mt.configurar_historial('ninguno')
+    else:
+        definicion = _definicion_run(argumentos)
+        if argumentos.optimizar:
+            definicion = optimizar_definicion(definicion)[0]
+        mt = MaquinaTuring.desde_definicion(definicion, modo_historial='ninguno')
+    if argumentos.perfil:
+        if not isinstance(mt, MaquinaTuring):
+            raise ValueError("--perfil solo admite máquinas de una cinta")
+        mt.activar_instrumentacion()
+    if argumentos.cinta_archivo or argumentos.reanudar:
+        return _ejecutar_archivo_con_puntos_control(mt, argumentos)
+    for cadena in entradas:
+        mt.inicializar_cinta(cadena)
+        mt.ejecutar_hasta_parar(argumentos.max_pasos, argumentos.max_celdas, detectar_ciclos=True)
+        print(json.dumps(_resultado_json(cadena, mt), ensure_ascii=False))
+    if argumentos.perfil:
+        mt.perfil.exportar_json(argumentos.perfil)
+    return 0
+
+def main(argv=None):
+    """Punto de entrada: sin argumentos (o con 'gui') abre la interfaz gráfica"""
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv == ['gui']:
+        iniciar_interfaz()
+        return 0
+        
+    import argparse
+    
+    analizador = argparse.ArgumentParser(prog='simulador_turing.py',
+                                         description="Simulador de Máquina de Turing")
+    subcomandos = analizador.add_subparsers(dest='comando', required=True)
+    subcomandos.add_parser('gui', help="abrir la interfaz gráfica")
+    
+    analizador_run = subcomandos.add_parser('run', help="evaluar cadenas sin interfaz (salida JSON por líneas)")
+    analizador_run.add_argument('patron', nargs='?', help="expresión regular, p. ej. '(a|b)*abb' (las no registradas "
+                                                         "se compilan), o nombre de una máquina de ejemplo")
+    analizador_run.add_argument('entradas', nargs='*', metavar='ENTRADA', help="cadenas a evaluar")
+    analizador_run.add_argument('--file', '-f', dest='archivo', metavar='ARCHIVO',
+                                help="leer una cadena por línea de ARCHIVO ('-' para la entrada estándar)")
+    analizador_run.add_argument('--maquina', metavar='ARCHIVO',
+                                help="usar la máquina del archivo JSON en lugar de un patrón (todos los argumentos "
+                                     "posicionales son entradas)")
+    analizador_run.add_argument('--max-pasos', type=int, default=None, help="presupuesto de pasos por cadena")
+    analizador_run.add_argument('--max-celdas', type=int, default=None, help="presupuesto de celdas de cinta por cadena")
+    analizador_run.add_argument('--sin-cinta', action='store_true',
+                                help="omitir la cinta final y evaluar en paralelo por la ruta rápida")
+    analizador_run.add_argument('--procesos', type=int, default=1,
+                                help="procesos para --sin-cinta o --no-determinista (por defecto 1; 0 = uno por CPU)")
+    analizador_run.add_argument('--no-determinista', action='store_true',
+                                help="ejecutar el AFN del patrón como MT no determinista (búsqueda en anchura)")
+    analizador_run.add_argument('--max-configuraciones', type=int, default=None,
+                                help="con --no-determinista, configuraciones distintas como máximo")
+    analizador_run.add_argument('--max-frontera', type=int, default=None,
+                                help="con --no-determinista, tamaño máximo de la frontera de un nivel")
+    analizador_run.add_argument('--perfil', metavar='ARCHIVO',
+                                help="instrumentar la ejecución y guardar en ARCHIVO el perfil acumulado (JSON)")
+    analizador_run.add_argument('--optimizar', action='store_true',
+                                help="podar y fusionar estados antes de ejecutar (los rechazos pueden acabar antes)")
+    analizador_run.add_argument('--prefijos', action='store_true',
+                                help="omitir la cinta final y simular una sola vez los prefijos comunes de las entradas")
+    analizador_run.add_argument('--flujo', metavar='ARCHIVO',
+                                help="evaluar ARCHIVO entero ('-' para la entrada estándar) como una sola entrada, "
+                                     "leyéndolo por trozos y sin guardar la cinta; se ignora un salto de línea final")
+    analizador_run.add_argument('--cache', metavar='ARCHIVO',
+                                help="memorizar veredicto, pasos y resumen SHA-256 de la cinta final en la base "
+                                     "SQLite ARCHIVO (':memory:' para no persistir)")
+    analizador_run.add_argument('--cinta-archivo', metavar='ARCHIVO',
+                                help="usar los bytes de ARCHIVO como entrada, proyectado en memoria (sin copiarlo)")
+    analizador_run.add_argument('--punto-control', metavar='ARCHIVO',
+                                help="guardar periódicamente la configuración en ARCHIVO (formato binario)")
+    analizador_run.add_argument('--cada', type=int, default=1_000_000,
+                                help="pasos entre puntos de control (por defecto 1000000)")
+    analizador_run.add_argument('--reanudar', action='store_true',
+                                help="continuar desde el punto de control de --punto-control")
+    
+    analizador_compilar = subcomandos.add_parser('compilar', help="compilar patrones y medir el tiempo de compilación")
+    analizador_compilar.add_argument('patrones', nargs='*', metavar='PATRON',
+                                     help="expresiones a compilar (por defecto, las registradas)")
+    analizador_compilar.add_argument('--repeticiones', type=int, default=20, help="compilaciones por patrón")
+    
+    analizador_todas = subcomandos.add_parser('todas', help="evaluar cada cadena en todas las máquinas registradas a la vez")
+    analizador_todas.add_argument('entradas', nargs='*', metavar='ENTRADA', help="cadenas a evaluar")
+    analizador_todas.add_argument('--file', '-f', dest='archivo', metavar='ARCHIVO',
+                                  help="leer una cadena por línea de ARCHIVO ('-' para la entrada estándar)")
+    analizador_todas.add_argument('--patrones', nargs='+', metavar='PATRON',
+                                  help="patrones a evaluar (por defecto, los registrados)")
+    analizador_todas.add_argument('--max-pasos', type=int, default=None, help="presupuesto de pasos por cadena")
+    analizador_todas.add_argument('--max-celdas', type=int, default=None, help="presupuesto de celdas por cadena")
+    
+    analizador_exhaustivo = subcomandos.add_parser('exhaustivo', help="evaluar todas las cadenas hasta una longitud "
+                                                                     "y compararlas con el módulo re")
+    analizador_exhaustivo.add_argument('patrones', nargs='*', metavar='PATRON',
+                                       help="expresiones a comprobar (por defecto, las registradas)")
+    analizador_exhaustivo.add_argument('--longitud', type=int, default=10, help="longitud máxima de las cadenas (por defecto 10)")
+    analizador_exhaustivo.add_argument('--max-pasos', type=int, default=None, help="presupuesto de pasos por cadena")
+    
+    analizador_validar = subcomandos.add_parser('validar', help="validar archivos JSON de máquina y precompilarlos")
+    analizador_validar.add_argument('archivos', nargs='*', metavar='ARCHIVO',
+                                    help="archivos a validar (por defecto, los de maquinas/)")
+    analizador_validar.add_argument('--completa', action='store_true',
+                                    help="exigir transición para cada estado y símbolo de cinta")
+    
+    analizador_optimizar = subcomandos.add_parser('optimizar', help="informar del tamaño de las máquinas antes y después de optimizarlas")
+    analizador_optimizar.add_argument('patrones', nargs='*', metavar='PATRON',
+                                      help="expresiones a optimizar (por defecto, las registradas)")
+    
+    argumentos = analizador.parse_args(argv)
+    if argumentos.comando == 'gui':
+        iniciar_interfaz()
+        return 0
+    if argumentos.comando == 'compilar':
+        import json
+        try:
+            mediciones = medir_compilacion(argumentos.patrones or list(REGISTRO_MAQUINAS), argumentos.repeticiones)
+        except ValueError as error:
+            analizador.error(str(error))
+        for patron, estados, transiciones, milisegundos in mediciones:
+            print(json.dumps({'patron': patron, 'estados': estados, 'transiciones': transiciones,
+                              'ms': round(milisegundos, 4)}, ensure_ascii=False))
+        return 0
+    if argumentos.comando == 'todas':
+        import json
+        entradas = list(argumentos.entradas)
+        if argumentos.archivo:
+            entradas += list(_leer_entradas(sys.stdin if argumentos.archivo == '-' else argumentos.archivo))
+        try:
+            for cadena in entradas:
+                resultados = evaluar_todas(cadena, argumentos.patrones, argumentos.max_pasos, argumentos.max_celdas)
+                print(json.dumps({'entrada': cadena, 'resultados': [
+                    {'patron': patron, 'veredicto': veredicto, 'pasos': pasos}
+                    for patron, veredicto, pasos in resultados]}, ensure_ascii=False))
+        except ValueError as error:
+            analizador.error(str(error))
+        return 0
+    if argumentos.comando == 'exhaustivo':
+        import json
+        hay_discrepancias = False
+        for patron in argumentos.patrones or list(REGISTRO_MAQUINAS):
+            if patron in MAQUINAS_EJEMPLO:
+                analizador.error(f"{patron!r} no es una expresión regular")
+            try:
+                evaluadas, discrepancias = comparar_con_re(patron, argumentos.longitud, argumentos.max_pasos)
+            except ValueError as error:
+                analizador.error(str(error))
+            hay_discrepancias = hay_discrepancias or bool(discrepancias)
+            print(json.dumps({'patron': patron, 'cadenas': evaluadas, 'discrepancias': [
+                {'entrada': cadena, 'veredicto': veredicto, 'pasos': pasos, 're': esperado}
+                for cadena, veredicto, pasos, esperado in discrepancias]}, ensure_ascii=False))
+        return 1 if hay_discrepancias else 0
+    if argumentos.comando == 'validar':
+        import json
+        archivos = argumentos.archivos or [os.path.join(DIRECTORIO_MAQUINAS, archivo)
+                                           for archivo in sorted(os.listdir(DIRECTORIO_MAQUINAS))
+                                           if archivo.endswith('.json')]
+        validos = True
+        for ruta in archivos:
+            try:
+                datos = leer_archivo_maquina(ruta)
+                if argumentos.completa:
+                    try:
+                        validar_definicion(datos, completa=True)
+                    except ValueError as error:
+                        raise ValueError(f"{ruta}: {error}") from None
+                cargar_definicion(ruta)  # deja la forma precompilada junto al archivo
+                print(json.dumps({'archivo': ruta, 'valido': True}, ensure_ascii=False))
+            except (OSError, ValueError) as error:
+                validos = False
+                print(json.dumps({'archivo': ruta, 'valido': False, 'error': str(error)}, ensure_ascii=False))
+        return 0 if validos else 1
+    if argumentos.comando == 'optimizar':
+        import json
+        for patron in argumentos.patrones or list(REGISTRO_MAQUINAS):
+            try:
+                _, informe = optimizar_definicion(obtener_definicion(patron))
+            except ValueError as error:
+                analizador.error(str(error))
+            print(json.dumps({'patron': patron, **informe}, ensure_ascii=False))
+        return 0
+    if argumentos.procesos == 0:
+        argumentos.procesos = None
+    try:
+        return ejecutar_linea_comandos(argumentos)
+    except ValueError as error:
+        analizador.error(str(error))
+
+if __name__ == "__main__":
+    sys.exit(main())
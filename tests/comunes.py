@@ -0,0 +1,38 @@
+"""Máquinas y entradas compartidas por las pruebas"""
+import itertools
+import random
+
+import simulador_turing as st
+
+# Además de las registradas, dos compiladas con AFD mayores que los registrados
+PATRONES = sorted(st.REGISTRO_MAQUINAS) + ['(a|b)*a(a|b)', '(0|1)*1(0|1)(0|1)']
+# Máquinas de una cinta con barridos, movimientos a la izquierda y cinta reescrita
+EJEMPLOS = ["palindromos (1 cinta)", "a^n b^n (1 cinta)"]
+
+
+def definiciones():
+    """Pares (nombre, DefinicionMaquina) de PATRONES y EJEMPLOS"""
+    pares = [(patron, st.obtener_definicion(patron)) for patron in PATRONES]
+    return pares + [(nombre, st.crear_maquina(nombre).definicion) for nombre in EJEMPLOS]
+
+
+def entradas(definicion, longitud_maxima):
+    """Todas las cadenas sobre el alfabeto de la máquina hasta longitud_maxima"""
+    simbolos = sorted(definicion.alfabeto)
+    for longitud in range(longitud_maxima + 1):
+        yield from map(''.join, itertools.product(simbolos, repeat=longitud))
+
+
+def aleatorias(definicion, cantidad, longitud_maxima, semilla=0):
+    generador = random.Random(semilla)
+    simbolos = sorted(definicion.alfabeto)
+    return [''.join(generador.choice(simbolos) for _ in range(generador.randint(0, longitud_maxima)))
+            for _ in range(cantidad)]
+
+
+def ejecutar(definicion, cadena, historial='ninguno', **opciones):
+    """(veredicto, estado, cabezal, pasos, cinta) tras ejecutar_hasta_parar"""
+    mt = st.MaquinaTuring.desde_definicion(definicion, modo_historial=historial)
+    mt.inicializar_cinta(cadena)
+    veredicto = mt.ejecutar_hasta_parar(**opciones)
+    return veredicto, mt.estado_actual, mt.posicion_cabezal, mt.contador_pasos, mt.cinta
@@ -0,0 +1,61 @@
+"""Máquinas de solo derecha recorridas como AFD, una a una y vectorizadas con NumPy"""
+import pytest
+
+import simulador_turing as st
+
+from comunes import aleatorias, definiciones, ejecutar, entradas
+
+AFD = [(nombre, definicion) for nombre, definicion in definiciones() if definicion.compilar().solo_derecha]
+PRESUPUESTOS = [{}, {'max_pasos': 2}, {'max_pasos': 5}, {'max_celdas': 3}, {'max_celdas': 6}]
+
+
+def _sin_parada():
+    """Acepta 'a' y recorre la cinta a la derecha para siempre con cualquier otra entrada"""
+    return st.DefinicionMaquina(
+        {'q0', 'q1', 'aceptar'}, {'a', 'b'}, {'a', 'b', '_'},
+        {('q0', 'a'): ('q1', 'a', 'R'),
+         ('q0', 'b'): ('q0', 'b', 'R'),
+         ('q0', '_'): ('q0', '_', 'R'),
+         ('q1', '_'): ('aceptar', '_', 'R')},
+        'q0', {'aceptar'}, set())
+
+
+def test_hay_maquinas_de_solo_derecha():
+    assert len(AFD) >= 5
+    assert not st.crear_maquina("palindromos (1 cinta)").definicion.compilar().solo_derecha
+
+
+@pytest.mark.parametrize('nombre, definicion', AFD + [('sin parada', _sin_parada())])
+def test_afd_como_simulacion_vigilada(nombre, definicion):
+    """evaluar_cadena (AFD) da el veredicto y los pasos de ejecutar_hasta_parar con detectar_ciclos"""
+    for cadena in entradas(definicion, 5):
+        for opciones in PRESUPUESTOS:
+            veredicto, _, _, pasos, _ = ejecutar(definicion, cadena, detectar_ciclos=True, **opciones)
+            assert st.evaluar_cadena(definicion, cadena, **opciones) == (veredicto, pasos), (cadena, opciones)
+
+
+def test_bucle_sin_parada():
+    definicion = _sin_parada()
+    assert st.evaluar_cadena(definicion, 'a') == ("ACEPTADA", 2)
+    assert st.evaluar_cadena(definicion, 'bb')[0] == "BUCLE"
+    assert st.evaluar_cadena(definicion, 'bb', max_pasos=4) == ("LIMITE", 4)
+
+
+@pytest.mark.parametrize('nombre, definicion', AFD + [('sin parada', _sin_parada())])
+def test_vectorizado(nombre, definicion):
+    np = pytest.importorskip('numpy')
+    compilada = definicion.compilar()
+    cadenas = aleatorias(definicion, 80, 12) + ['']
+    datos = [st.codificar_cadena(cadena) for cadena in cadenas]
+    estados, pasos = compilada.ejecutar_afd_vectorizado(datos, np)
+    assert list(zip(estados, pasos)) == [compilada.ejecutar_afd(entrada) for entrada in datos]
+    assert compilada.ejecutar_afd_vectorizado([], np) == ([], [])
+
+
+@pytest.mark.parametrize('nombre, definicion', definiciones())
+def test_evaluar_cadenas(nombre, definicion):
+    """evaluar_cadenas coincide con evaluar_cadena, con y sin presupuestos"""
+    cadenas = aleatorias(definicion, 60, 8)
+    for opciones in PRESUPUESTOS:
+        esperado = [st.evaluar_cadena(definicion, cadena, **opciones) for cadena in cadenas]
+        assert st.evaluar_cadenas(definicion, cadenas, **opciones) == esperado, opciones
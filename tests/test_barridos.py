@@ -0,0 +1,57 @@
+"""Barridos de bucles propios en el motor compilado frente al paso a paso"""
+import random
+
+import pytest
+
+import simulador_turing as st
+
+from comunes import ejecutar
+
+# Marca las 'a' con X hasta el final y vuelve al principio: dos barridos, uno con escritura
+IDA_Y_VUELTA = st.DefinicionMaquina(
+    {'ida', 'vuelta', 'aceptar'}, {'a', 'b'}, {'a', 'b', 'X', '_'},
+    {('ida', 'a'): ('ida', 'X', 'R'),
+     ('ida', 'b'): ('ida', 'b', 'R'),
+     ('ida', '_'): ('vuelta', '_', 'L'),
+     ('vuelta', 'X'): ('vuelta', 'X', 'L'),
+     ('vuelta', 'b'): ('vuelta', 'b', 'L'),
+     ('vuelta', '_'): ('aceptar', '_', 'R')},
+    'ida', {'aceptar'}, set())
+
+
+def _largas(simbolos, semilla=0):
+    generador = random.Random(semilla)
+    cadenas = [simbolos[0] * n for n in (7, 8, 9, 64, 65, 1000)]
+    cadenas += [''.join(generador.choice(simbolos) for _ in range(generador.randint(100, 3000))) for _ in range(6)]
+    # Rachas largas de un solo símbolo separadas por otros
+    cadenas.append(''.join(generador.choice(simbolos) * generador.randint(1, 200) for _ in range(30)))
+    return cadenas
+
+
+def test_barridos_detectados():
+    compilada = IDA_Y_VUELTA.compilar()
+    ida, vuelta = compilada.indice_estado['ida'], compilada.indice_estado['vuelta']
+    assert set(compilada.barridos) == {ida << 8 | ord('a'), ida << 8 | ord('b'),
+                                       vuelta << 8 | ord('X'), vuelta << 8 | ord('b')}
+    assert compilada.barridos[ida << 8 | ord('a')][0] == 1
+    assert compilada.barridos[vuelta << 8 | ord('b')][0] == -1
+    # Solo reescribe el barrido de ida
+    assert compilada.barridos[vuelta << 8 | ord('X')][2] is None
+    assert compilada.tabla_barrido[ida << 8 | ord('a')] is None
+
+
+@pytest.mark.parametrize('nombre, definicion', [('ida y vuelta', IDA_Y_VUELTA),
+                                                ('palindromos', st.crear_maquina("palindromos (1 cinta)").definicion),
+                                                ('a^n b^n', st.crear_maquina("a^n b^n (1 cinta)").definicion),
+                                                ('(a|b)*abb', st.obtener_definicion('(a|b)*abb'))])
+def test_entradas_largas(nombre, definicion):
+    for cadena in _largas(sorted(definicion.alfabeto)):
+        interpretada = ejecutar(definicion, cadena, 'completo')
+        assert ejecutar(definicion, cadena, 'ninguno') == interpretada, len(cadena)
+
+
+def test_presupuesto_a_mitad_de_barrido():
+    cadena = 'a' * 300 + 'b' * 300
+    for max_pasos in (1, 7, 8, 9, 150, 299, 300, 301, 599, 600, 601, 900, 1202, 1203):
+        interpretada = ejecutar(IDA_Y_VUELTA, cadena, 'completo', max_pasos=max_pasos)
+        assert ejecutar(IDA_Y_VUELTA, cadena, 'ninguno', max_pasos=max_pasos) == interpretada, max_pasos
@@ -0,0 +1,81 @@
+"""Caché de resultados en memoria y en SQLite (CacheResultados)"""
+import hashlib
+
+import pytest
+
+import simulador_turing as st
+
+from comunes import aleatorias, definiciones, ejecutar
+
+
+def _modificada(definicion):
+    """La misma máquina con la transición de ('q0', 'a') cambiada"""
+    transiciones = dict(definicion.transiciones)
+    transiciones[('q0', 'a')] = ('rechazar', 'X', 'R')
+    return st.DefinicionMaquina(definicion.estados, definicion.alfabeto, definicion.alfabeto_cinta,
+                                transiciones, definicion.estado_inicial,
+                                definicion.estados_aceptacion, definicion.estados_rechazo)
+
+
+@pytest.mark.parametrize('nombre, definicion', definiciones())
+def test_resultados_en_memoria(nombre, definicion):
+    """CacheResultados coincide con evaluar_cadena y desaloja los menos usados"""
+    cadenas = aleatorias(definicion, 60, 8)
+    esperado = [st.evaluar_cadena(definicion, cadena, 500) for cadena in cadenas]
+    cache = st.CacheResultados(capacidad=16)
+    for _ in range(2):
+        assert [cache.ejecutar(definicion, cadena, 500)[:2] for cadena in cadenas] == esperado
+    assert cache.aciertos > 0 and cache.desalojos > 0
+    assert len(cache.memoria) == 16
+
+
+def test_resumen_de_la_cinta():
+    definicion = st.crear_maquina("palindromos (1 cinta)").definicion
+    _, _, _, pasos, cinta = ejecutar(definicion, 'abba', detectar_ciclos=True)
+    resumen = hashlib.sha256(f"{cinta.inicio}:{cinta.contenido()}".encode('latin-1')).hexdigest()
+    assert st.CacheResultados().ejecutar(definicion, 'abba') == ("ACEPTADA", pasos, resumen)
+
+
+def test_lru_y_presupuestos():
+    definicion = st.obtener_definicion('(a|b)*abb')
+    cache = st.CacheResultados(capacidad=2)
+    cache.ejecutar(definicion, 'a')
+    cache.ejecutar(definicion, 'b')
+    cache.ejecutar(definicion, 'a')
+    cache.ejecutar(definicion, 'abb')  # desaloja 'b', el menos usado
+    assert cache.estadisticas() == {'aciertos': 1, 'aciertos_disco': 0, 'fallos': 3, 'desalojos': 1,
+                                    'entradas_memoria': 2, 'tasa_aciertos': 0.25}
+    cache.ejecutar(definicion, 'a')
+    assert cache.aciertos == 2
+    # Los presupuestos forman parte de la clave
+    assert cache.ejecutar(definicion, 'abb', max_pasos=1)[:2] == ("LIMITE", 1)
+    assert cache.ejecutar(definicion, 'abb')[0] == "ACEPTADA"
+    assert st.CacheResultados().estadisticas()['tasa_aciertos'] is None
+
+
+def test_cache_persistente_se_invalida(tmp_path):
+    ruta = str(tmp_path / 'resultados.db')
+    definicion = st.obtener_definicion('(a|b)*abb')
+    with st.CacheResultados(ruta) as cache:
+        resultado = cache.ejecutar(definicion, 'aabb')
+    with st.CacheResultados(ruta) as cache:
+        assert cache.ejecutar(definicion, 'aabb') == resultado
+        assert cache.aciertos_disco == 1
+        assert cache.ejecutar(_modificada(definicion), 'aabb')[0] == "RECHAZADA"
+        assert cache.fallos == 1
+
+
+def test_invalidar_borra_de_disco(tmp_path):
+    ruta = str(tmp_path / 'resultados.db')
+    definicion = st.obtener_definicion('(a|b)*abb')
+    modificada = _modificada(definicion)
+    with st.CacheResultados(ruta) as cache:
+        for cadena in ['abb', 'aabb', 'ba']:
+            cache.ejecutar(definicion, cadena)
+            cache.ejecutar(modificada, cadena)
+        cache.invalidar(definicion)
+        assert not cache.memoria
+    with st.CacheResultados(ruta) as cache:
+        cache.ejecutar(definicion, 'abb')
+        cache.ejecutar(modificada, 'abb')
+        assert (cache.fallos, cache.aciertos_disco) == (1, 1)
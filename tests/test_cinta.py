@@ -0,0 +1,70 @@
+"""Cinta bi-infinita frente a un modelo de diccionario"""
+import random
+
+import pytest
+
+import simulador_turing as st
+
+
+def _contenido(modelo, inicio, fin):
+    return ''.join(modelo.get(posicion, st.BLANCO) for posicion in range(inicio, fin))
+
+
+def test_entrada_inicial():
+    cinta = st.Cinta('abc')
+    assert (cinta.inicio, cinta.fin, len(cinta)) == (0, 4, 4)
+    assert cinta.contenido() == 'abc_'
+    assert (cinta[0], cinta[2], cinta[3], cinta[-5], cinta[1000]) == ('a', 'c', '_', '_', '_')
+    assert list(st.Cinta()) == ['_']
+
+
+def test_escrituras_aleatorias():
+    generador = random.Random(0)
+    cinta = st.Cinta('ab')
+    modelo = {0: 'a', 1: 'b'}
+    inicio, fin = 0, 3
+    for _ in range(3000):
+        posicion = generador.randint(-400, 400)
+        simbolo = generador.choice('abX_')
+        cinta[posicion] = simbolo
+        modelo[posicion] = simbolo
+        inicio, fin = min(inicio, posicion), max(fin, posicion + 1)
+        assert (cinta.inicio, cinta.fin) == (inicio, fin)
+    assert cinta.contenido() == _contenido(modelo, inicio, fin)
+    assert cinta.contenido(-500, 500) == _contenido(modelo, -500, 500)
+    assert cinta.contenido(450, 460) == '_' * 10
+    for posicion in range(-410, 410):
+        assert cinta[posicion] == modelo.get(posicion, st.BLANCO)
+    datos, origen, inferior, superior = cinta.tramo(0)
+    assert (inferior - origen, superior - origen) == (inicio, fin)
+    assert datos[inferior:superior].decode('latin-1') == cinta.contenido()
+
+
+def test_copia_independiente_e_igualdad():
+    cinta = st.Cinta('aba')
+    cinta[-3] = 'X'
+    copia = cinta.copy()
+    assert copia == cinta and copia.contenido() == 'X__aba_'
+    copia[1] = 'Y'
+    assert cinta[1] == 'b' and copia != cinta
+    # Mismo contenido visible con distinto tramo no es la misma cinta
+    assert st.Cinta('a') != st.Cinta('a_')
+    assert st.Cinta('ab') == st.Cinta('ab')
+
+
+def test_extender_y_recortar():
+    cinta = st.Cinta('a')
+    cinta.extender(-200)
+    cinta.extender(300)
+    assert (cinta.inicio, cinta.fin) == (-200, 301)
+    assert cinta.contenido() == '_' * 200 + 'a' + '_' * 300
+    cinta.recortar(0, 2)
+    assert cinta.contenido() == 'a_'
+
+
+def test_simbolo_no_codificable():
+    cinta = st.Cinta()
+    with pytest.raises(ValueError):
+        cinta[0] = 'Ω'
+    with pytest.raises(ValueError):
+        st.Cinta('Ω')
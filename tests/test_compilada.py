@@ -0,0 +1,46 @@
+"""Motor compilado (MaquinaCompilada) frente al intérprete paso a paso"""
+import pytest
+
+import simulador_turing as st
+
+from comunes import definiciones, ejecutar, entradas
+
+
+@pytest.mark.parametrize('nombre, definicion', definiciones())
+def test_interprete_y_compilada(nombre, definicion):
+    """Paso a paso (con historial) y tabla compilada (sin historial) dejan la misma configuración"""
+    for cadena in entradas(definicion, 5):
+        interpretada = ejecutar(definicion, cadena, 'completo')
+        assert ejecutar(definicion, cadena, 'ninguno') == interpretada, cadena
+
+
+@pytest.mark.parametrize('nombre, definicion', definiciones())
+def test_ejecutar_sobre_cinta(nombre, definicion):
+    compilada = definicion.compilar()
+    for cadena in entradas(definicion, 4):
+        veredicto, estado, cabezal, pasos, cinta = ejecutar(definicion, cadena, 'completo')
+        otra = st.Cinta(cadena)
+        codificado, posicion, total = compilada.ejecutar(otra, 0, 0)
+        assert (compilada.estados[codificado], posicion, total, otra) == (estado, cabezal, pasos, cinta), cadena
+        assert compilada.veredicto(codificado) == veredicto, cadena
+
+
+def test_codificacion_de_la_tabla():
+    definicion = st.obtener_definicion('a(a|b)*b')
+    compilada = definicion.compilar()
+    assert compilada.estados[0] == definicion.estado_inicial
+    assert compilada.es_parada == [estado in definicion.estados_aceptacion | definicion.estados_rechazo
+                                   for estado in compilada.estados]
+    for (estado, simbolo), (siguiente, escribir, direccion) in definicion.transiciones.items():
+        transicion = compilada.tabla[compilada.indice_estado[estado] << 8 | ord(simbolo)]
+        assert transicion == (compilada.indice_estado[siguiente], ord(escribir), st.MOVIMIENTOS.get(direccion, 0))
+    assert definicion.compilar() is compilada
+
+
+def test_simbolos_no_codificables():
+    assert st.codificar_simbolo('_') == 95
+    for simbolo in ['ab', '', 'Ω']:
+        with pytest.raises(ValueError):
+            st.codificar_simbolo(simbolo)
+    with pytest.raises(ValueError):
+        st.codificar_cadena('aΩ')
@@ -0,0 +1,59 @@
+"""Carga de máquinas desde archivos JSON"""
+import os
+
+import pytest
+
+import simulador_turing as st
+
+MAQUINA = '''{
+  "estados": ["q0", "aceptar"],
+  "alfabeto": ["a"],
+  "alfabeto_cinta": ["a", "_"],
+  "estado_inicial": "q0",
+  "estados_aceptacion": ["aceptar"],
+  "estados_rechazo": [],
+  "transiciones": [
+    ["q0", "a", "q0", "a", "R"],
+    ["q0", "_", "aceptar", "_", "R"]
+  ]
+}
+'''
+
+
+def test_patron_no_es_ruta(tmp_path):
+    ruta = tmp_path / 'maquina.json'
+    ruta.write_text(MAQUINA)
+    try:
+        definicion = st.obtener_definicion(str(ruta))
+    except ValueError:
+        definicion = None
+    assert not (tmp_path / 'maquina.mtc').exists()
+    assert definicion is None or definicion.huella() != st.cargar_definicion(str(ruta)).huella()
+
+
+def test_cargar_definicion_reutiliza_hasta_que_cambia(tmp_path):
+    ruta = tmp_path / 'maquina.json'
+    ruta.write_text(MAQUINA)
+    primera = st.cargar_definicion(str(ruta))
+    assert st.cargar_definicion(str(ruta)) is primera
+    ruta.write_text(MAQUINA.replace('"R"]\n  ]', '"L"]\n  ]'))
+    os.utime(ruta, ns=(0, 0))
+    segunda = st.cargar_definicion(str(ruta))
+    assert segunda is not primera
+    assert segunda.transiciones[('q0', '_')] == ('aceptar', '_', 'L')
+
+
+def test_maquinas_incluidas_con_y_sin_cache():
+    for archivo in sorted(os.listdir(st.DIRECTORIO_MAQUINAS)):
+        if archivo.endswith('.json'):
+            ruta = os.path.join(st.DIRECTORIO_MAQUINAS, archivo)
+            assert st.cargar_definicion(ruta, usar_cache=False).huella() == st.cargar_definicion(ruta).huella()
+
+
+def test_run_maquina(tmp_path, capsys):
+    ruta = tmp_path / 'maquina.json'
+    ruta.write_text(MAQUINA)
+    assert st.main(['run', '--maquina', str(ruta), 'aa', '--sin-cinta']) == 0
+    assert '"veredicto": "ACEPTADA"' in capsys.readouterr().out
+    with pytest.raises(SystemExit):
+        st.main(['run'])
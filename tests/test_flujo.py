@@ -0,0 +1,61 @@
+"""evaluar_flujo frente a evaluar_cadena y lectura perezosa de la entrada"""
+import itertools
+
+import pytest
+
+import simulador_turing as st
+
+
+def _trozos(cadena, tamano):
+    for inicio in range(0, len(cadena), tamano):
+        yield cadena[inicio:inicio + tamano]
+
+
+@pytest.mark.parametrize('patron', sorted(st.REGISTRO_MAQUINAS) + ['(a|b)*a(a|b)', 'ab*c'])
+def test_coincide_con_evaluar_cadena(patron):
+    definicion = st.obtener_definicion(patron)
+    if not definicion.compilar().solo_derecha:
+        with pytest.raises(ValueError):
+            st.evaluar_flujo(definicion, 'a')
+        return
+    simbolos = sorted(definicion.alfabeto)
+    for longitud in range(7):
+        for cadena in map(''.join, itertools.product(simbolos, repeat=longitud)):
+            for max_pasos in (None, 0, 3, longitud):
+                esperado = st.evaluar_cadena(definicion, cadena, max_pasos)
+                assert st.evaluar_flujo(definicion, cadena, max_pasos) == esperado
+                assert st.evaluar_flujo(definicion, _trozos(cadena, 2), max_pasos) == esperado
+
+
+def test_no_lee_tras_parar():
+    """Si la máquina para con el último símbolo de un trozo, el siguiente no se pide"""
+    definicion = st.DefinicionMaquina(
+        {'q0', 'aceptar'}, {'a'}, {'a', '_'},
+        {('q0', 'a'): ('aceptar', 'a', 'R')},
+        'q0', {'aceptar'}, set())
+
+    def trozos():
+        yield 'a'
+        raise AssertionError("se leyó más allá de la parada")
+
+    assert st.evaluar_flujo(definicion, trozos()) == ("ACEPTADA", 1)
+
+
+def test_maquina_metodo():
+    mt = st.crear_maquina_regex('(a|b)*abb')
+    assert mt.evaluar_flujo(_trozos('ababb', 2)) == "ACEPTADA"
+    assert mt.contador_pasos == st.evaluar_cadena(mt.definicion, 'ababb')[1]
+
+
+@pytest.mark.parametrize('contenido, esperado', [
+    (b'abb\n', b'abb'), (b'abb\r\n', b'abb'), (b'abb', b'abb'), (b'abb\n\n', b'abb\n'), (b'', b'')])
+@pytest.mark.parametrize('tamano', [1, 2, 64])
+def test_sin_salto_final(contenido, esperado, tamano):
+    assert b''.join(st._sin_salto_final(_trozos(contenido, tamano))) == esperado
+
+
+def test_linea_de_comandos_flujo(tmp_path, capsys):
+    archivo = tmp_path / 'entrada.txt'
+    archivo.write_text('aababb\n')
+    assert st.main(['run', '(a|b)*abb', '--flujo', str(archivo)]) == 0
+    assert '"veredicto": "ACEPTADA"' in capsys.readouterr().out
@@ -0,0 +1,64 @@
+"""Paridad del código generado (ejecutar_generada) con el intérprete paso a paso"""
+import itertools
+
+import pytest
+
+import simulador_turing as st
+
+
+def _entradas(alfabeto, longitud_maxima):
+    simbolos = sorted(alfabeto)
+    for longitud in range(longitud_maxima + 1):
+        for entrada in itertools.product(simbolos, repeat=longitud):
+            yield ''.join(entrada)
+
+
+def _configuracion(mt):
+    return mt.estado_actual, mt.posicion_cabezal, mt.contador_pasos, mt.cinta
+
+
+def _comprobar_paridad(definicion, cadena, max_pasos):
+    """Tras cada número de pasos k, ejecutar_generada(k) deja la misma configuración que k ejecutar_paso"""
+    interpretada = st.MaquinaTuring.desde_definicion(definicion, modo_historial='ninguno')
+    interpretada.inicializar_cinta(cadena)
+    for pasos in range(max_pasos + 1):
+        generada = st.MaquinaTuring.desde_definicion(definicion, modo_historial='ninguno')
+        generada.inicializar_cinta(cadena)
+        generada.ejecutar_generada(pasos)
+        assert _configuracion(generada) == _configuracion(interpretada), (cadena, pasos)
+        if not interpretada.ejecutar_paso():
+            assert generada.motivo_parada is None
+            return
+    assert generada.motivo_parada == "LIMITE"
+
+
+@pytest.mark.parametrize('patron', sorted(st.REGISTRO_MAQUINAS))
+def test_maquinas_registradas(patron):
+    definicion = st.obtener_definicion(patron)
+    for cadena in _entradas(definicion.alfabeto, 5):
+        _comprobar_paridad(definicion, cadena, 20)
+
+
+@pytest.mark.parametrize('nombre', ["palindromos (1 cinta)", "a^n b^n (1 cinta)"])
+def test_maquinas_de_ejemplo(nombre):
+    definicion = st.crear_maquina(nombre).definicion
+    for cadena in _entradas(definicion.alfabeto, 5):
+        _comprobar_paridad(definicion, cadena, 60)
+
+
+def test_transicion_sin_efecto():
+    """Una transición que reescribe el mismo símbolo, no mueve y no cambia de estado"""
+    definicion = st.DefinicionMaquina(
+        {'q0', 'q1', 'aceptar'}, {'a', 'b'}, {'a', 'b', '_'},
+        {('q0', 'a'): ('q0', 'a', 'S'),
+         ('q0', 'b'): ('q1', 'b', 'R'),
+         ('q1', 'a'): ('q1', 'a', 'R'),
+         ('q1', '_'): ('aceptar', '_', 'S')},
+        'q0', {'aceptar'}, set())
+    assert 'pass' in definicion.compilar().generar_codigo()
+    for cadena in ['', 'a', 'b', 'ba', 'bab', 'ab']:
+        _comprobar_paridad(definicion, cadena, 10)
+    mt = st.MaquinaTuring.desde_definicion(definicion, modo_historial='ninguno')
+    mt.inicializar_cinta('a')
+    assert mt.ejecutar_generada(1000) == "LIMITE"
+    assert mt.contador_pasos == 1000
@@ -0,0 +1,72 @@
+"""Historial por deltas: reconstrucción de configuraciones en los modos completo, anillo y ninguno"""
+import pytest
+
+import simulador_turing as st
+
+from comunes import definiciones
+
+
+def _configuraciones(definicion, cadena, modo, capacidad=1000):
+    """Ejecutar paso a paso guardando copias completas de cada configuración"""
+    mt = st.MaquinaTuring.desde_definicion(definicion, modo_historial=modo, capacidad_historial=capacidad)
+    mt.inicializar_cinta(cadena)
+    copias = [(mt.cinta.copy(), mt.posicion_cabezal, mt.estado_actual)]
+    while mt.ejecutar_paso():
+        copias.append((mt.cinta.copy(), mt.posicion_cabezal, mt.estado_actual))
+    return mt, copias
+
+
+def _tupla(configuracion):
+    return configuracion['cinta'], configuracion['posicion_cabezal'], configuracion['estado_actual']
+
+
+@pytest.mark.parametrize('nombre, definicion', definiciones())
+def test_completo_reconstruye_todos_los_pasos(nombre, definicion):
+    for cadena in ['', 'ab', 'abba', 'aabb', '0110', '10011']:
+        if set(cadena) - definicion.alfabeto:
+            continue
+        mt, copias = _configuraciones(definicion, cadena, 'completo')
+        assert len(mt.historial) == len(copias) == mt.contador_pasos + 1
+        for paso, copia in enumerate(copias):
+            assert _tupla(mt.obtener_configuracion(paso)) == copia, (cadena, paso)
+        assert [_tupla(configuracion) for configuracion in mt.historial] == copias
+        assert [configuracion['paso'] for configuracion in mt.historial[::2]] == list(range(0, len(copias), 2))
+
+
+def test_anillo_conserva_los_ultimos_pasos():
+    definicion = st.crear_maquina("palindromos (1 cinta)").definicion
+    mt, copias = _configuraciones(definicion, 'abbaabba', 'anillo', capacidad=5)
+    assert len(copias) > 6
+    assert len(mt.historial) == 6
+    assert [_tupla(configuracion) for configuracion in mt.historial] == copias[-6:]
+    assert _tupla(mt.historial[-1]) == copias[-1]
+    with pytest.raises(IndexError):
+        mt.obtener_configuracion(mt.contador_pasos - 6)
+
+
+def test_ninguno_solo_guarda_la_actual():
+    definicion = st.crear_maquina("a^n b^n (1 cinta)").definicion
+    mt, copias = _configuraciones(definicion, 'aabb', 'ninguno')
+    assert len(mt.historial) == 1
+    assert _tupla(mt.obtener_configuracion(mt.contador_pasos)) == copias[-1]
+    with pytest.raises(IndexError):
+        mt.obtener_configuracion(0)
+
+
+def test_modo_desconocido():
+    with pytest.raises(ValueError):
+        st.HistorialEjecucion('todo')
+    with pytest.raises(ValueError):
+        st.HistorialEjecucion('anillo', 0)
+
+
+def test_cambiar_politica_conservando_deltas():
+    """Con conservar, el cambio de política mantiene los deltas más recientes que quepan"""
+    definicion = st.crear_maquina("palindromos (1 cinta)").definicion
+    mt, copias = _configuraciones(definicion, 'abbaabba', 'completo')
+    mt.configurar_historial('anillo', 4, conservar=True)
+    assert [_tupla(configuracion) for configuracion in mt.historial] == copias[-5:]
+    mt.configurar_historial('completo', conservar=True)
+    assert [_tupla(configuracion) for configuracion in mt.historial] == copias[-5:]
+    mt.configurar_historial('completo')
+    assert len(mt.historial) == 1
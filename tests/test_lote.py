@@ -0,0 +1,34 @@
+"""Evaluación por lotes en un pool de procesos (evaluar_lote)"""
+import pytest
+
+import simulador_turing as st
+
+from comunes import aleatorias
+
+
+def _esperado(definicion, cadenas, max_pasos=None):
+    return [(cadena, *st.evaluar_cadena(definicion, cadena, max_pasos)) for cadena in cadenas]
+
+
+def test_un_proceso_en_orden():
+    definicion = st.obtener_definicion('(a|b)*abb')
+    cadenas = aleatorias(definicion, 300, 10)
+    resultados = list(st.evaluar_lote('(a|b)*abb', cadenas, procesos=1, tamano_bloque=7))
+    assert resultados == _esperado(definicion, cadenas)
+
+
+def test_varios_procesos(tmp_path):
+    definicion = st.crear_maquina("a^n b^n (1 cinta)").definicion
+    cadenas = aleatorias(definicion, 200, 8, semilla=1)
+    esperado = _esperado(definicion, cadenas, 40)
+    assert list(st.evaluar_lote(definicion, cadenas, procesos=2, tamano_bloque=16, max_pasos=40)) == esperado
+    desordenados = st.evaluar_lote(definicion, cadenas, procesos=2, tamano_bloque=16, ordenado=False, max_pasos=40)
+    assert sorted(desordenados) == sorted(esperado)
+    ruta = tmp_path / 'entradas.txt'
+    ruta.write_text(''.join(cadena + '\n' for cadena in cadenas), encoding='utf-8')
+    assert list(st.evaluar_lote(definicion, str(ruta), procesos=2, tamano_bloque=50, max_pasos=40)) == esperado
+
+
+def test_patron_invalido_antes_de_lanzar_procesos():
+    with pytest.raises(ValueError):
+        next(st.evaluar_lote('(a|b', ['a'], procesos=2))
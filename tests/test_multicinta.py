@@ -0,0 +1,57 @@
+"""Máquinas de dos cintas frente a sus equivalentes de una cinta"""
+import itertools
+
+import pytest
+
+import simulador_turing as st
+
+
+@pytest.mark.parametrize('una, dos', [("palindromos (1 cinta)", "palindromos (2 cintas)"),
+                                      ("a^n b^n (1 cinta)", "a^n b^n (2 cintas)")])
+def test_mismos_veredictos(una, dos):
+    mt1 = st.crear_maquina(una)
+    mt2 = st.crear_maquina(dos)
+    mt1.configurar_historial('ninguno')
+    for longitud in range(7):
+        for cadena in map(''.join, itertools.product('ab', repeat=longitud)):
+            mt1.inicializar_cinta(cadena)
+            mt2.inicializar_cinta(cadena)
+            esperado = mt1.ejecutar_hasta_parar(detectar_ciclos=True)
+            assert mt2.ejecutar_hasta_parar(detectar_ciclos=True) == esperado, cadena
+
+
+def _vaiven():
+    """Dos cintas: la primera va y viene entre sus dos primeras celdas sin parar"""
+    return st.MaquinaMultiCinta(
+        {'ida', 'vuelta', 'aceptar'}, {'a'}, {'a', '_'},
+        {('ida', ('a', '_')): ('vuelta', ('a', '_'), ('R', 'S')),
+         ('vuelta', ('a', '_')): ('ida', ('a', '_'), ('L', 'S')),
+         ('vuelta', ('_', '_')): ('aceptar', ('_', '_'), ('S', 'S'))},
+        'ida', {'aceptar'}, set())
+
+
+def test_detecta_bucle():
+    mt = _vaiven()
+    mt.inicializar_cinta('aa')
+    assert mt.ejecutar_hasta_parar(detectar_ciclos=True) == "BUCLE"
+    mt.inicializar_cinta('a')
+    assert mt.ejecutar_hasta_parar(detectar_ciclos=True) == "ACEPTADA"
+    mt.inicializar_cinta('aa')
+    assert mt.ejecutar_hasta_parar(max_pasos=100) == "LIMITE"
+
+
+def test_bucle_que_escribe():
+    """La configuración se repite aunque las celdas cambien entre medias"""
+    mt = st.MaquinaMultiCinta(
+        {'q0', 'q1'}, {'a'}, {'a', 'b', '_'},
+        {('q0', ('a', '_')): ('q1', ('b', 'a'), ('S', 'S')),
+         ('q1', ('b', 'a')): ('q0', ('a', '_'), ('S', 'S'))},
+        'q0', set(), set())
+    mt.inicializar_cinta('a')
+    assert mt.ejecutar_hasta_parar(detectar_ciclos=True) == "BUCLE"
+
+
+def test_linea_de_comandos(capsys):
+    assert st.main(['run', 'palindromos (2 cintas)', 'abba', 'abab']) == 0
+    salida = capsys.readouterr().out
+    assert '"veredicto": "ACEPTADA"' in salida and '"veredicto": "RECHAZADA"' in salida
@@ -0,0 +1,52 @@
+"""Máquinas no deterministas frente a las deterministas del mismo patrón"""
+import pytest
+
+import simulador_turing as st
+from comunes import entradas
+
+PATRONES = ['(a|b)*abb', '(ab)*', '(a+b)*a(a+b)*', 'a(a|b)*b', '(a|b)*a(a|b)']
+
+
+@pytest.mark.parametrize('patron', PATRONES)
+def test_mismos_veredictos(patron):
+    definicion = st.obtener_definicion(patron)
+    mt = st.crear_maquina_no_determinista(patron)
+    for cadena in entradas(definicion, 6):
+        esperado = st.evaluar_cadena(definicion, cadena)[0]
+        veredicto = mt.ejecutar(cadena)
+        assert veredicto == ("ACEPTADA" if esperado == "ACEPTADA" else "RECHAZADA"), cadena
+        assert mt.motivo_parada is None
+        if veredicto == "ACEPTADA":
+            assert mt.estado_actual in mt.estados_aceptacion
+            assert mt.cinta_aceptada() is not None
+        else:
+            assert mt.estado_actual == mt.estado_inicial or mt.estado_actual in mt.estados_rechazo
+            assert mt.cinta_aceptada() is None
+
+
+def test_rechazo_sin_estado_de_rechazo():
+    """Si ninguna rama llega a un estado de rechazo, estado_actual no cambia"""
+    mt = st.MaquinaNoDeterminista(
+        {'q0', 'q1', 'aceptar', 'rechazar'}, {'a', 'b'}, {'a', 'b', '_'},
+        {('q0', 'a'): {('q1', 'a', 'R'), ('q0', 'a', 'R')}},
+        'q0', {'aceptar'}, {'rechazar'})
+    assert mt.ejecutar('ab') == "RECHAZADA"
+    assert mt.estado_actual == 'q0'
+    assert mt.motivo_parada is None
+
+
+def test_limite():
+    mt = st.crear_maquina_no_determinista('(a|b)*abb')
+    assert mt.ejecutar('ab' * 20, max_configuraciones=10) == "LIMITE"
+    assert mt.motivo_parada == "LIMITE"
+    assert mt.ejecutar('abb') == "ACEPTADA"
+    assert mt.motivo_parada is None
+
+
+def test_en_paralelo(monkeypatch):
+    monkeypatch.setattr(st.MaquinaNoDeterminista, 'FRONTERA_MINIMA_PARALELA', 1)
+    mt = st.crear_maquina_no_determinista('(a|b)*a(a|b)')
+    for cadena in ['abab', 'abba', 'bb']:
+        secuencial = st.crear_maquina_no_determinista('(a|b)*a(a|b)')
+        assert mt.ejecutar(cadena, procesos=2) == secuencial.ejecutar(cadena)
+        assert mt.contador_pasos == secuencial.contador_pasos
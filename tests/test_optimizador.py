@@ -0,0 +1,67 @@
+"""Optimizador de tablas de transiciones (optimizar_definicion)"""
+import pytest
+
+import simulador_turing as st
+
+from comunes import aleatorias, definiciones, entradas
+
+# q1 y q2 son equivalentes, 'muerto' nunca acepta y 'huerfano' es inalcanzable
+REDUNDANTE = st.DefinicionMaquina(
+    {'q0', 'q1', 'q2', 'muerto', 'huerfano', 'aceptar', 'rechazar'}, {'a', 'b', 'c'}, {'a', 'b', 'c', 'X', '_'},
+    {('q0', 'a'): ('q1', 'X', 'R'),
+     ('q0', 'b'): ('q2', 'X', 'R'),
+     ('q0', 'c'): ('muerto', 'c', 'R'),
+     ('q1', '_'): ('aceptar', '_', 'S'),
+     ('q2', '_'): ('aceptar', '_', 'S'),
+     ('muerto', 'c'): ('muerto', 'c', 'R'),
+     ('muerto', '_'): ('muerto', '_', 'R'),
+     ('huerfano', 'a'): ('aceptar', 'a', 'R')},
+    'q0', {'aceptar'}, {'rechazar'})
+
+
+def test_informe():
+    optimizada, informe = st.optimizar_definicion(REDUNDANTE)
+    assert informe['inalcanzables'] == ['huerfano', 'rechazar']
+    assert informe['sin_salida'] == ['muerto']
+    assert informe['fusionados'] == {'q2': 'q1'}
+    assert informe['estados'] == (7, len(optimizada.estados))
+    assert optimizada.estados == {'q0', 'q1', 'muerto', 'aceptar'}
+    assert 'muerto' in optimizada.estados_rechazo
+    assert not any(estado == 'muerto' for estado, _ in optimizada.transiciones)
+    assert informe['transiciones'] == (8, len(optimizada.transiciones))
+
+
+def test_sin_salida_rechaza_en_lugar_de_seguir():
+    optimizada, _ = st.optimizar_definicion(REDUNDANTE)
+    assert st.evaluar_cadena(REDUNDANTE, 'cc', 1000) == ("LIMITE", 1000)
+    assert st.evaluar_cadena(optimizada, 'cc', 1000) == ("RECHAZADA", 1)
+    assert st.evaluar_cadena(optimizada, 'b') == st.evaluar_cadena(REDUNDANTE, 'b') == ("ACEPTADA", 2)
+
+
+@pytest.mark.parametrize('nombre, definicion', definiciones() + [('redundante', REDUNDANTE)])
+def test_optimizador_conserva_aceptadas(nombre, definicion):
+    """Las cadenas aceptadas lo siguen siendo con los mismos pasos; las demás no se aceptan"""
+    optimizada, _ = st.optimizar_definicion(definicion)
+    assert len(optimizada.estados) <= len(definicion.estados)
+    for cadena in entradas(definicion, 6):
+        antes = st.evaluar_cadena(definicion, cadena, 10000)
+        despues = st.evaluar_cadena(optimizada, cadena, 10000)
+        if antes[0] == "ACEPTADA":
+            assert despues == antes, cadena
+        else:
+            assert despues[0] != "ACEPTADA", cadena
+
+
+def test_optimizada_es_punto_fijo():
+    for _, definicion in definiciones():
+        optimizada, _ = st.optimizar_definicion(definicion)
+        otra, informe = st.optimizar_definicion(optimizada)
+        assert otra.transiciones == optimizada.transiciones
+        assert not informe['fusionados'] and not informe['sin_salida']
+
+
+def test_evaluar_lote_optimizado():
+    definicion = st.obtener_definicion('0*1*')
+    cadenas = aleatorias(definicion, 100, 8, semilla=2)
+    esperado = [(cadena, *st.evaluar_cadena(definicion, cadena)) for cadena in cadenas]
+    assert list(st.evaluar_lote('0*1*', cadenas, procesos=1, optimizar=True)) == esperado
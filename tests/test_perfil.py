@@ -0,0 +1,69 @@
+"""Instrumentación por transición (activar_instrumentacion y PerfilEjecucion)"""
+import json
+from collections import Counter
+
+import pytest
+
+import simulador_turing as st
+
+
+def _traza(definicion, cadena):
+    """Transiciones, posiciones y extensión máxima de una ejecución sin instrumentar"""
+    mt = st.MaquinaTuring.desde_definicion(definicion)
+    mt.inicializar_cinta(cadena)
+    visitas, posiciones, extension = Counter(), Counter(), 0
+    while True:
+        clave, posicion = (mt.estado_actual, mt.cinta[mt.posicion_cabezal]), mt.posicion_cabezal
+        if not mt.ejecutar_paso():
+            return visitas, posiciones, extension, mt.contador_pasos
+        visitas[clave] += 1
+        posiciones[posicion] += 1
+        extension = max(extension, len(mt.cinta))
+
+
+@pytest.mark.parametrize('nombre, cadena', [("palindromos (1 cinta)", 'abbaabba'), ("a^n b^n (1 cinta)", 'aaabbb'),
+                                            ('(a|b)*abb', 'ababb')])
+def test_contadores(nombre, cadena):
+    definicion = st.crear_maquina(nombre).definicion
+    visitas, posiciones, extension, pasos = _traza(definicion, cadena)
+    mt = st.MaquinaTuring.desde_definicion(definicion, modo_historial='ninguno')
+    perfil = mt.activar_instrumentacion()
+    mt.inicializar_cinta(cadena)
+    assert mt.ejecutar_hasta_parar() == "ACEPTADA"
+    assert perfil.pasos == mt.contador_pasos == pasos
+    assert perfil.visitas == dict(visitas)
+    assert perfil.histograma_cabezal == dict(posiciones)
+    assert perfil.extension_maxima == extension
+    assert perfil.pasos_por_estado == dict(Counter(estado for (estado, _), veces in visitas.items()
+                                                   for _ in range(veces)))
+    assert set(perfil.tiempo_por_estado) == set(perfil.pasos_por_estado)
+
+
+def test_vigilada_y_perfil_compartido():
+    definicion = st.crear_maquina("palindromos (1 cinta)").definicion
+    perfil = st.PerfilEjecucion()
+    pasos = 0
+    for cadena in ['abba', 'ab']:
+        mt = st.MaquinaTuring.desde_definicion(definicion, modo_historial='ninguno')
+        mt.activar_instrumentacion(perfil)
+        mt.inicializar_cinta(cadena)
+        mt.ejecutar_hasta_parar(max_pasos=5, detectar_ciclos=True)
+        pasos += mt.contador_pasos
+    assert mt.contador_pasos < 5 and perfil.pasos == pasos == 5 + mt.contador_pasos
+
+
+def test_desactivar(tmp_path):
+    definicion = st.crear_maquina("a^n b^n (1 cinta)").definicion
+    mt = st.MaquinaTuring.desde_definicion(definicion)
+    perfil = mt.activar_instrumentacion()
+    mt.inicializar_cinta('ab')
+    mt.ejecutar_paso()
+    assert mt.desactivar_instrumentacion() is perfil
+    assert 'ejecutar_paso' not in vars(mt) and not hasattr(mt, 'perfil')
+    mt.ejecutar_hasta_parar()
+    assert perfil.pasos == 1
+    ruta = tmp_path / 'perfil.json'
+    perfil.exportar_json(str(ruta))
+    datos = json.loads(ruta.read_text(encoding='utf-8'))
+    assert datos == json.loads(json.dumps(perfil.a_json()))
+    assert datos['pasos'] == 1 and sum(t['visitas'] for t in datos['transiciones']) == 1
@@ -0,0 +1,35 @@
+"""Evaluador por trie de prefijos y comparación exhaustiva con re"""
+import pytest
+
+import simulador_turing as st
+from comunes import aleatorias, definiciones
+
+
+@pytest.mark.parametrize('patron', sorted(st.REGISTRO_MAQUINAS) + ['(a|b)*a(a|b)', 'a(b|c)*a', '(ab|ba)*'])
+def test_exhaustivo_frente_a_re(patron):
+    evaluadas, discrepancias = st.comparar_con_re(patron, 8)
+    assert evaluadas > 0
+    assert discrepancias == []
+
+
+@pytest.mark.parametrize('patron', ['a**', '(ab**)**', '(a*)**b'])
+def test_estrellas_repetidas(patron):
+    assert st.comparar_con_re(patron, 4)[1] == []
+
+
+def test_exhaustivo_linea_de_comandos(capsys):
+    assert st.main(['exhaustivo', 'a**', '--longitud', '3']) == 0
+    assert '"discrepancias": []' in capsys.readouterr().out
+
+
+@pytest.mark.parametrize('nombre, definicion', definiciones())
+def test_coincide_con_evaluar_cadena(nombre, definicion):
+    cadenas = aleatorias(definicion, 80, 8)
+    cadenas += [cadena + cadena for cadena in cadenas[:20]]
+    esperado = [st.evaluar_cadena(definicion, cadena, 500) for cadena in cadenas]
+    if definicion.compilar().solo_derecha:
+        assert st.evaluar_con_prefijos(definicion, cadenas, 500) == esperado
+    else:
+        # Sin presupuesto de celdas las máquinas generales también comparten prefijos
+        veredictos = [veredicto for veredicto, _ in st.evaluar_con_prefijos(definicion, cadenas, 500)]
+        assert veredictos == [veredicto for veredicto, _ in esperado]
@@ -0,0 +1,64 @@
+"""Presupuestos de pasos y celdas y detección de máquinas que no paran"""
+import pytest
+
+import simulador_turing as st
+
+from comunes import definiciones, ejecutar, entradas
+
+
+def _definicion(transiciones):
+    estados = {estado for estado, _ in transiciones} | {siguiente for siguiente, _, _ in transiciones.values()}
+    return st.DefinicionMaquina(estados | {'aceptar'}, {'a', 'b'}, {'a', 'b', 'X', '_'},
+                                transiciones, 'q0', {'aceptar'}, set())
+
+
+# Va y viene entre las dos primeras celdas sin escribir nada nuevo: ciclo
+VAIVEN = _definicion({('q0', 'a'): ('q1', 'a', 'R'), ('q1', 'a'): ('q0', 'a', 'L'),
+                      ('q1', 'b'): ('q0', 'b', 'L'), ('q1', '_'): ('aceptar', '_', 'S')})
+# Avanza a la izquierda para siempre: la cinta crece y no hay ciclo
+FUGA = _definicion({('q0', 'a'): ('q0', 'X', 'L'), ('q0', '_'): ('q0', '_', 'L')})
+# Ciclo tras reescribir la cinta: marca 'a' con X y luego oscila sobre las marcas
+MARCAS = _definicion({('q0', 'a'): ('q0', 'X', 'R'), ('q0', 'b'): ('q1', 'b', 'L'),
+                      ('q1', 'X'): ('q0', 'X', 'R'), ('q0', 'X'): ('q1', 'X', 'R'),
+                      ('q0', '_'): ('aceptar', '_', 'S')})
+
+
+@pytest.mark.parametrize('historial', ['completo', 'ninguno'])
+def test_bucles_detectados(historial):
+    assert ejecutar(VAIVEN, 'a', historial, detectar_ciclos=True)[0] == "ACEPTADA"
+    for definicion, cadena in [(VAIVEN, 'aa'), (VAIVEN, 'ab'), (MARCAS, 'aab'), (MARCAS, 'ab')]:
+        veredicto, _, _, pasos, _ = ejecutar(definicion, cadena, historial, detectar_ciclos=True)
+        assert veredicto == "BUCLE", cadena
+        assert pasos < 50, cadena
+
+
+@pytest.mark.parametrize('historial', ['completo', 'ninguno'])
+def test_presupuestos(historial):
+    veredicto, _, cabezal, pasos, cinta = ejecutar(FUGA, 'aaa', historial, max_pasos=100, detectar_ciclos=True)
+    assert (veredicto, cabezal, pasos) == ("LIMITE", -100, 100)
+    veredicto, _, _, _, cinta = ejecutar(FUGA, 'aaa', historial, max_celdas=50)
+    assert veredicto == "LIMITE" and len(cinta) == 51
+    assert ejecutar(VAIVEN, 'aa', historial, max_pasos=7)[::3] == ("LIMITE", 7)
+    # Un presupuesto que sobra no cambia el veredicto
+    assert ejecutar(VAIVEN, 'a', historial, max_pasos=1000, max_celdas=1000)[0] == "ACEPTADA"
+
+
+def test_reanudar_tras_limite():
+    mt = st.MaquinaTuring.desde_definicion(VAIVEN, modo_historial='ninguno')
+    mt.inicializar_cinta('a')
+    assert mt.ejecutar_hasta_parar(max_pasos=0) == "LIMITE"
+    assert mt.motivo_parada == "LIMITE"
+    assert mt.ejecutar_hasta_parar() == "ACEPTADA"
+    assert mt.motivo_parada is None
+
+
+@pytest.mark.parametrize('nombre, definicion', definiciones())
+def test_presupuestos_y_ciclos(nombre, definicion):
+    """Con presupuestos y detección de ciclos, el bucle vigilado y el compilado coinciden con evaluar_cadena"""
+    for cadena in entradas(definicion, 4):
+        for opciones in ({'detectar_ciclos': True}, {'max_pasos': 3, 'detectar_ciclos': True},
+                         {'max_celdas': 4}):
+            interpretada = ejecutar(definicion, cadena, 'completo', **opciones)
+            assert ejecutar(definicion, cadena, 'ninguno', **opciones) == interpretada, (cadena, opciones)
+        esperado = ejecutar(definicion, cadena, 'ninguno', detectar_ciclos=True)
+        assert st.evaluar_cadena(definicion, cadena) == esperado[::3][:2], cadena
@@ -0,0 +1,52 @@
+"""Varias máquinas sobre la misma entrada en una pasada (ProductoMaquinas y evaluar_todas)"""
+import itertools
+
+import pytest
+
+import simulador_turing as st
+
+from comunes import definiciones
+
+PRESUPUESTOS = [{}, {'max_pasos': 0}, {'max_pasos': 3}, {'max_celdas': 4}, {'max_pasos': 6, 'max_celdas': 3}]
+
+
+def _cadenas(simbolos, longitud_maxima):
+    for longitud in range(longitud_maxima + 1):
+        yield from map(''.join, itertools.product(simbolos, repeat=longitud))
+
+
+def _esperado(producto, cadena, opciones):
+    return [(patron, *st.evaluar_cadena(definicion, cadena, **opciones))
+            for patron, definicion in zip(producto.patrones, producto.definiciones)]
+
+
+def test_producto_como_evaluar_cadena():
+    producto = st.ProductoMaquinas(dict(definiciones()))
+    assert producto.derechas and len(producto.derechas) < len(producto.patrones)
+    for cadena in _cadenas('ab01', 4):
+        for opciones in PRESUPUESTOS:
+            assert producto.evaluar(cadena, **opciones) == _esperado(producto, cadena, opciones), (cadena, opciones)
+
+
+def test_producto_se_vacia_al_llenarse():
+    producto = st.ProductoMaquinas({patron: st.obtener_definicion(patron)
+                                    for patron in ['(a|b)*abb', '(a|b)*a(a|b)', 'a*b*', '(ab)*']})
+    producto.MAXIMO_TRANSICIONES = 4 * 256
+    for cadena in _cadenas('ab', 7):
+        assert producto.evaluar(cadena) == _esperado(producto, cadena, {}), cadena
+        assert len(producto.tabla) <= producto.MAXIMO_TRANSICIONES + 256 * len(cadena) + 256
+
+
+def test_evaluar_todas():
+    for cadena in ['', 'abb', '0011', 'aab', '10101']:
+        resultados = st.evaluar_todas(cadena)
+        assert [patron for patron, _, _ in resultados] == list(st.REGISTRO_MAQUINAS)
+        assert resultados == [(patron, *st.evaluar_cadena(st.obtener_definicion(patron), cadena))
+                              for patron in st.REGISTRO_MAQUINAS]
+
+
+@pytest.mark.parametrize('patrones', [['a*b', '(a|b)*abb'], ['(0|1)*1(0|1)(0|1)']])
+def test_evaluar_todas_con_patrones(patrones):
+    for cadena in _cadenas('ab01', 4):
+        assert st.evaluar_todas(cadena, patrones, max_pasos=5) == [
+            (patron, *st.evaluar_cadena(st.obtener_definicion(patron), cadena, 5)) for patron in patrones]
@@ -0,0 +1,94 @@
+"""Puntos de control y cintas proyectadas en memoria"""
+import mmap
+
+import pytest
+
+import simulador_turing as st
+from comunes import ejecutar
+
+
+@pytest.mark.parametrize('nombre', ["palindromos (1 cinta)", "(a|b)*abb"])
+def test_punto_control_ida_y_vuelta(nombre, tmp_path):
+    """Interrumpir en cualquier paso, guardar y restaurar da el mismo resultado que no interrumpir"""
+    definicion = st.crear_maquina(nombre).definicion
+    cadena = 'abbaabba' if nombre.startswith('palindromos') else 'abababb'
+    esperado = ejecutar(definicion, cadena)
+    ruta = tmp_path / 'estado.mtck'
+    for corte in range(esperado[3] + 1):
+        mt = st.MaquinaTuring.desde_definicion(definicion, modo_historial='ninguno')
+        mt.inicializar_cinta(cadena)
+        mt.ejecutar_hasta_parar(max_pasos=corte)
+        st.guardar_punto_control(mt, ruta)
+        restaurada = st.restaurar_punto_control(ruta, definicion)
+        assert (restaurada.estado_actual, restaurada.posicion_cabezal, restaurada.contador_pasos,
+                restaurada.cinta) == (mt.estado_actual, mt.posicion_cabezal, mt.contador_pasos, mt.cinta)
+        restaurada.motivo_parada = None
+        veredicto = restaurada.ejecutar_hasta_parar()
+        assert (veredicto, restaurada.estado_actual, restaurada.posicion_cabezal,
+                restaurada.contador_pasos, restaurada.cinta) == esperado, corte
+
+
+def test_punto_control_otra_definicion(tmp_path):
+    mt = st.crear_maquina_regex('(a|b)*abb')
+    mt.inicializar_cinta('ab')
+    ruta = tmp_path / 'estado.mtck'
+    st.guardar_punto_control(mt, ruta)
+    with pytest.raises(ValueError):
+        st.restaurar_punto_control(ruta, st.obtener_definicion('0*1*'))
+
+
+def test_puntos_control_periodicos_con_archivo(tmp_path):
+    entrada = tmp_path / 'entrada.bin'
+    entrada.write_bytes(b'ab' * 500 + b'abb')
+    definicion = st.obtener_definicion('(a|b)*abb')
+    mt = st.MaquinaTuring.desde_definicion(definicion, modo_historial='ninguno')
+    mt.cargar_archivo_entrada(str(entrada))
+    ruta = tmp_path / 'estado.mtck'
+    assert st.ejecutar_con_puntos_control(mt, ruta, 97) == "ACEPTADA"
+    restaurada = st.restaurar_punto_control(ruta, definicion)
+    assert restaurada.contador_pasos == mt.contador_pasos
+    assert st.evaluar_cadena(definicion, (b'ab' * 500 + b'abb').decode()) == ("ACEPTADA", mt.contador_pasos)
+
+
+def test_cinta_mapeada_no_modifica_el_archivo(tmp_path):
+    ruta = tmp_path / 'entrada.bin'
+    ruta.write_bytes(b'abba')
+    with st.CintaMapeada(ruta) as cinta:
+        cinta[1] = 'X'
+        cinta[-2] = 'a'
+        cinta[6] = 'b'
+        assert (cinta.inicio, cinta.contenido()) == (-2, 'a_aXba__b')
+    assert ruta.read_bytes() == b'abba'
+    with pytest.raises(ValueError):
+        cinta[0]
+
+
+def test_cinta_mapeada_vacia(tmp_path):
+    ruta = tmp_path / 'vacia.bin'
+    ruta.write_bytes(b'')
+    with st.CintaMapeada(ruta) as cinta:
+        assert cinta[0] == st.BLANCO
+    cinta.close()
+
+
+def test_linea_de_comandos_cierra_la_proyeccion(tmp_path, capsys, monkeypatch):
+    ruta = tmp_path / 'entrada.bin'
+    ruta.write_bytes(b'ababb')
+    cintas = []
+    original = st.CintaMapeada.__init__
+
+    def registrar(cinta, *argumentos):
+        original(cinta, *argumentos)
+        cintas.append(cinta)
+
+    monkeypatch.setattr(st.CintaMapeada, '__init__', registrar)
+    assert st.main(['run', '(a|b)*abb', '--cinta-archivo', str(ruta)]) == 0
+    assert '"veredicto": "ACEPTADA"' in capsys.readouterr().out
+    assert cintas and all(isinstance(cinta.mapa, mmap.mmap) and cinta.mapa.closed for cinta in cintas)
+
+
+def test_linea_de_comandos_archivo_inexistente(tmp_path, capsys):
+    with pytest.raises(SystemExit) as salida:
+        st.main(['run', '(a|b)*abb', '--cinta-archivo', str(tmp_path / 'no_existe.bin')])
+    assert salida.value.code == 2
+    assert 'no_existe.bin' in capsys.readouterr().err
@@ -0,0 +1,57 @@
+"""Compilador de expresiones regulares a máquinas de Turing frente a re"""
+import itertools
+import re
+
+import pytest
+
+import simulador_turing as st
+
+PATRONES = ['a', 'ab', 'a|b', 'a+b', '(ab)*', 'a*b*', '(a|b)*abb', '((a|b)(a|b))*', 'a(b|c)*d',
+            '(0|1)*1(0|1)(0|1)', '(a|)b', 'a()b', '(a*|b*)*c', 'ab|ba|', '((a))**']
+
+
+def _cadenas(alfabeto, longitud_maxima):
+    for longitud in range(longitud_maxima + 1):
+        yield from map(''.join, itertools.product(sorted(alfabeto), repeat=longitud))
+
+
+@pytest.mark.parametrize('patron', PATRONES)
+def test_mismo_lenguaje_que_re(patron):
+    definicion = st.compilar_regex(patron)
+    assert definicion.compilar().solo_derecha
+    expresion = re.compile(patron.replace('+', '|').replace('**', '*'))
+    for cadena in _cadenas(definicion.alfabeto, 7):
+        veredicto, _ = st.evaluar_cadena(definicion, cadena)
+        assert (veredicto == "ACEPTADA") == (expresion.fullmatch(cadena) is not None), cadena
+
+
+@pytest.mark.parametrize('patron', sorted(st.REGISTRO_MAQUINAS))
+def test_patrones_registrados(patron):
+    """La máquina compilada acepta lo mismo que la máquina registrada del patrón"""
+    registrada = st.obtener_definicion(patron)
+    compilada = st.compilar_regex(patron)
+    for cadena in _cadenas(registrada.alfabeto, 6):
+        esperado = st.evaluar_cadena(registrada, cadena)[0] == "ACEPTADA"
+        assert (st.evaluar_cadena(compilada, cadena)[0] == "ACEPTADA") == esperado, cadena
+
+
+def test_afd_minimo():
+    definicion = st.compilar_regex('(a|b)*abb')
+    assert definicion.estados == {'q0', 'q1', 'q2', 'q3', 'aceptar', 'rechazar'}
+    # El sumidero no es un estado: se rechaza en cuanto no queda forma de aceptar
+    assert st.evaluar_cadena(st.compilar_regex('ab'), 'bbbbbb') == ("RECHAZADA", 1)
+
+
+@pytest.mark.parametrize('patron', ['(a', 'a)', '*a', '(*a)', 'a|*', 'a_b', 'a b', 'aΩ'])
+def test_patrones_invalidos(patron):
+    with pytest.raises(ValueError):
+        st.compilar_regex(patron)
+
+
+def test_max_estados_y_cache():
+    patron = '(a|b)*a(a|b)(a|b)(a|b)(a|b)'
+    with pytest.raises(ValueError):
+        st.compilar_regex(patron, max_estados=10)
+    assert len(st.compilar_regex(patron).estados) > 10
+    assert st.compilar_regex('a*b') is st.compilar_regex('a*b')
+    assert st.obtener_definicion('a*b') is st.compilar_regex('a*b')
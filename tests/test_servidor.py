@@ -0,0 +1,40 @@
+"""Admisión de patrones en servidor_turing"""
+import asyncio
+
+import pytest
+
+import servidor_turing as sv
+import simulador_turing as st
+
+
+def test_cota_de_estados():
+    patron = '(a|b)*a' + '(a|b)' * 14
+    with pytest.raises(ValueError):
+        st.compilar_regex(patron, 256)
+    assert st.compilar_regex('(a|b)*abb', 256).estados == st.compilar_regex('(a|b)*abb').estados
+
+
+def _responder(servidor, peticion):
+    async def principal():
+        await servidor.iniciar(puerto=0)
+        try:
+            return await servidor.responder(peticion)
+        finally:
+            await servidor.cerrar()
+    return asyncio.run(principal())
+
+
+def test_solo_registrados_por_defecto():
+    servidor = sv.ServidorTuring(procesos=1)
+    assert 'error' in _responder(servidor, {'patron': 'ab*c', 'entrada': 'abc'})
+    servidor = sv.ServidorTuring(procesos=1)
+    assert _responder(servidor, {'patron': '(a|b)*abb', 'entrada': 'aabb'})['veredicto'] == "ACEPTADA"
+
+
+def test_patrones_libres_acotados():
+    servidor = sv.ServidorTuring(procesos=1, patrones_libres=True, max_estados=256)
+    assert _responder(servidor, {'patron': '(a|b)*a' + '(a|b)' * 14, 'entrada': 'a'})['error']
+    servidor = sv.ServidorTuring(procesos=1, patrones_libres=True, max_longitud_patron=10)
+    assert _responder(servidor, {'patron': 'a' * 11, 'entrada': 'a'})['error']
+    servidor = sv.ServidorTuring(procesos=1, patrones_libres=True)
+    assert _responder(servidor, {'patron': 'ab*c', 'entrada': 'abbc'})['veredicto'] == "ACEPTADA"